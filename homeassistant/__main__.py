@@ -20,17 +20,6 @@ from homeassistant.const import (
 )
 
 
-def attempt_use_uvloop():
-    """Attempt to use uvloop."""
-    import asyncio
-
-    try:
-        import uvloop
-        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
-    except ImportError:
-        pass
-
-
 def validate_python() -> None:
     """Validate that the right Python version is running."""
     if sys.platform == "win32" and \
@@ -88,6 +77,7 @@ def ensure_config_file(config_dir: str) -> str:
 def get_arguments() -> argparse.Namespace:
     """Get parsed passed in arguments."""
     import homeassistant.config as config_util
+    from homeassistant.util.loop import LOOP_AUTO, LOOP_CHOICES
     parser = argparse.ArgumentParser(
         description="Home Assistant: Observe, Control, Automate.")
     parser.add_argument('--version', action='version', version=__version__)
@@ -132,6 +122,12 @@ def get_arguments() -> argparse.Namespace:
         default=None,
         help='Log file to write to.  If not set, CONFIG/home-assistant.log '
              'is used')
+    parser.add_argument(
+        '--loop',
+        choices=LOOP_CHOICES,
+        default=LOOP_AUTO,
+        help='Event loop implementation to run on, auto uses uvloop when '
+             'it is installed')
     parser.add_argument(
         '--runner',
         action='store_true',
@@ -346,10 +342,15 @@ def main() -> int:
             monkey_patch.disable_c_asyncio()
         monkey_patch.patch_weakref_tasks()
 
-    attempt_use_uvloop()
-
     args = get_arguments()
 
+    from homeassistant.util.loop import set_loop_policy
+    try:
+        set_loop_policy(args.loop)
+    except ImportError:
+        print('Fatal Error: Event loop {} is not installed'.format(args.loop))
+        sys.exit(1)
+
     if args.script is not None:
         from homeassistant import scripts
         return scripts.run(args.script)
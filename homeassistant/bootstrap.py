@@ -15,12 +15,17 @@ from homeassistant import (
     core, config as conf_util, loader, components as core_components)
 from homeassistant.components import persistent_notification
 from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
-from homeassistant.setup import async_setup_component
+# async_setup_component is imported for components that use it from here
+from homeassistant.setup import (  # noqa  # pylint: disable=unused-import
+    async_setup_component, async_setup_components)
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, get_user_site
 from homeassistant.util.yaml import clear_secret_cache
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.signal import async_register_signal_handling
+from homeassistant.helpers.timeline import (
+    DATA_TIMELINE, TIMELINE_FILE, Timeline)
+from homeassistant.util.json import save_json
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -81,6 +86,7 @@ def async_from_config_dict(config: Dict[str, Any],
     This method is a coroutine.
     """
     start = time()
+    timeline = hass.data[DATA_TIMELINE] = Timeline()
 
     if enable_log:
         async_enable_logging(hass, verbose, log_rotate_days, log_file)
@@ -139,25 +145,32 @@ def async_from_config_dict(config: Dict[str, Any],
 
     _LOGGER.info("Home Assistant core initialized")
 
-    # stage 1
-    for component in components:
-        if component not in FIRST_INIT_COMPONENT:
-            continue
-        hass.async_add_job(async_setup_component(hass, component, config))
+    timed_out = yield from async_setup_components(
+        hass, sorted(components), config, FIRST_INIT_COMPONENT)
 
-    yield from hass.async_block_till_done()
-
-    # stage 2
-    for component in components:
-        if component in FIRST_INIT_COMPONENT:
-            continue
-        hass.async_add_job(async_setup_component(hass, component, config))
-
-    yield from hass.async_block_till_done()
+    # Do not wait for components that are still setting up
+    if not timed_out:
+        yield from hass.async_block_till_done()
 
     stop = time()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop-start)
 
+    timeline.finish()
+    _LOGGER.info("Startup critical path: %s",
+                 ' -> '.join(timeline.critical_path()))
+
+    # The trace for chrome://tracing is only saved when debugging startup
+    if hass.config.config_dir is not None and \
+            _LOGGER.isEnabledFor(logging.DEBUG):
+        try:
+            yield from hass.async_add_job(
+                save_json, hass.config.path(TIMELINE_FILE),
+                timeline.as_trace())
+        except HomeAssistantError:
+            pass
+
+    yield from hass.async_add_job(loader.save_manifest, hass)
+
     async_register_signal_handling(hass)
     return hass
 
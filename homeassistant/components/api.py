@@ -19,7 +19,7 @@ from homeassistant.const import (
     HTTP_BAD_REQUEST, HTTP_CREATED, HTTP_NOT_FOUND,
     MATCH_ALL, URL_API, URL_API_COMPONENTS,
     URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG,
-    URL_API_EVENTS, URL_API_SERVICES,
+    URL_API_EVENTS, URL_API_EXECUTORS, URL_API_SERVICES,
     URL_API_STATES, URL_API_STATES_ENTITY, URL_API_STREAM, URL_API_TEMPLATE,
     __version__)
 from homeassistant.exceptions import TemplateError
@@ -51,6 +51,7 @@ def setup(hass, config):
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIComponentsView)
     hass.http.register_view(APITemplateView)
+    hass.http.register_view(APIExecutorsView)
 
     log_path = hass.data.get(DATA_LOGGING, None)
     if log_path:
@@ -339,6 +340,18 @@ class APIComponentsView(HomeAssistantView):
         return self.json(request.app['hass'].config.components)
 
 
+class APIExecutorsView(HomeAssistantView):
+    """View to handle executor pool requests."""
+
+    url = URL_API_EXECUTORS
+    name = "api:executors"
+
+    @ha.callback
+    def get(self, request):
+        """Get the metrics of the executor pools."""
+        return self.json(request.app['hass'].executors.as_dict())
+
+
 class APITemplateView(HomeAssistantView):
     """View to handle requests."""
 
@@ -11,14 +11,15 @@ import logging
 import voluptuous as vol
 
 from homeassistant.setup import async_prepare_setup_platform
-from homeassistant.core import CoreState
+from homeassistant.core import CoreState, callback
 from homeassistant.loader import bind_hass
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_PLATFORM, STATE_ON, SERVICE_TURN_ON, SERVICE_TURN_OFF,
     SERVICE_TOGGLE, SERVICE_RELOAD, EVENT_HOMEASSISTANT_START, CONF_ID)
 from homeassistant.components import logbook
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import extract_domain_configs, script, condition
+from homeassistant.helpers import (
+    config_hash, extract_domain_configs, script, condition)
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.restore_state import async_get_last_state
@@ -201,11 +202,11 @@ def async_setup(hass, config):
 
     @asyncio.coroutine
     def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = yield from component.async_prepare_reload()
+        """Reload the automations whose config changed."""
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
-        yield from _async_process_config(hass, conf, component)
+        yield from _async_process_config(hass, conf, component, reloading=True)
 
     hass.services.async_register(
         DOMAIN, SERVICE_TRIGGER, trigger_service_handler,
@@ -242,6 +243,9 @@ class AutomationEntity(ToggleEntity):
         self._last_triggered = None
         self._hidden = hidden
         self._initial_state = initial_state
+        # Identify the automation and its config when reloading
+        self.reload_key = automation_id or name
+        self.config_hash = None
 
     @property
     def name(self):
@@ -253,6 +257,11 @@ class AutomationEntity(ToggleEntity):
         """No polling needed for automation entities."""
         return False
 
+    @property
+    def last_triggered(self):
+        """Return when the automation was last triggered."""
+        return self._last_triggered
+
     @property
     def state_attributes(self):
         """Return the entity state attributes."""
@@ -355,6 +364,16 @@ class AutomationEntity(ToggleEntity):
             self.async_trigger)
         yield from self.async_update_ha_state()
 
+    @callback
+    def async_take_over(self, previous):
+        """Continue where a replaced version of this automation stopped.
+
+        This method must be run in the event loop.
+        """
+        self._last_triggered = previous.last_triggered
+        if self._initial_state is None:
+            self._initial_state = previous.is_on
+
     @property
     def device_state_attributes(self):
         """Return automation attributes."""
@@ -367,12 +386,21 @@ class AutomationEntity(ToggleEntity):
 
 
 @asyncio.coroutine
-def _async_process_config(hass, config, component):
+def _async_process_config(hass, config, component, reloading=False):
     """Process config and add automations.
 
+    When reloading, automations with an unchanged config keep running. The
+    others are removed and replaced by the new versions.
+
     This method is a coroutine.
     """
     entities = []
+    running = {}
+
+    if reloading:
+        for entity in component.entities:
+            running.setdefault(
+                (entity.reload_key, entity.config_hash), []).append(entity)
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf = config[config_key]
@@ -381,6 +409,12 @@ def _async_process_config(hass, config, component):
             automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or "{} {}".format(config_key,
                                                                   list_no)
+            block_hash = config_hash(config_block)
+
+            unchanged = running.get((automation_id or name, block_hash))
+            if unchanged:
+                unchanged.pop()
+                continue
 
             hidden = config_block[CONF_HIDE_ENTITY]
             initial_state = config_block.get(CONF_INITIAL_STATE)
@@ -405,9 +439,20 @@ def _async_process_config(hass, config, component):
             entity = AutomationEntity(
                 automation_id, name, async_attach_triggers, cond_func, action,
                 hidden, initial_state)
+            entity.config_hash = block_hash
 
             entities.append(entity)
 
+    replaced = {}
+    for stale in running.values():
+        for entity in stale:
+            replaced[entity.reload_key] = entity
+            yield from component.async_remove_entity(entity.entity_id)
+
+    for entity in entities:
+        if entity.reload_key in replaced:
+            entity.async_take_over(replaced[entity.reload_key])
+
     if entities:
         yield from component.async_add_entities(entities)
 
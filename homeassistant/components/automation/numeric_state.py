@@ -13,8 +13,8 @@ from homeassistant.core import callback
 from homeassistant.const import (
     CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_ENTITY_ID,
     CONF_BELOW, CONF_ABOVE, CONF_FOR)
-from homeassistant.helpers.event import (
-    async_track_state_change, async_track_same_state)
+from homeassistant.helpers.event import async_track_same_state
+from homeassistant.helpers.trigger_index import async_get_trigger_index
 from homeassistant.helpers import condition, config_validation as cv
 
 TRIGGER_SCHEMA = vol.All(vol.Schema({
@@ -38,31 +38,42 @@ def async_trigger(hass, config, action):
     time_delta = config.get(CONF_FOR)
     value_template = config.get(CONF_VALUE_TEMPLATE)
     unsub_track_same = {}
-    entities_triggered = set()
+    async_value = None
+
+    def _variables(entity):
+        """Return the variables to render the template with."""
+        return {
+            'trigger': {
+                'platform': 'numeric_state',
+                'entity_id': entity,
+                'below': below,
+                'above': above,
+            }
+        }
 
     if value_template is not None:
         value_template.hass = hass
 
+        @callback
+        def async_template_value(entity, to_s):
+            """Return the value of the template for a state."""
+            return condition.async_numeric_value(
+                hass, to_s, value_template, _variables(entity))
+
+        async_value = async_template_value
+
     @callback
     def check_numeric_state(entity, from_s, to_s):
         """Return True if criteria are now met."""
         if to_s is None:
             return False
 
-        variables = {
-            'trigger': {
-                'platform': 'numeric_state',
-                'entity_id': entity,
-                'below': below,
-                'above': above,
-            }
-        }
         return condition.async_numeric_state(
-            hass, to_s, below, above, value_template, variables)
+            hass, to_s, below, above, value_template, _variables(entity))
 
     @callback
     def state_automation_listener(entity, from_s, to_s):
-        """Listen for state changes and calls action."""
+        """Call action when the value got within the range."""
         @callback
         def call_action():
             """Call action with right context."""
@@ -77,22 +88,15 @@ def async_trigger(hass, config, action):
                 }
             })
 
-        matching = check_numeric_state(entity, from_s, to_s)
-
-        if not matching:
-            entities_triggered.discard(entity)
-        elif entity not in entities_triggered:
-            entities_triggered.add(entity)
-
-            if time_delta:
-                unsub_track_same[entity] = async_track_same_state(
-                    hass, time_delta, call_action, entity_ids=entity_id,
-                    async_check_same_func=check_numeric_state)
-            else:
-                call_action()
+        if time_delta:
+            unsub_track_same[entity] = async_track_same_state(
+                hass, time_delta, call_action, entity_ids=entity_id,
+                async_check_same_func=check_numeric_state)
+        else:
+            call_action()
 
-    unsub = async_track_state_change(
-        hass, entity_id, state_automation_listener)
+    unsub = async_get_trigger_index(hass).async_track_numeric(
+        entity_id, state_automation_listener, below, above, async_value)
 
     @callback
     def async_remove():
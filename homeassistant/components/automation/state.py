@@ -9,8 +9,8 @@ import voluptuous as vol
 
 from homeassistant.core import callback
 from homeassistant.const import MATCH_ALL, CONF_PLATFORM, CONF_FOR
-from homeassistant.helpers.event import (
-    async_track_state_change, async_track_same_state)
+from homeassistant.helpers.event import async_track_same_state
+from homeassistant.helpers.trigger_index import async_get_trigger_index
 import homeassistant.helpers.config_validation as cv
 
 CONF_ENTITY_ID = 'entity_id'
@@ -67,8 +67,8 @@ def async_trigger(hass, config, action):
             lambda _, _2, to_state: to_state.state == to_s.state,
             entity_ids=entity_id)
 
-    unsub = async_track_state_change(
-        hass, entity_id, state_automation_listener, from_state, to_state)
+    unsub = async_get_trigger_index(hass).async_track_state(
+        entity_id, state_automation_listener, from_state, to_state)
 
     @callback
     def async_remove():
@@ -0,0 +1,102 @@
+"""
+Collect statistics about the event bus.
+
+Counts the fired events per event type and times every listener run. The
+statistics are available through the API and summarized in a state.
+
+For more details about this component, please refer to the documentation at
+https://home-assistant.io/components/event_stats/
+"""
+import asyncio
+from datetime import timedelta
+import logging
+
+import voluptuous as vol
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_EVENTS = 'events'
+ATTR_SLOWEST_LISTENERS = 'slowest_listeners'
+
+CONF_TOP = 'top'
+
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=60)
+DEFAULT_TOP = 10
+DEPENDENCIES = ['http']
+DOMAIN = 'event_stats'
+
+ENTITY_ID = 'event_stats.event_bus'
+
+CONFIG_SCHEMA = vol.Schema({
+    DOMAIN: vol.Schema({
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL):
+            cv.time_period,
+        vol.Optional(CONF_TOP, default=DEFAULT_TOP): cv.positive_int,
+    }),
+}, extra=vol.ALLOW_EXTRA)
+
+
+@asyncio.coroutine
+def async_setup(hass, config):
+    """Set up the event bus statistics."""
+    conf = config.get(DOMAIN)
+    if conf is None:
+        conf = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+
+    stats = hass.bus.async_enable_stats()
+    top = conf[CONF_TOP]
+    last_fired = dict(stats.fired)
+
+    @callback
+    def async_update_snapshot(now):
+        """Write a snapshot of the statistics to the state machine."""
+        interval = conf[CONF_SCAN_INTERVAL].total_seconds()
+        rates = {
+            event_type: round((count - last_fired.get(event_type, 0)) /
+                              interval, 2)
+            for event_type, count in stats.fired.items()}
+        last_fired.update(stats.fired)
+
+        snapshot = stats.as_dict()
+        slowest = sorted(
+            snapshot['listeners'].items(),
+            key=lambda item: item[1]['run']['p95'], reverse=True)[:top]
+
+        hass.states.async_set(ENTITY_ID, round(sum(rates.values()), 2), {
+            ATTR_EVENTS: dict(sorted(
+                rates.items(), key=lambda item: item[1], reverse=True)[:top]),
+            ATTR_SLOWEST_LISTENERS: {
+                name: listener['run']['p95'] for name, listener in slowest},
+            ATTR_UNIT_OF_MEASUREMENT: 'events/s',
+        })
+
+    async_update_snapshot(None)
+    async_track_time_interval(
+        hass, async_update_snapshot, conf[CONF_SCAN_INTERVAL])
+
+    hass.http.register_view(EventStatsView)
+
+    return True
+
+
+class EventStatsView(HomeAssistantView):
+    """View to retrieve the event bus statistics."""
+
+    url = '/api/event_stats'
+    name = 'api:event_stats'
+
+    @asyncio.coroutine
+    def get(self, request):
+        """Get the event bus statistics."""
+        stats = request.app['hass'].bus.stats
+
+        if stats is None:
+            return self.json_message('Statistics are not enabled', 404)
+
+        return self.json(stats.as_dict())
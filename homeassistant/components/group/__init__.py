@@ -15,8 +15,9 @@ from homeassistant.const import (
     STATE_NOT_HOME, STATE_OFF, STATE_ON, STATE_OPEN, STATE_LOCKED,
     STATE_UNLOCKED, STATE_OK, STATE_PROBLEM, STATE_UNKNOWN,
     ATTR_ASSUMED_STATE, SERVICE_RELOAD)
-from homeassistant.core import callback
+from homeassistant.core import callback, split_entity_id
 from homeassistant.loader import bind_hass
+from homeassistant.helpers import config_hash
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_state_change
@@ -257,11 +258,11 @@ def async_setup(hass, config):
 
     @asyncio.coroutine
     def reload_service_handler(service):
-        """Remove all groups and load new ones from config."""
-        conf = yield from component.async_prepare_reload()
+        """Reload the groups whose config changed."""
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
-        yield from _async_process_config(hass, conf, component)
+        yield from _async_process_config(hass, conf, component, reloading=True)
 
     hass.services.async_register(
         DOMAIN, SERVICE_RELOAD, reload_service_handler,
@@ -369,20 +370,51 @@ def async_setup(hass, config):
 
 
 @asyncio.coroutine
-def _async_process_config(hass, config, component):
-    """Process group configuration."""
-    for object_id, conf in config.get(DOMAIN, {}).items():
+def _async_process_config(hass, config, component, reloading=False):
+    """Process group configuration.
+
+    When reloading, groups created from the previous config are updated in
+    place if their config changed and removed if they are no longer there.
+    Groups created by components or services are left alone.
+    """
+    groups = config.get(DOMAIN, {})
+    existing = {}
+
+    if reloading:
+        for group in list(component.entities):
+            if group.config_hash is None:
+                continue
+            if split_entity_id(group.entity_id)[1] in groups:
+                existing[group.entity_id] = group
+            else:
+                yield from component.async_remove_entity(group.entity_id)
+
+    for object_id, conf in groups.items():
         name = conf.get(CONF_NAME, object_id)
         entity_ids = conf.get(CONF_ENTITIES) or []
         icon = conf.get(CONF_ICON)
         view = conf.get(CONF_VIEW)
         control = conf.get(CONF_CONTROL)
+        conf_hash = config_hash(conf)
+
+        group = existing.get(ENTITY_ID_FORMAT.format(object_id))
+
+        if group is not None:
+            if group.config_hash != conf_hash:
+                group.config_hash = conf_hash
+                group.name = name
+                group.icon = icon
+                group.view = view
+                group.control = control
+                yield from group.async_update_tracked_entity_ids(entity_ids)
+            continue
 
         # Don't create tasks and await them all. The order is important as
         # groups get a number based on creation order.
-        yield from Group.async_create_group(
+        group = yield from Group.async_create_group(
             hass, name, entity_ids, icon=icon, view=view,
             control=control, object_id=object_id)
+        group.config_hash = conf_hash
 
 
 class Group(Entity):
@@ -411,6 +443,8 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        # Set for groups created from the group config
+        self.config_hash = None
 
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
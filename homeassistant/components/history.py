@@ -15,7 +15,9 @@ import voluptuous as vol
 
 from homeassistant.const import (
     HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE)
+from homeassistant.core import executor_pool
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import POOL_DB
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
@@ -53,6 +55,7 @@ def last_recorder_run(hass):
         return res
 
 
+@executor_pool(POOL_DB)
 def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
                            filters=None, include_start_time_state=True):
     """
@@ -11,9 +11,10 @@ from itertools import groupby
 
 import voluptuous as vol
 
-from homeassistant.core import callback
+from homeassistant.core import callback, executor_pool
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import POOL_DB
 from homeassistant.components import sun
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
@@ -211,7 +212,7 @@ def humanify(events):
         for event in events_batch:
             if event.event_type == EVENT_STATE_CHANGED:
 
-                to_state = State.from_dict(event.data.get('new_state'))
+                to_state = _event_state(event, 'new_state')
 
                 # If last_changed != last_updated only attributes have changed
                 # we do not report on that yet. Also filter auto groups.
@@ -273,21 +274,50 @@ def humanify(events):
                     entity_id)
 
 
+@executor_pool(POOL_DB)
 def _get_events(hass, config, start_day, end_day):
     """Get events for a period of time."""
-    from homeassistant.components.recorder.models import Events
+    from homeassistant.components.recorder.models import Events, States
     from homeassistant.components.recorder.util import (
         execute, session_scope)
 
     with session_scope(hass=hass) as session:
-        query = session.query(Events).order_by(
-            Events.time_fired).filter(
-                (Events.time_fired > start_day) &
-                (Events.time_fired < end_day))
-        events = execute(query)
+        query = session.query(Events, States).outerjoin(
+            States, (Events.event_type == EVENT_STATE_CHANGED) &
+            (States.event_id == Events.event_id)).order_by(
+                Events.time_fired).filter(
+                    (Events.time_fired > start_day) &
+                    (Events.time_fired < end_day))
+        events = execute(query, to_native=_event_from_row)
     return humanify(_exclude_events(events, config))
 
 
+def _event_from_row(row):
+    """Convert a recorded event, with the new state from its state row."""
+    dbevent, dbstate = row
+    event = dbevent.to_native()
+
+    if event is None or dbstate is None or event.data.get('new_state') != {}:
+        return event
+
+    event.data['new_state'] = dbstate.to_native()
+    return event
+
+
+def _event_state(event, key):
+    """Return the old or new state of a state_changed event.
+
+    Live events and events rebuilt from the states table hold State
+    objects, events recorded before hold their dictionaries.
+    """
+    state = event.data.get(key)
+
+    if isinstance(state, dict):
+        return State.from_dict(state)
+
+    return state
+
+
 def _exclude_events(events, config):
     """Get lists of excluded entities and platforms."""
     excluded_entities = []
@@ -308,7 +338,7 @@ def _exclude_events(events, config):
         domain, entity_id = None, None
 
         if event.event_type == EVENT_STATE_CHANGED:
-            to_state = State.from_dict(event.data.get('new_state'))
+            to_state = _event_state(event, 'new_state')
             # Do not report on new entities
             if event.data.get('old_state') is None:
                 continue
@@ -8,7 +8,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, deque, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -21,10 +21,11 @@ from typing import Any, Dict, Optional  # noqa: F401
 import voluptuous as vol
 
 from homeassistant.const import (
-    ATTR_ENTITY_ID, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE,
-    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
+    ATTR_BATCH, ATTR_CHANGES, ATTR_ENTITY_ID, CONF_DOMAINS, CONF_ENTITIES,
+    CONF_EXCLUDE, CONF_INCLUDE, EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED, EVENT_STATE_CHANGED_BATCH,
     EVENT_TIME_CHANGED, MATCH_ALL)
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
@@ -58,9 +59,23 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_KEEP_DAYS = 'purge_keep_days'
 CONF_PURGE_INTERVAL = 'purge_interval'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_QUEUE_HIGH_WATER = 'queue_high_water'
 
 CONNECT_RETRY_WAIT = 3
 
+DEFAULT_COMMIT_INTERVAL = 1
+# Events are dropped while this many are waiting to be recorded
+DEFAULT_QUEUE_HIGH_WATER = 30000
+# Commit early when this many events are waiting
+MAX_BATCH_SIZE = 1000
+# Ids of recently written state attributes kept in memory
+ATTRIBUTES_CACHE_SIZE = 2048
+# Stay below the SQLite limit of variables per query
+QUERY_CHUNK_SIZE = 500
+# Seconds of commits the commit rate is computed over
+METRICS_WINDOW = 60
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_ENTITIES, default=[]): cv.entity_ids,
@@ -83,6 +98,10 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_INTERVAL, default=1):
             vol.All(vol.Coerce(int), vol.Range(min=0)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_QUEUE_HIGH_WATER, default=DEFAULT_QUEUE_HIGH_WATER):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -123,6 +142,9 @@ def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    queue_high_water = conf.get(
+        CONF_QUEUE_HIGH_WATER, DEFAULT_QUEUE_HIGH_WATER)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -133,7 +155,8 @@ def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass, keep_days=keep_days, purge_interval=purge_interval,
-        uri=db_url, include=include, exclude=exclude)
+        uri=db_url, include=include, exclude=exclude,
+        commit_interval=commit_interval, queue_high_water=queue_high_water)
     instance.async_initialize()
     instance.start()
 
@@ -151,19 +174,26 @@ def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack'])
 
+# Commit the pending events right away
+COMMIT_TASK = object()
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
     def __init__(self, hass: HomeAssistant, keep_days: int,
                  purge_interval: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 queue_high_water: int = DEFAULT_QUEUE_HIGH_WATER) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.queue_high_water = queue_high_water
         self.did_vacuum = False
         self.queue = queue.Queue()  # type: Any
         self.recording_start = dt_util.utcnow()
@@ -179,6 +209,20 @@ class Recorder(threading.Thread):
 
         self.get_session = None
 
+        # Events waiting to be committed and the queue items they came from
+        self._pending_events = []
+        self._pending_tasks = 0
+        self._last_commit = 0
+        # Events dropped in total and since the queue overflowed
+        self.dropped_events = 0
+        self._overflow_dropped = None
+        # Seconds from firing the oldest event to committing it
+        self.commit_latency = None
+        # Time and number of events of the recent commits
+        self._commits = deque()
+        # Hashes of shared state attributes mapped to their ids
+        self.attributes_ids = OrderedDict()
+
     @callback
     def async_initialize(self):
         """Initialize the recorder."""
@@ -193,9 +237,8 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
+        from .models import Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -259,8 +302,7 @@ class Recorder(threading.Thread):
                 @callback
                 def async_purge(now):
                     """Trigger the purge and schedule the next run."""
-                    self.queue.put(
-                        PurgeTask(self.keep_days, repack=not self.did_vacuum))
+                    self.queue.put(PurgeTask(self.keep_days, repack=False))
                     self.hass.helpers.event.async_track_point_in_time(
                         async_purge, now + timedelta(days=self.purge_interval))
 
@@ -285,65 +327,244 @@ class Recorder(threading.Thread):
             return
 
         while True:
-            event = self.queue.get()
+            try:
+                event = self.queue.get(timeout=self._queue_timeout())
+            except queue.Empty:
+                self._commit_pending()
+                continue
 
             if event is None:
+                self._commit_pending()
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
-            elif isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+            elif event is COMMIT_TASK:
+                self._commit_pending()
                 self.queue.task_done()
                 continue
-            elif event.event_type == EVENT_TIME_CHANGED:
-                self.queue.task_done()
-                continue
-            elif event.event_type in self.exclude_t:
+            elif isinstance(event, PurgeTask):
+                self._commit_pending()
+                if not purge.purge_old_data(
+                        self, event.keep_days, event.repack):
+                    # Continue after the events queued in the meantime
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
+            elif event.event_type == EVENT_STATE_CHANGED_BATCH:
+                if EVENT_STATE_CHANGED not in self.exclude_t:
+                    self._pending_events.extend(
+                        Event(EVENT_STATE_CHANGED, change,
+                              time_fired=event.time_fired)
+                        for change in event.data[ATTR_CHANGES]
+                        if self.entity_filter(change[ATTR_ENTITY_ID]))
+            else:
+                self._pending_events.append(event)
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    self.queue.task_done()
-                    continue
-
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        dbevent = Events.from_event(event)
-                        session.add(dbevent)
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            dbstate = States.from_event(event)
-                            dbstate.event_id = dbevent.event_id
-                            session.add(dbstate)
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
-
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
+            self._pending_tasks += 1
 
+            if len(self._pending_events) >= MAX_BATCH_SIZE:
+                self._commit_pending()
+
+    def _queue_timeout(self):
+        """Return how long to wait for more events before committing."""
+        if not self._pending_tasks:
+            return None
+
+        return max(
+            0, self._last_commit + self.commit_interval - time.monotonic())
+
+    def _commit_pending(self):
+        """Save the pending events in one transaction."""
+        if not self._pending_tasks:
+            return
+
+        self._save_events(self._pending_events)
+        self._last_commit = time.monotonic()
+
+        if self._pending_events:
+            oldest = min(event.time_fired for event in self._pending_events)
+            self.commit_latency = (dt_util.utcnow() - oldest).total_seconds()
+        self._commits.append((self._last_commit, len(self._pending_events)))
+        while self._commits[0][0] < self._last_commit - METRICS_WINDOW:
+            self._commits.popleft()
+
+        for _ in range(self._pending_tasks):
             self.queue.task_done()
 
+        self._pending_events = []
+        self._pending_tasks = 0
+
+    def _save_events(self, events):
+        """Save events and their states in a single transaction.
+
+        When the database can not be reached the whole batch is retried.
+        """
+        from .models import States, Events
+        from sqlalchemy import exc
+
+        if not events:
+            return
+
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                with session_scope(session=self.get_session()) as session:
+                    dbevents = [Events.from_event(event) for event in events]
+                    dbstates = [
+                        (dbevent, States.from_event(event)) for event, dbevent
+                        in zip(events, dbevents)
+                        if event.event_type == EVENT_STATE_CHANGED]
+                    session.add_all(dbevents)
+                    found, added = self._find_attributes(
+                        session, [dbstate for _, dbstate in dbstates])
+                    # Assign the ids the states refer to
+                    session.flush()
+
+                    for shared, dbattributes in added.items():
+                        found[shared] = (dbattributes.hash,
+                                         dbattributes.attributes_id)
+
+                    for dbevent, dbstate in dbstates:
+                        dbstate.event_id = dbevent.event_id
+                        dbstate.attributes_id = found[dbstate.attributes][1]
+                        dbstate.attributes = None
+                    session.bulk_save_objects(
+                        [dbstate for _, dbstate in dbstates])
+                updated = True
+                self._remember_attributes(found.values())
+
+            except exc.OperationalError as err:
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                tries += 1
+
+            except exc.SQLAlchemyError:
+                _LOGGER.exception("Error saving %d events", len(events))
+                return
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save "
+                          "after %d tries. Giving up", tries)
+
+    def _find_attributes(self, session, dbstates):
+        """Find the shared attributes of states.
+
+        Returns the hashes and ids of known attributes and the rows added to
+        the session for new ones, both by their JSON.
+        """
+        from .models import StateAttributes
+
+        found = {}
+        missing = {}
+
+        for dbstate in dbstates:
+            shared = dbstate.attributes
+            if shared in found or shared in missing:
+                continue
+
+            attr_hash = StateAttributes.hash_shared_attrs(shared)
+            attributes_id = self.attributes_ids.get(attr_hash)
+
+            if attributes_id is None:
+                missing[shared] = attr_hash
+            else:
+                found[shared] = (attr_hash, attributes_id)
+
+        hashes = list(set(missing.values()))
+        for idx in range(0, len(hashes), QUERY_CHUNK_SIZE):
+            query = session.query(
+                StateAttributes.attributes_id, StateAttributes.hash,
+                StateAttributes.shared_attrs).filter(
+                    StateAttributes.hash.in_(
+                        hashes[idx:idx + QUERY_CHUNK_SIZE]))
+
+            for attributes_id, attr_hash, shared in query:
+                if missing.pop(shared, None) is not None:
+                    found[shared] = (attr_hash, attributes_id)
+
+        added = {
+            shared: StateAttributes(hash=attr_hash, shared_attrs=shared)
+            for shared, attr_hash in missing.items()}
+        session.add_all(added.values())
+
+        return found, added
+
+    def _remember_attributes(self, hashes_ids):
+        """Remember the ids of recently written attributes."""
+        for attr_hash, attributes_id in hashes_ids:
+            self.attributes_ids[attr_hash] = attributes_id
+            # pylint: disable=no-member
+            self.attributes_ids.move_to_end(attr_hash)
+
+        while len(self.attributes_ids) > ATTRIBUTES_CACHE_SIZE:
+            self.attributes_ids.popitem(last=False)
+
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
+        """Listen for new events and put them in the process queue.
+
+        Events that are not recorded are skipped here already. When the
+        queue reaches its high-water mark, new events are dropped and
+        counted until it drained to half of it.
+        """
+        event_type = event.event_type
+
+        if event_type == EVENT_TIME_CHANGED or event_type in self.exclude_t:
+            return
+
+        if event_type == EVENT_STATE_CHANGED and event.data.get(ATTR_BATCH):
+            # Recorded from the batch event
+            return
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        if entity_id is not None and not self.entity_filter(entity_id):
+            return
+
+        size = self.queue.qsize()
+
+        if self._overflow_dropped is not None:
+            if size > self.queue_high_water // 2:
+                self._overflow_dropped += 1
+                self.dropped_events += 1
+                return
+
+            _LOGGER.warning("Recorder queue drained, %d events were dropped",
+                            self._overflow_dropped)
+            self._overflow_dropped = None
+
+        elif size >= self.queue_high_water:
+            _LOGGER.warning("Recorder queue reached %d events, dropping new "
+                            "events until the database catches up", size)
+            self._overflow_dropped = 1
+            self.dropped_events += 1
+            return
+
         self.queue.put(event)
 
+    def metrics(self):
+        """Return the queue depth, latency and rate of the recorder."""
+        since = time.monotonic() - METRICS_WINDOW
+        commits = [commit for commit in list(self._commits)
+                   if commit[0] >= since]
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_high_water': self.queue_high_water,
+            'dropped_events': self.dropped_events,
+            'commit_latency': self.commit_latency,
+            'commits_per_minute': len(commits) * 60 / METRICS_WINDOW,
+            'events_per_second':
+                sum(count for _, count in commits) / METRICS_WINDOW,
+        }
+
     def block_till_done(self):
-        """Block till all events processed."""
+        """Block till all events processed and committed."""
+        if self.is_alive():
+            self.queue.put(COMMIT_TASK)
         self.queue.join()
 
     def _setup_connection(self):
@@ -1,10 +1,14 @@
 """Schema migration helpers."""
+import json
 import logging
 
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of rows rewritten per transaction
+MIGRATION_BATCH_SIZE = 1000
+
 
 def migrate_schema(instance):
     """Check if the schema needs to be upgraded."""
@@ -114,6 +118,67 @@ def _drop_index(engine, table_name, index_name):
                         "critical operation.", index_name, table_name)
 
 
+def _add_columns(engine, table_name, columns_def):
+    """Add columns to a table.
+
+    The column definitions come from the migration code, never from user
+    input, as they are not escaped.
+    """
+    from sqlalchemy import text
+
+    _LOGGER.info("Adding columns %s to table %s. Note: this can take several "
+                 "minutes on large databases and slow computers. Please "
+                 "be patient!", ', '.join(column.split(' ')[0]
+                                          for column in columns_def),
+                 table_name)
+
+    for column_def in columns_def:
+        engine.execute(text("ALTER TABLE {table} ADD COLUMN {column}".format(
+            table=table_name, column=column_def)))
+
+
+def _minimize_state_changed_events(engine):
+    """Drop the states from state_changed events linked from the states table.
+
+    Events without a linked state keep their data, it is the only copy.
+    """
+    from sqlalchemy import text
+    from .models import state_changed_data
+
+    _LOGGER.info("Removing duplicate state data from events. Note: this can "
+                 "take several minutes on large databases and slow "
+                 "computers. Please be patient!")
+
+    select = text(
+        "SELECT events.event_id, events.event_data FROM events "
+        "JOIN states ON states.event_id = events.event_id "
+        "WHERE events.event_type = 'state_changed' "
+        "AND events.event_id > :last_id "
+        "ORDER BY events.event_id LIMIT :limit")
+    update = text(
+        "UPDATE events SET event_data = :event_data "
+        "WHERE event_id = :event_id")
+    last_id = 0
+
+    while True:
+        rows = engine.execute(
+            select, last_id=last_id, limit=MIGRATION_BATCH_SIZE).fetchall()
+
+        if not rows:
+            break
+
+        with engine.begin() as connection:
+            for event_id, event_data in rows:
+                try:
+                    data = state_changed_data(json.loads(event_data))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                connection.execute(
+                    update, event_data=json.dumps(data), event_id=event_id)
+
+        last_id = rows[-1][0]
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -143,6 +208,16 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id_created")
 
         _create_index(engine, "states", "ix_states_entity_id_last_updated")
+    elif new_version == 5:
+        # Attributes are shared between states in the state_attributes
+        # table, created with the other tables. Existing states keep their
+        # own attributes until they are purged.
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 6:
+        # States of state_changed events are only kept in the states table
+        _create_index(engine, "states", "ix_states_event_id")
+        _minimize_state_changed_events(engine)
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
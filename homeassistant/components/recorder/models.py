@@ -1,14 +1,17 @@
 """Models for SQLAlchemy."""
+import hashlib
 import json
 from datetime import datetime
 import logging
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String,
+    Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
+from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Event, EventOrigin, State, split_entity_id
 from homeassistant.remote import JSONEncoder
 
@@ -16,7 +19,7 @@ from homeassistant.remote import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 4
+SCHEMA_VERSION = 6
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,8 +38,13 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
+        data = event.data
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            data = state_changed_data(data)
+
         return Events(event_type=event.event_type,
-                      event_data=json.dumps(event.data, cls=JSONEncoder),
+                      event_data=json.dumps(data, cls=JSONEncoder),
                       origin=str(event.origin),
                       time_fired=event.time_fired)
 
@@ -63,12 +71,16 @@ class States(Base):   # type: ignore
     domain = Column(String(64))
     entity_id = Column(String(255))
     state = Column(String(255))
+    # Only used by states recorded before schema version 5
     attributes = Column(Text)
-    event_id = Column(Integer, ForeignKey('events.event_id'))
+    attributes_id = Column(
+        Integer, ForeignKey('state_attributes.attributes_id'), index=True)
+    event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
+    state_attributes = relationship('StateAttributes', lazy='joined')
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -78,7 +90,11 @@ class States(Base):   # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are stored on the state until the recorder moves
+        them to the shared state attributes.
+        """
         entity_id = event.data['entity_id']
         state = event.data.get('new_state')
 
@@ -95,7 +111,7 @@ class States(Base):   # type: ignore
             dbstate.domain = state.domain
             dbstate.state = state.state
             dbstate.attributes = json.dumps(dict(state.attributes),
-                                            cls=JSONEncoder)
+                                            cls=JSONEncoder, sort_keys=True)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -104,9 +120,14 @@ class States(Base):   # type: ignore
     def to_native(self):
         """Convert to an HA state object."""
         try:
+            if self.state_attributes is not None:
+                attributes = self.state_attributes.to_native()
+            else:
+                attributes = json.loads(self.attributes)
+
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
+                attributes,
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated)
             )
@@ -116,6 +137,31 @@ class States(Base):   # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """State attributes shared by the states that have them."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    # Decoded attributes, not a column
+    _native = None
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up attributes."""
+        digest = hashlib.sha1(shared_attrs.encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big', signed=True)
+
+    def to_native(self):
+        """Return the attributes, decoded once per loaded row."""
+        if self._native is None:
+            self._native = json.loads(self.shared_attrs)
+
+        return self._native
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
@@ -164,6 +210,19 @@ class SchemaChanges(Base):   # type: ignore
     changed = Column(DateTime(timezone=True), default=datetime.utcnow)
 
 
+def state_changed_data(data):
+    """Return the data of a state_changed event to record.
+
+    The new state is recorded in the states table, linked to the event.
+    Empty placeholders only tell which of the states existed.
+    """
+    return {
+        'entity_id': data['entity_id'],
+        'old_state': None if data.get('old_state') is None else {},
+        'new_state': None if data.get('new_state') is None else {},
+    }
+
+
 def _process_timestamp(ts):
     """Process a timestamp into datetime object."""
     if ts is None:
@@ -1,6 +1,8 @@
 """Purge old data helper."""
+from collections import OrderedDict
 from datetime import timedelta
 import logging
+import time
 
 import homeassistant.util.dt as dt_util
 
@@ -8,58 +10,162 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows deleted per transaction, below the SQLite limit of variables
+PURGE_BATCH_SIZE = 500
+# Seconds to purge before giving the recorder back to writing events
+PURGE_TIME_BUDGET = 1
+# Vacuum SQLite when at least this part of the pages is free
+VACUUM_FREE_RATIO = 0.25
+
 
 def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
-    from .models import States, Events
-    from sqlalchemy import func
+    """Purge events and states older than purge_days ago.
 
+    Rows are deleted in small batches for a limited time. Returns True when
+    the purge is done, False when it needs to run again.
+    """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
 
-    with session_scope(session=instance.get_session()) as session:
-        # For each entity, the most recent state is protected from deletion
-        # s.t. we can properly restore state even if the entity has not been
-        # updated in a long time
-        protected_states = session.query(func.max(States.state_id)) \
-            .group_by(States.entity_id).all()
-
-        protected_state_ids = tuple((state[0] for state in protected_states))
-
-        deleted_rows = session.query(States) \
-                              .filter((States.last_updated < purge_before)) \
-                              .filter(~States.state_id.in_(
-                                  protected_state_ids)) \
-                              .delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s states", deleted_rows)
-
-        # We also need to protect the events belonging to the protected states.
-        # Otherwise, if the SQL server has "ON DELETE CASCADE" as default, it
-        # will delete the protected state when deleting its associated
-        # event. Also, we would be producing NULLed foreign keys otherwise.
-        protected_events = session.query(States.event_id) \
-            .filter(States.state_id.in_(protected_state_ids)) \
-            .filter(States.event_id.isnot(None)) \
-            .all()
-
-        protected_event_ids = tuple((state[0] for state in protected_events))
-
-        deleted_rows = session.query(Events) \
-            .filter((Events.time_fired < purge_before)) \
-            .filter(~Events.event_id.in_(
-                protected_event_ids
-            )) \
-            .delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s events", deleted_rows)
+    start = time.monotonic()
+    deadline = start + PURGE_TIME_BUDGET
+    deleted = OrderedDict()
+    done = True
+
+    for name, purge_batch in (('states', _purge_states_batch),
+                              ('events', _purge_events_batch),
+                              ('state attributes', _purge_attributes_batch)):
+        deleted[name] = 0
+
+        while True:
+            with session_scope(session=instance.get_session()) as session:
+                rows = purge_batch(session, purge_before)
+            deleted[name] += rows
+
+            if rows < PURGE_BATCH_SIZE:
+                break
+
+            if time.monotonic() > deadline:
+                done = False
+                break
+
+        if not done:
+            break
+
+    if deleted.get('state attributes'):
+        # Cached ids may refer to deleted rows
+        instance.attributes_ids.clear()
+
+    elapsed = time.monotonic() - start
+    total = sum(deleted.values())
+    _LOGGER.info(
+        "Purged %s in %.1fs (%.0f rows/s), %s",
+        ', '.join('{} {}'.format(rows, name)
+                  for name, rows in deleted.items()),
+        elapsed, total / elapsed if elapsed else 0,
+        "done" if done else "continuing after pending events")
+
+    if done:
+        _vacuum(instance, repack)
+
+    return done
+
+
+def _purge_states_batch(session, purge_before):
+    """Delete a batch of old states.
+
+    The most recent state of each entity is kept, so it can be restored
+    even if the entity has not been updated in a long time.
+    """
+    from .models import States
+    from sqlalchemy import exists
+    from sqlalchemy.orm import aliased
+
+    newer = aliased(States)
+    state_ids = [row[0] for row in session.query(States.state_id)
+                 .filter(States.last_updated < purge_before)
+                 .filter(exists().where(
+                     (newer.entity_id == States.entity_id) &
+                     (newer.state_id > States.state_id)))
+                 .order_by(States.state_id)
+                 .limit(PURGE_BATCH_SIZE)]
+
+    if not state_ids:
+        return 0
+
+    return session.query(States) \
+        .filter(States.state_id.in_(state_ids)) \
+        .delete(synchronize_session=False)
+
+
+def _purge_events_batch(session, purge_before):
+    """Delete a batch of old events.
+
+    Events of the remaining states are kept. Otherwise, if the SQL server
+    has "ON DELETE CASCADE" as default, it would delete the state too, or
+    leave it with a NULLed foreign key.
+    """
+    from .models import States, Events
+    from sqlalchemy import exists
+
+    event_ids = [row[0] for row in session.query(Events.event_id)
+                 .filter(Events.time_fired < purge_before)
+                 .filter(~exists().where(States.event_id == Events.event_id))
+                 .order_by(Events.event_id)
+                 .limit(PURGE_BATCH_SIZE)]
+
+    if not event_ids:
+        return 0
+
+    return session.query(Events) \
+        .filter(Events.event_id.in_(event_ids)) \
+        .delete(synchronize_session=False)
+
+
+def _purge_attributes_batch(session, purge_before):
+    """Delete a batch of attributes no state refers to anymore."""
+    # pylint: disable=unused-argument
+    from .models import States, StateAttributes
+    from sqlalchemy import exists
+
+    attributes_ids = [
+        row[0] for row in session.query(StateAttributes.attributes_id)
+        .filter(~exists().where(
+            States.attributes_id == StateAttributes.attributes_id))
+        .order_by(StateAttributes.attributes_id)
+        .limit(PURGE_BATCH_SIZE)]
+
+    if not attributes_ids:
+        return 0
+
+    return session.query(StateAttributes) \
+        .filter(StateAttributes.attributes_id.in_(attributes_ids)) \
+        .delete(synchronize_session=False)
+
+
+def _vacuum(instance, repack):
+    """Vacuum SQLite when asked to or when enough pages are free."""
+    from sqlalchemy import exc
 
-    # Execute sqlite vacuum command to free up space on disk
     _LOGGER.debug("DB engine driver: %s", instance.engine.driver)
-    if repack and instance.engine.driver == 'pysqlite':
-        from sqlalchemy import exc
-
-        _LOGGER.debug("Vacuuming SQLite to free space")
-        try:
-            instance.engine.execute("VACUUM")
-            instance.did_vacuum = True
-        except exc.OperationalError as err:
-            _LOGGER.error("Error vacuuming SQLite: %s.", err)
+    if instance.engine.driver != 'pysqlite':
+        return
+
+    if not repack:
+        page_count = instance.engine.execute(
+            "PRAGMA page_count").scalar()
+        free_count = instance.engine.execute(
+            "PRAGMA freelist_count").scalar()
+
+        if not page_count or free_count / page_count < VACUUM_FREE_RATIO:
+            return
+
+        _LOGGER.debug("%d of %d pages are free", free_count, page_count)
+
+    # Execute sqlite vacuum command to free up space on disk
+    _LOGGER.debug("Vacuuming SQLite to free space")
+    try:
+        instance.engine.execute("VACUUM")
+        instance.did_vacuum = True
+    except exc.OperationalError as err:
+        _LOGGER.error("Error vacuuming SQLite: %s.", err)
@@ -49,10 +49,12 @@ def commit(session, work):
     return False
 
 
-def execute(qry):
+def execute(qry, to_native=None):
     """Query the database and convert the objects to HA native form.
 
-    This method also retries a few times in the case of stale connections.
+    Rows are converted with to_native(row) when given, otherwise with their
+    own to_native method. This method also retries a few times in the case
+    of stale connections.
     """
     from sqlalchemy.exc import SQLAlchemyError
 
@@ -61,7 +63,8 @@ def execute(qry):
             timer_start = time.perf_counter()
             result = [
                 row for row in
-                (row.to_native() for row in qry)
+                (row.to_native() if to_native is None else to_native(row)
+                 for row in qry)
                 if row is not None]
 
             if _LOGGER.isEnabledFor(logging.DEBUG):
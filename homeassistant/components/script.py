@@ -17,6 +17,7 @@ from homeassistant.const import (
     SERVICE_TOGGLE, SERVICE_RELOAD, STATE_ON, CONF_ALIAS)
 from homeassistant.core import split_entity_id
 from homeassistant.loader import bind_hass
+from homeassistant.helpers import config_hash
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 import homeassistant.helpers.config_validation as cv
@@ -107,12 +108,12 @@ def async_setup(hass, config):
 
     @asyncio.coroutine
     def reload_service(service):
-        """Call a service to reload scripts."""
-        conf = yield from component.async_prepare_reload()
+        """Call a service to reload scripts whose config changed."""
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
-        yield from _async_process_config(hass, conf, component)
+        yield from _async_process_config(hass, conf, component, reloading=True)
 
     @asyncio.coroutine
     def turn_on_service(service):
@@ -150,8 +151,12 @@ def async_setup(hass, config):
 
 
 @asyncio.coroutine
-def _async_process_config(hass, config, component):
-    """Process group configuration."""
+def _async_process_config(hass, config, component, reloading=False):
+    """Process script configuration.
+
+    When reloading, scripts with an unchanged config are kept, even if they
+    are running. Changed scripts are stopped and replaced.
+    """
     @asyncio.coroutine
     def service_handler(service):
         """Execute a service call to script.<script name>."""
@@ -163,10 +168,26 @@ def _async_process_config(hass, config, component):
         yield from script.async_turn_on(variables=service.data)
 
     scripts = []
+    replaced = {}
+
+    if reloading:
+        for script in list(component.entities):
+            cfg = config[DOMAIN].get(script.object_id)
+            if cfg is not None and config_hash(cfg) == script.config_hash:
+                continue
+            replaced[script.object_id] = script
+            yield from component.async_remove_entity(script.entity_id)
 
     for object_id, cfg in config[DOMAIN].items():
+        if component.get_entity(ENTITY_ID_FORMAT.format(object_id)):
+            continue
+
         alias = cfg.get(CONF_ALIAS, object_id)
         script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
+        script.config_hash = config_hash(cfg)
+        if object_id in replaced:
+            script.script.last_triggered = \
+                replaced[object_id].script.last_triggered
         scripts.append(script)
         hass.services.async_register(
             DOMAIN, object_id, service_handler, schema=SCRIPT_SERVICE_SCHEMA)
@@ -182,6 +203,7 @@ class ScriptEntity(ToggleEntity):
         self.object_id = object_id
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self.script = Script(hass, sequence, name, self.async_update_ha_state)
+        self.config_hash = None
 
     @property
     def should_poll(self):
@@ -22,9 +22,11 @@ CONF_MAX_ENTRIES = 'max_entries'
 CONF_MESSAGE = 'message'
 CONF_LEVEL = 'level'
 CONF_LOGGER = 'logger'
+CONF_STALL_THRESHOLD = 'stall_threshold'
 
 DATA_SYSTEM_LOG = 'system_log'
 DEFAULT_MAX_ENTRIES = 50
+DEFAULT_STALL_THRESHOLD = 0.5
 DEPENDENCIES = ['http']
 DOMAIN = 'system_log'
 
@@ -37,6 +39,8 @@ CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Optional(CONF_MAX_ENTRIES, default=DEFAULT_MAX_ENTRIES):
             cv.positive_int,
+        vol.Optional(CONF_STALL_THRESHOLD, default=DEFAULT_STALL_THRESHOLD):
+            vol.All(vol.Coerce(float), vol.Range(min=0.05)),
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -145,6 +149,10 @@ def async_setup(hass, config):
 
     hass.http.register_view(AllErrorsView(handler))
 
+    # Stalls of the event loop are logged as warnings and show up in the log
+    hass.watchdog.threshold = conf[CONF_STALL_THRESHOLD]
+    hass.http.register_view(LoopStallsView)
+
     @asyncio.coroutine
     def async_service_handler(service):
         """Handle logger services."""
@@ -192,3 +200,15 @@ class AllErrorsView(HomeAssistantView):
         # deque is not serializable (it's just "list-like") so it must be
         # converted to a list before it can be serialized to json
         return self.json(list(self.handler.records))
+
+
+class LoopStallsView(HomeAssistantView):
+    """Get the detected event loop stalls per component."""
+
+    url = "/api/error/stalls"
+    name = "api:error:stalls"
+
+    @asyncio.coroutine
+    def get(self, request):
+        """Get the event loop stalls."""
+        return self.json(request.app['hass'].watchdog.as_dict())
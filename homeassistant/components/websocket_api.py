@@ -16,13 +16,17 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.const import (
-    MATCH_ALL, EVENT_TIME_CHANGED, EVENT_HOMEASSISTANT_STOP,
+    ATTR_BATCH, ATTR_CHANGES, MATCH_ALL, EVENT_TIME_CHANGED,
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED, EVENT_STATE_CHANGED_BATCH,
     __version__)
 from homeassistant.components import frontend
-from homeassistant.core import callback
+from homeassistant.components.recorder.const import (
+    DATA_INSTANCE as DATA_RECORDER)
+from homeassistant.core import Event, callback
 from homeassistant.remote import JSONEncoder
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.timeline import DATA_TIMELINE
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.http.auth import validate_password
 from homeassistant.components.http.const import KEY_AUTHENTICATED
@@ -46,9 +50,12 @@ TYPE_AUTH_REQUIRED = 'auth_required'
 TYPE_CALL_SERVICE = 'call_service'
 TYPE_EVENT = 'event'
 TYPE_GET_CONFIG = 'get_config'
+TYPE_GET_EVENT_STATS = 'get_event_stats'
 TYPE_GET_PANELS = 'get_panels'
+TYPE_GET_RECORDER_METRICS = 'get_recorder_metrics'
 TYPE_GET_SERVICES = 'get_services'
 TYPE_GET_STATES = 'get_states'
+TYPE_GET_STARTUP_TIMELINE = 'get_startup_timeline'
 TYPE_PING = 'ping'
 TYPE_PONG = 'pong'
 TYPE_RESULT = 'result'
@@ -99,11 +106,26 @@ GET_CONFIG_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('type'): TYPE_GET_CONFIG,
 })
 
+GET_EVENT_STATS_MESSAGE_SCHEMA = vol.Schema({
+    vol.Required('id'): cv.positive_int,
+    vol.Required('type'): TYPE_GET_EVENT_STATS,
+})
+
 GET_PANELS_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('id'): cv.positive_int,
     vol.Required('type'): TYPE_GET_PANELS,
 })
 
+GET_RECORDER_METRICS_MESSAGE_SCHEMA = vol.Schema({
+    vol.Required('id'): cv.positive_int,
+    vol.Required('type'): TYPE_GET_RECORDER_METRICS,
+})
+
+GET_STARTUP_TIMELINE_MESSAGE_SCHEMA = vol.Schema({
+    vol.Required('id'): cv.positive_int,
+    vol.Required('type'): TYPE_GET_STARTUP_TIMELINE,
+})
+
 PING_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('id'): cv.positive_int,
     vol.Required('type'): TYPE_PING,
@@ -117,7 +139,10 @@ BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({
                                   TYPE_GET_STATES,
                                   TYPE_GET_SERVICES,
                                   TYPE_GET_CONFIG,
+                                  TYPE_GET_EVENT_STATS,
                                   TYPE_GET_PANELS,
+                                  TYPE_GET_RECORDER_METRICS,
+                                  TYPE_GET_STARTUP_TIMELINE,
                                   TYPE_PING)
 }, extra=vol.ALLOW_EXTRA)
 
@@ -410,17 +435,47 @@ class ActiveConnection:
         """
         msg = SUBSCRIBE_EVENTS_MESSAGE_SCHEMA(msg)
 
+        expand_batch = msg['event_type'] != EVENT_STATE_CHANGED_BATCH
+
         @asyncio.coroutine
         def forward_events(event):
             """Forward events to websocket."""
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
+            # Unless the client asked for batches, forward the state changes
+            # of a batch as a list of regular state changed events, sent in
+            # a single message.
+            if expand_batch and event.event_type == EVENT_STATE_CHANGED_BATCH:
+                self.send_message_outside([
+                    event_message(msg['id'], Event(
+                        EVENT_STATE_CHANGED, change,
+                        time_fired=event.time_fired))
+                    for change in event.data[ATTR_CHANGES]])
+                return
+
+            if (expand_batch and event.event_type == EVENT_STATE_CHANGED and
+                    event.data.get(ATTR_BATCH)):
+                return
+
             self.send_message_outside(event_message(msg['id'], event))
 
-        self.event_listeners[msg['id']] = self.hass.bus.async_listen(
+        unsub_event = self.hass.bus.async_listen(
             msg['event_type'], forward_events)
 
+        if msg['event_type'] == EVENT_STATE_CHANGED:
+            unsub_batch = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED_BATCH, forward_events)
+
+            def unsub_state_changed():
+                """Remove the state changed listeners."""
+                unsub_event()
+                unsub_batch()
+
+            self.event_listeners[msg['id']] = unsub_state_changed
+        else:
+            self.event_listeners[msg['id']] = unsub_event
+
         self.to_write.put_nowait(result_message(msg['id']))
 
     def handle_unsubscribe_events(self, msg):
@@ -491,6 +546,53 @@ class ActiveConnection:
         self.to_write.put_nowait(result_message(
             msg['id'], self.hass.config.as_dict()))
 
+    def handle_get_event_stats(self, msg):
+        """Handle get event stats command.
+
+        Async friendly.
+        """
+        msg = GET_EVENT_STATS_MESSAGE_SCHEMA(msg)
+        stats = self.hass.bus.stats
+
+        if stats is None:
+            self.to_write.put_nowait(error_message(
+                msg['id'], ERR_NOT_FOUND, 'Statistics are not enabled.'))
+            return
+
+        self.to_write.put_nowait(result_message(msg['id'], stats.as_dict()))
+
+    def handle_get_startup_timeline(self, msg):
+        """Handle get startup timeline command.
+
+        Async friendly.
+        """
+        msg = GET_STARTUP_TIMELINE_MESSAGE_SCHEMA(msg)
+        timeline = self.hass.data.get(DATA_TIMELINE)
+
+        if timeline is None:
+            self.to_write.put_nowait(error_message(
+                msg['id'], ERR_NOT_FOUND, 'No startup timeline recorded.'))
+            return
+
+        self.to_write.put_nowait(result_message(
+            msg['id'], timeline.as_dict()))
+
+    def handle_get_recorder_metrics(self, msg):
+        """Handle get recorder metrics command.
+
+        Async friendly.
+        """
+        msg = GET_RECORDER_METRICS_MESSAGE_SCHEMA(msg)
+        recorder = self.hass.data.get(DATA_RECORDER)
+
+        if recorder is None:
+            self.to_write.put_nowait(error_message(
+                msg['id'], ERR_NOT_FOUND, 'The recorder is not running.'))
+            return
+
+        self.to_write.put_nowait(result_message(
+            msg['id'], recorder.metrics()))
+
     def handle_get_panels(self, msg):
         """Handle get panels command.
 
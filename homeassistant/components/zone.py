@@ -65,8 +65,8 @@ def async_active_zone(hass, latitude, longitude, radius=0):
     This method must be run in the event loop.
     """
     # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (hass.states.get(entity_id) for entity_id
-             in sorted(hass.states.async_entity_ids(DOMAIN)))
+    zones = sorted(hass.states.async_all(DOMAIN),
+                   key=lambda state: state.entity_id)
 
     min_dist = None
     closest = None
@@ -19,10 +19,12 @@ from homeassistant.const import (
     CONF_TIME_ZONE, CONF_ELEVATION, CONF_UNIT_SYSTEM_METRIC,
     CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
     __version__, CONF_CUSTOMIZE, CONF_CUSTOMIZE_DOMAIN, CONF_CUSTOMIZE_GLOB,
-    CONF_WHITELIST_EXTERNAL_DIRS)
-from homeassistant.core import callback, DOMAIN as CONF_CORE
+    CONF_WHITELIST_EXTERNAL_DIRS, CONF_EXECUTORS, CONF_INTEGRATIONS,
+    CONF_MAX_WORKERS, CONF_SETUP_MAX_PARALLEL, CONF_SETUP_TIMEOUT)
+from homeassistant.core import callback, executor_pool, DOMAIN as CONF_CORE
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import get_component, get_platform
+from homeassistant.util.executor import POOL_CPU
 from homeassistant.util.yaml import load_yaml, SECRET_YAML
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import dt as date_util, location as loc_util
@@ -140,6 +142,14 @@ CUSTOMIZE_CONFIG_SCHEMA = vol.Schema({
         vol.Schema({cv.string: OrderedDict}),
 })
 
+EXECUTORS_CONFIG_SCHEMA = vol.Schema({
+    cv.slug: vol.Schema({
+        vol.Optional(CONF_MAX_WORKERS): cv.positive_int,
+        vol.Optional(CONF_INTEGRATIONS, default=[]):
+            vol.All(cv.ensure_list, [cv.string]),
+    })
+})
+
 CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend({
     CONF_NAME: vol.Coerce(str),
     CONF_LATITUDE: cv.latitude,
@@ -152,6 +162,9 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend({
         # pylint: disable=no-value-for-parameter
         vol.All(cv.ensure_list, [vol.IsDir()]),
     vol.Optional(CONF_PACKAGES, default={}): PACKAGES_CONFIG_SCHEMA,
+    vol.Optional(CONF_EXECUTORS, default={}): EXECUTORS_CONFIG_SCHEMA,
+    vol.Optional(CONF_SETUP_MAX_PARALLEL): cv.positive_int,
+    vol.Optional(CONF_SETUP_TIMEOUT): cv.positive_int,
 })
 
 
@@ -269,6 +282,7 @@ def async_hass_config_yaml(hass):
 
     This method is a coroutine.
     """
+    @executor_pool(POOL_CPU)
     def _load_hass_yaml_config():
         path = find_config_file(hass.config.config_dir)
         conf = load_yaml_config_file(path)
@@ -288,6 +302,7 @@ def find_config_file(config_dir):
     return config_path if os.path.isfile(config_path) else None
 
 
+@executor_pool(POOL_CPU)
 def load_yaml_config_file(config_path):
     """Parse a YAML configuration file.
 
@@ -398,7 +413,9 @@ def async_process_ha_core_config(hass, config):
     for key, attr in ((CONF_LATITUDE, 'latitude'),
                       (CONF_LONGITUDE, 'longitude'),
                       (CONF_NAME, 'location_name'),
-                      (CONF_ELEVATION, 'elevation')):
+                      (CONF_ELEVATION, 'elevation'),
+                      (CONF_SETUP_MAX_PARALLEL, 'setup_max_parallel'),
+                      (CONF_SETUP_TIMEOUT, 'setup_timeout')):
         if key in config:
             setattr(hac, attr, config[key])
 
@@ -411,6 +428,14 @@ def async_process_ha_core_config(hass, config):
         hac.whitelist_external_dirs.update(
             set(config[CONF_WHITELIST_EXTERNAL_DIRS]))
 
+    # Executor pools
+    for name, pool_conf in config[CONF_EXECUTORS].items():
+        if CONF_MAX_WORKERS in pool_conf or name not in hass.executors.pools:
+            hass.executors.create(name, pool_conf.get(CONF_MAX_WORKERS))
+
+        for integration in pool_conf[CONF_INTEGRATIONS]:
+            hass.executors.assign(integration, name)
+
     # Customize
     cust_exact = dict(config[CONF_CUSTOMIZE])
     cust_domain = dict(config[CONF_CUSTOMIZE_DOMAIN])
@@ -71,6 +71,7 @@ CONF_ENTITY_NAMESPACE = 'entity_namespace'
 CONF_ENTITY_PICTURE_TEMPLATE = 'entity_picture_template'
 CONF_EVENT = 'event'
 CONF_EXCLUDE = 'exclude'
+CONF_EXECUTORS = 'executors'
 CONF_FILE_PATH = 'file_path'
 CONF_FILENAME = 'filename'
 CONF_FOR = 'for'
@@ -83,6 +84,7 @@ CONF_HOSTS = 'hosts'
 CONF_ICON = 'icon'
 CONF_ICON_TEMPLATE = 'icon_template'
 CONF_INCLUDE = 'include'
+CONF_INTEGRATIONS = 'integrations'
 CONF_ID = 'id'
 CONF_IP_ADDRESS = 'ip_address'
 CONF_LATITUDE = 'latitude'
@@ -91,6 +93,7 @@ CONF_LIGHTS = 'lights'
 CONF_MAC = 'mac'
 CONF_METHOD = 'method'
 CONF_MAXIMUM = 'maximum'
+CONF_MAX_WORKERS = 'max_workers'
 CONF_MINIMUM = 'minimum'
 CONF_MODE = 'mode'
 CONF_MONITORED_CONDITIONS = 'monitored_conditions'
@@ -124,6 +127,8 @@ CONF_SCAN_INTERVAL = 'scan_interval'
 CONF_SENDER = 'sender'
 CONF_SENSOR_TYPE = 'sensor_type'
 CONF_SENSORS = 'sensors'
+CONF_SETUP_MAX_PARALLEL = 'setup_max_parallel'
+CONF_SETUP_TIMEOUT = 'setup_timeout'
 CONF_SHOW_ON_MAP = 'show_on_map'
 CONF_SLAVE = 'slave'
 CONF_SSL = 'ssl'
@@ -155,6 +160,7 @@ EVENT_HOMEASSISTANT_START = 'homeassistant_start'
 EVENT_HOMEASSISTANT_STOP = 'homeassistant_stop'
 EVENT_HOMEASSISTANT_CLOSE = 'homeassistant_close'
 EVENT_STATE_CHANGED = 'state_changed'
+EVENT_STATE_CHANGED_BATCH = 'state_changed_batch'
 EVENT_TIME_CHANGED = 'time_changed'
 EVENT_CALL_SERVICE = 'call_service'
 EVENT_SERVICE_EXECUTED = 'service_executed'
@@ -217,6 +223,11 @@ ATTR_ID = 'id'
 # Data for a SERVICE_EXECUTED event
 ATTR_SERVICE_CALL_ID = 'service_call_id'
 
+# Data for a STATE_CHANGED_BATCH event, state changed events that are part
+# of a batch are marked with ATTR_BATCH
+ATTR_BATCH = 'batch'
+ATTR_CHANGES = 'changes'
+
 # Contains one string or a list of strings, each being an entity id
 ATTR_ENTITY_ID = 'entity_id'
 
@@ -389,6 +400,7 @@ URL_API_COMPONENTS = '/api/components'
 URL_API_ERROR_LOG = '/api/error_log'
 URL_API_LOG_OUT = '/api/log_out'
 URL_API_TEMPLATE = '/api/template'
+URL_API_EXECUTORS = '/api/executors'
 
 HTTP_OK = 200
 HTTP_CREATED = 201
@@ -6,8 +6,9 @@ of entities and react to changes.
 """
 # pylint: disable=unused-import, too-many-lines
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 import enum
+import functools
 import logging
 import os
 import pathlib
@@ -24,21 +25,24 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.const import (
-    ATTR_DOMAIN, ATTR_FRIENDLY_NAME, ATTR_NOW, ATTR_SERVICE,
-    ATTR_SERVICE_CALL_ID, ATTR_SERVICE_DATA, EVENT_CALL_SERVICE,
+    ATTR_BATCH, ATTR_CHANGES, ATTR_DOMAIN, ATTR_FRIENDLY_NAME, ATTR_NOW,
+    ATTR_SERVICE, ATTR_SERVICE_CALL_ID, ATTR_SERVICE_DATA, EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
     EVENT_SERVICE_EXECUTED, EVENT_SERVICE_REGISTERED, EVENT_STATE_CHANGED,
-    EVENT_TIME_CHANGED, MATCH_ALL, EVENT_HOMEASSISTANT_CLOSE,
-    EVENT_SERVICE_REMOVED, __version__)
+    EVENT_STATE_CHANGED_BATCH, EVENT_TIME_CHANGED, MATCH_ALL,
+    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REMOVED, __version__)
 from homeassistant import loader
 from homeassistant.exceptions import (
     HomeAssistantError, InvalidEntityFormatError, InvalidStateError)
 from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe,
-    fire_coroutine_threadsafe)
+    fire_coroutine_threadsafe, ThreadsafeCallQueue)
 import homeassistant.util as util
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import ExecutorPools
+from homeassistant.util.histogram import Histogram
 import homeassistant.util.location as location
+from homeassistant.util.watchdog import LoopWatchdog
 from homeassistant.util.unit_system import UnitSystem, METRIC_SYSTEM  # NOQA
 
 DOMAIN = 'homeassistant'
@@ -52,6 +56,12 @@ ENTITY_ID_PATTERN = re.compile(r"^(\w+)\.(\w+)$")
 # How long to wait till things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# How many components are set up at the same time during startup
+SETUP_MAX_PARALLEL = 20
+
+# How long startup waits for a component to be set up
+SETUP_TIMEOUT = 300  # seconds
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -77,6 +87,16 @@ def callback(func: Callable[..., None]) -> Callable[..., None]:
     return func
 
 
+def executor_pool(name: str) -> Callable:
+    """Annotation to mark a sync function to run in a named executor pool."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Store the name of the pool on the function."""
+        # pylint: disable=protected-access
+        func._hass_executor_pool = name
+        return func
+    return decorator
+
+
 def is_callback(func: Callable[..., Any]) -> bool:
     """Check if function is safe to be called in the event loop."""
     return '_hass_callback' in func.__dict__
@@ -117,22 +137,19 @@ class HomeAssistant(object):
         else:
             self.loop = loop or asyncio.get_event_loop()
 
-        executor_opts = {'max_workers': 10}
-        if sys.version_info[:2] >= (3, 5):
-            # It will default set to the number of processors on the machine,
-            # multiplied by 5. That is better for overlap I/O workers.
-            executor_opts['max_workers'] = None
-        if sys.version_info[:2] >= (3, 6):
-            executor_opts['thread_name_prefix'] = 'SyncWorker'
-
-        self.executor = ThreadPoolExecutor(**executor_opts)
-        self.loop.set_default_executor(self.executor)
+        self.executors = ExecutorPools(self.loop)
         self.loop.set_exception_handler(async_loop_exception_handler)
-        self._pending_tasks = []
+        # Jobs submitted from other threads, run in one loop wakeup per batch
+        self.call_queue = ThreadsafeCallQueue(self.loop)
+        self._pending_tasks = set()
+        # Resolved when the last pending task is done
+        self._pending_done = None
+        # Callbacks scheduled by async_add_job that did not run yet
+        self._pending_callbacks = 0
         self._track_task = True
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
-        self.states = StateMachine(self.bus, self.loop)
+        self.states = StateMachine(self.bus, self.loop, self.call_queue)
         self.config = Config()  # type: Config
         self.components = loader.Components(self)
         self.helpers = loader.Helpers(self)
@@ -140,6 +157,14 @@ class HomeAssistant(object):
         self.data = {}
         self.state = CoreState.not_running
         self.exit_code = None
+        # Detects callbacks that block the event loop
+        self.watchdog = LoopWatchdog(self.loop)
+        self.watchdog.start()
+
+    @property
+    def executor(self):
+        """Return the default executor pool."""
+        return self.executors.default
 
     @property
     def is_running(self) -> bool:
@@ -202,7 +227,7 @@ class HomeAssistant(object):
         """
         if target is None:
             raise ValueError("Don't call add_job with None")
-        self.loop.call_soon_threadsafe(self.async_add_job, target, *args)
+        self.call_queue.call_soon(self.async_add_job, target, *args)
 
     @callback
     def async_add_job(self, target: Callable[..., None], *args: Any) -> None:
@@ -218,18 +243,38 @@ class HomeAssistant(object):
         if asyncio.iscoroutine(target):
             task = self.loop.create_task(target)
         elif is_callback(target):
-            self.loop.call_soon(target, *args)
+            self._pending_callbacks += 1
+            self.loop.call_soon(self._async_run_callback, target, args)
         elif asyncio.iscoroutinefunction(target):
             task = self.loop.create_task(target(*args))
         else:
-            task = self.loop.run_in_executor(None, target, *args)
+            task = self.loop.run_in_executor(
+                self.executors.get(target), target, *args)
 
         # If a task is scheduled
         if self._track_task and task is not None:
-            self._pending_tasks.append(task)
+            self._pending_tasks.add(task)
+            task.add_done_callback(self.async_untrack_task)
 
         return task
 
+    @callback
+    def _async_run_callback(self, target, args):
+        """Run a callback scheduled by async_add_job."""
+        try:
+            target(*args)
+        finally:
+            self._pending_callbacks -= 1
+
+    @callback
+    def async_untrack_task(self, task):
+        """Stop tracking a task so waiting for all tasks skips it."""
+        self._pending_tasks.discard(task)
+
+        if (not self._pending_tasks and self._pending_done is not None and
+                not self._pending_done.done()):
+            self._pending_done.set_result(None)
+
     @callback
     def async_track_tasks(self):
         """Track tasks so you can wait for all tasks to be done."""
@@ -265,14 +310,18 @@ class HomeAssistant(object):
         # To flush out any call_soon_threadsafe
         yield from asyncio.sleep(0, loop=self.loop)
 
-        while self._pending_tasks:
-            pending = [task for task in self._pending_tasks
-                       if not task.done()]
-            self._pending_tasks.clear()
-            if pending:
-                yield from asyncio.wait(pending, loop=self.loop)
-            else:
+        while (self._pending_tasks or self._pending_callbacks or
+               self.call_queue):
+            if not self._pending_tasks:
+                # Run the callbacks, they can schedule more work
                 yield from asyncio.sleep(0, loop=self.loop)
+                continue
+
+            if self._pending_done is None or self._pending_done.done():
+                self._pending_done = asyncio.Future(loop=self.loop)
+
+            # Shared by all waiters, a cancelled waiter must not cancel it
+            yield from asyncio.shield(self._pending_done, loop=self.loop)
 
     def stop(self) -> None:
         """Stop Home Assistant and shuts down all threads."""
@@ -294,7 +343,8 @@ class HomeAssistant(object):
         self.state = CoreState.not_running
         self.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
         yield from self.async_block_till_done()
-        self.executor.shutdown()
+        self.watchdog.stop()
+        self.executors.shutdown()
 
         self.exit_code = exit_code
         self.loop.stop()
@@ -363,6 +413,34 @@ class EventBus(object):
         """Initialize a new event bus."""
         self._listeners = {}
         self._hass = hass
+        # Run @callback listeners inside async_fire instead of scheduling
+        # them on the event loop. Listeners then run before async_fire
+        # returns, which is why it is opt-in.
+        self.inline_callbacks = False
+        self._stats = None
+
+    @property
+    def stats(self):
+        """Return the collected statistics or None if not enabled."""
+        return self._stats
+
+    @callback
+    def async_enable_stats(self):
+        """Start counting events and timing the listeners.
+
+        This method must be run in the event loop.
+        """
+        if self._stats is None:
+            self._stats = EventBusStats()
+        return self._stats
+
+    @callback
+    def async_disable_stats(self):
+        """Stop counting events and timing the listeners.
+
+        This method must be run in the event loop.
+        """
+        self._stats = None
 
     @callback
     def async_listeners(self):
@@ -382,7 +460,7 @@ class EventBus(object):
 
     def fire(self, event_type: str, event_data=None, origin=EventOrigin.local):
         """Fire an event."""
-        self._hass.loop.call_soon_threadsafe(
+        self._hass.call_queue.call_soon(
             self.async_fire, event_type, event_data, origin)
 
     @callback
@@ -405,11 +483,33 @@ class EventBus(object):
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.info("Bus:Handling %s", event)
 
+        stats = self._stats
+        if stats is not None:
+            stats.async_event_fired(event_type)
+
         if not listeners:
             return
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        if stats is not None:
+            listeners = [stats.async_wrap_listener(func)
+                         for func in listeners]
+
+        if not self.inline_callbacks:
+            for func in listeners:
+                self._hass.async_add_job(func, event)
+            return
+
+        # Listeners can add or remove listeners while we iterate
+        for func in listeners[:]:
+            if not is_callback(func):
+                self._hass.async_add_job(func, event)
+                continue
+
+            try:
+                func(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running listener %s for %s",
+                                  func, event)
 
     def listen(self, event_type, listener):
         """Listen for all events or events of a specific type.
@@ -441,6 +541,9 @@ class EventBus(object):
         else:
             self._listeners[event_type] = [listener]
 
+        if self._stats is not None:
+            self._stats.async_wrap_listener(listener)
+
         def remove_listener():
             """Remove the listener."""
             self._async_remove_listener(event_type, listener)
@@ -499,6 +602,9 @@ class EventBus(object):
 
         This method must be run in the event loop.
         """
+        if self._stats is not None:
+            self._stats.async_remove_listener(listener)
+
         try:
             self._listeners[event_type].remove(listener)
 
@@ -511,6 +617,151 @@ class EventBus(object):
             _LOGGER.warning("Unable to remove unknown listener %s", listener)
 
 
+class EventBusStats(object):
+    """Count fired events and time the listeners that handle them.
+
+    Wait is the time between firing and the listener starting to run, for
+    sync listeners that is the time spent in the executor queue.
+    """
+
+    def __init__(self):
+        """Initialize the statistics."""
+        self.since = dt_util.utcnow()
+        self.fired = {}
+        self.listeners = {}
+        self._start = monotonic()
+        # Sync listeners record their runs from executor threads
+        self._lock = threading.Lock()
+        # Timed version of each listener, created once per listener
+        self._wrappers = {}
+
+    @callback
+    def async_event_fired(self, event_type):
+        """Count a fired event.
+
+        This method must be run in the event loop.
+        """
+        self.fired[event_type] = self.fired.get(event_type, 0) + 1
+
+    @callback
+    def async_wrap_listener(self, func):
+        """Return the listener that records the runs of func.
+
+        The timed listener is created once and reused for every event.
+
+        This method must be run in the event loop.
+        """
+        wrapper = self._wrappers.get(func)
+
+        if wrapper is None:
+            wrapper = self._wrappers[func] = self._timed_listener(func)
+
+        return wrapper
+
+    @callback
+    def async_remove_listener(self, func):
+        """Forget the timed listener of a removed listener.
+
+        This method must be run in the event loop.
+        """
+        self._wrappers.pop(func, None)
+
+    def _timed_listener(self, func):
+        """Create a listener that records the runs of func.
+
+        It keeps the module and executor pool of func, so sync listeners
+        still run in the pool of their integration.
+        """
+        name = _listener_name(func)
+        wraps = functools.wraps(func)
+
+        if is_callback(func):
+            @callback
+            @wraps
+            def timed_callback(event):
+                """Run and time a callback listener."""
+                start = monotonic()
+                try:
+                    func(event)
+                finally:
+                    self._record(name, event, start)
+
+            return timed_callback
+
+        if asyncio.iscoroutinefunction(func):
+            @asyncio.coroutine
+            @wraps
+            def timed_coroutine(event):
+                """Run and time a coroutine listener."""
+                start = monotonic()
+                try:
+                    yield from func(event)
+                finally:
+                    self._record(name, event, start)
+
+            return timed_coroutine
+
+        @wraps
+        def timed_job(event):
+            """Run and time a sync listener."""
+            start = monotonic()
+            try:
+                func(event)
+            finally:
+                self._record(name, event, start)
+
+        return timed_job
+
+    def _record(self, name, event, start):
+        """Record the run of a listener that started at start."""
+        run = monotonic() - start
+        # From firing the event until the listener started
+        wait = max(
+            (dt_util.utcnow() - event.time_fired).total_seconds() - run, 0)
+
+        with self._lock:
+            listener = self.listeners.get(name)
+
+            if listener is None:
+                listener = self.listeners[name] = {
+                    'wait': Histogram(),
+                    'run': Histogram(),
+                }
+
+            listener['wait'].add(wait)
+            listener['run'].add(run)
+
+    def as_dict(self):
+        """Return a dictionary representation of the statistics."""
+        duration = monotonic() - self._start
+
+        with self._lock:
+            listeners = {
+                name: {key: hist.as_dict() for key, hist in listener.items()}
+                for name, listener in self.listeners.items()}
+
+        return {
+            'since': self.since,
+            'duration': duration,
+            'events': {
+                event_type: {
+                    'count': count,
+                    'rate': count / duration if duration else 0,
+                } for event_type, count in self.fired.items()},
+            'listeners': listeners,
+        }
+
+
+def _listener_name(func):
+    """Return a readable name for a listener."""
+    name = getattr(func, '__qualname__', None)
+
+    if name is None:
+        return repr(func)
+
+    return '{}.{}'.format(getattr(func, '__module__', None), name)
+
+
 class State(object):
     """Object to represent a state within the state machine.
 
@@ -621,11 +872,14 @@ class State(object):
 class StateMachine(object):
     """Helper class that tracks the state of different entities."""
 
-    def __init__(self, bus, loop):
+    def __init__(self, bus, loop, call_queue=None):
         """Initialize state machine."""
         self._states = {}
+        # Entity ids per domain, in the order they were added
+        self._domains = {}
         self._bus = bus
         self._loop = loop
+        self._call_queue = call_queue or ThreadsafeCallQueue(loop)
 
     def entity_ids(self, domain_filter=None):
         """List of entity ids that are being tracked."""
@@ -643,22 +897,26 @@ class StateMachine(object):
         if domain_filter is None:
             return list(self._states.keys())
 
-        domain_filter = domain_filter.lower()
-
-        return [state.entity_id for state in self._states.values()
-                if state.domain == domain_filter]
+        return list(self._domains.get(domain_filter.lower(), ()))
 
-    def all(self):
+    def all(self, domain_filter=None):
         """Create a list of all states."""
-        return run_callback_threadsafe(self._loop, self.async_all).result()
+        return run_callback_threadsafe(
+            self._loop, self.async_all, domain_filter).result()
 
     @callback
-    def async_all(self):
+    def async_all(self, domain_filter=None):
         """Create a list of all states.
 
         This method must be run in the event loop.
         """
-        return list(self._states.values())
+        if domain_filter is None:
+            return list(self._states.values())
+
+        states = self._states
+
+        return [states[entity_id] for entity_id
+                in self._domains.get(domain_filter.lower(), ())]
 
     def get(self, entity_id):
         """Retrieve state of entity_id or None if not found.
@@ -697,6 +955,12 @@ class StateMachine(object):
         if old_state is None:
             return False
 
+        domain = old_state.domain
+        domain_entity_ids = self._domains[domain]
+        domain_entity_ids.pop(entity_id)
+        if not domain_entity_ids:
+            self._domains.pop(domain)
+
         self._bus.async_fire(EVENT_STATE_CHANGED, {
             'entity_id': entity_id,
             'old_state': old_state,
@@ -712,8 +976,7 @@ class StateMachine(object):
         If you just update the attributes and not the state, last changed will
         not be affected.
         """
-        run_callback_threadsafe(
-            self._loop,
+        self._call_queue.run_callback(
             self.async_set, entity_id, new_state, attributes, force_update,
         ).result()
 
@@ -727,6 +990,62 @@ class StateMachine(object):
         If you just update the attributes and not the state, last changed will
         not be affected.
 
+        This method must be run in the event loop.
+        """
+        change = self._async_apply(
+            entity_id, new_state, attributes, force_update)
+
+        if change is not None:
+            self._bus.async_fire(EVENT_STATE_CHANGED, change)
+
+    def set_many(self, changes):
+        """Set the state of multiple entities.
+
+        changes is a list of (entity_id, new_state, attributes,
+        force_update) tuples, attributes and force_update are optional.
+        """
+        self._call_queue.run_callback(self.async_set_many, changes).result()
+
+    @callback
+    def async_set_many(self, changes):
+        """Set the state of multiple entities.
+
+        changes is a list of (entity_id, new_state, attributes,
+        force_update) tuples, attributes and force_update are optional.
+
+        Every changed entity gets a state changed event marked with
+        ATTR_BATCH, followed by one EVENT_STATE_CHANGED_BATCH event with all
+        changes. Listeners that handle the batch event can skip the marked
+        state changed events.
+
+        This method must be run in the event loop.
+        """
+        batch = []
+
+        for change in changes:
+            change = self._async_apply(*change)
+            if change is not None:
+                batch.append(change)
+
+        if not batch:
+            return
+
+        for change in batch:
+            event_data = dict(change)
+            event_data[ATTR_BATCH] = True
+            self._bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+        self._bus.async_fire(EVENT_STATE_CHANGED_BATCH, {
+            ATTR_CHANGES: batch,
+        })
+
+    @callback
+    def _async_apply(self, entity_id, new_state, attributes=None,
+                     force_update=False):
+        """Store the new state of an entity.
+
+        Returns the state changed event data or None if nothing changed.
+
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
@@ -739,16 +1058,24 @@ class StateMachine(object):
         same_attr = is_existing and old_state.attributes == attributes
 
         if same_state and same_attr:
-            return
+            return None
 
         last_changed = old_state.last_changed if same_state else None
         state = State(entity_id, new_state, attributes, last_changed)
         self._states[entity_id] = state
-        self._bus.async_fire(EVENT_STATE_CHANGED, {
+
+        if not is_existing:
+            domain_entity_ids = self._domains.get(state.domain)
+            if domain_entity_ids is None:
+                domain_entity_ids = self._domains[state.domain] = \
+                    OrderedDict()
+            domain_entity_ids[entity_id] = None
+
+        return {
             'entity_id': entity_id,
             'old_state': old_state,
             'new_state': state,
-        })
+        }
 
 
 class Service(object):
@@ -793,6 +1120,12 @@ class ServiceRegistry(object):
         self._services = {}
         self._hass = hass
         self._async_unsub_call_event = None
+        self._async_unsub_executed_event = None
+        # Blocking calls handled over the event bus, by call id
+        self._pending_calls = {}
+        # Calls executed directly, their call event is a notification only
+        self._direct_calls = set()
+        self.direct_dispatch = True
 
         def _gen_unique_id():
             cur_id = 1
@@ -902,7 +1235,10 @@ class ServiceRegistry(object):
 
         This method will fire an event to call the service.
         This event will be picked up by this ServiceRegistry and any
-        other ServiceRegistry that is listening on the EventBus.
+        other ServiceRegistry that is listening on the EventBus. With
+        direct_dispatch enabled, services registered with this
+        ServiceRegistry are executed directly and the event is only a
+        notification.
 
         Because the service is sent as an event you are not allowed to use
         the keys ATTR_DOMAIN and ATTR_SERVICE in your service_data.
@@ -925,7 +1261,10 @@ class ServiceRegistry(object):
 
         This method will fire an event to call the service.
         This event will be picked up by this ServiceRegistry and any
-        other ServiceRegistry that is listening on the EventBus.
+        other ServiceRegistry that is listening on the EventBus. With
+        direct_dispatch enabled, services registered with this
+        ServiceRegistry are executed directly and the event is only a
+        notification.
 
         Because the service is sent as an event you are not allowed to use
         the keys ATTR_DOMAIN and ATTR_SERVICE in your service_data.
@@ -933,42 +1272,72 @@ class ServiceRegistry(object):
         This method is a coroutine.
         """
         call_id = self._generate_unique_id()
+        domain = domain.lower()
+        service = service.lower()
 
         event_data = {
-            ATTR_DOMAIN: domain.lower(),
-            ATTR_SERVICE: service.lower(),
+            ATTR_DOMAIN: domain,
+            ATTR_SERVICE: service,
             ATTR_SERVICE_DATA: service_data,
             ATTR_SERVICE_CALL_ID: call_id,
         }
 
+        if self.direct_dispatch and self.has_service(domain, service):
+            self._direct_calls.add(call_id)
+            self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data)
+            task = self._hass.async_add_job(self._async_execute(
+                self._services[domain][service], domain, service,
+                service_data, call_id))
+
+            if blocking:
+                done, _ = yield from asyncio.wait(
+                    [task], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
+                return bool(done) and task.result()
+            return
+
         if blocking:
             fut = asyncio.Future(loop=self._hass.loop)
+            self._pending_calls[call_id] = fut
 
-            @callback
-            def service_executed(event):
-                """Handle an executed service."""
-                if event.data[ATTR_SERVICE_CALL_ID] == call_id:
-                    fut.set_result(True)
-
-            unsub = self._hass.bus.async_listen(
-                EVENT_SERVICE_EXECUTED, service_executed)
+            if self._async_unsub_executed_event is None:
+                self._async_unsub_executed_event = self._hass.bus.async_listen(
+                    EVENT_SERVICE_EXECUTED, self._async_service_executed)
 
         self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data)
 
         if blocking:
-            done, _ = yield from asyncio.wait(
-                [fut], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
-            success = bool(done)
-            unsub()
-            return success
+            try:
+                done, _ = yield from asyncio.wait(
+                    [fut], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
+            finally:
+                self._pending_calls.pop(call_id)
 
-    @asyncio.coroutine
+                if not self._pending_calls:
+                    self._async_unsub_executed_event()
+                    self._async_unsub_executed_event = None
+
+            return bool(done)
+
+    @callback
+    def _async_service_executed(self, event):
+        """Resolve the blocking call of an executed service."""
+        fut = self._pending_calls.get(event.data.get(ATTR_SERVICE_CALL_ID))
+
+        if fut is not None and not fut.done():
+            fut.set_result(True)
+
+    @callback
     def _event_to_service_call(self, event):
         """Handle the SERVICE_CALLED events from the EventBus."""
-        service_data = event.data.get(ATTR_SERVICE_DATA) or {}
+        call_id = event.data.get(ATTR_SERVICE_CALL_ID)
+
+        if call_id in self._direct_calls:
+            self._direct_calls.remove(call_id)
+            return
+
+        service_data = event.data.get(ATTR_SERVICE_DATA)
         domain = event.data.get(ATTR_DOMAIN).lower()
         service = event.data.get(ATTR_SERVICE).lower()
-        call_id = event.data.get(ATTR_SERVICE_CALL_ID)
 
         if not self.has_service(domain, service):
             if event.origin == EventOrigin.local:
@@ -976,20 +1345,18 @@ class ServiceRegistry(object):
                                 domain, service)
             return
 
-        service_handler = self._services[domain][service]
-
-        def fire_service_executed():
-            """Fire service executed event."""
-            if not call_id:
-                return
+        self._hass.async_add_job(self._async_execute(
+            self._services[domain][service], domain, service, service_data,
+            call_id))
 
-            data = {ATTR_SERVICE_CALL_ID: call_id}
+    @asyncio.coroutine
+    def _async_execute(self, service_handler, domain, service, service_data,
+                       call_id):
+        """Validate the data and execute a service.
 
-            if (service_handler.is_coroutinefunction or
-                    service_handler.is_callback):
-                self._hass.bus.async_fire(EVENT_SERVICE_EXECUTED, data)
-            else:
-                self._hass.bus.fire(EVENT_SERVICE_EXECUTED, data)
+        Returns if the service executed event was fired.
+        """
+        service_data = service_data or {}
 
         try:
             if service_handler.schema:
@@ -997,27 +1364,32 @@ class ServiceRegistry(object):
         except vol.Invalid as ex:
             _LOGGER.error("Invalid service data for %s.%s: %s",
                           domain, service, humanize_error(service_data, ex))
-            fire_service_executed()
-            return
+            self._async_fire_service_executed(call_id)
+            return True
 
         service_call = ServiceCall(domain, service, service_data, call_id)
 
         try:
             if service_handler.is_callback:
                 service_handler.func(service_call)
-                fire_service_executed()
             elif service_handler.is_coroutinefunction:
                 yield from service_handler.func(service_call)
-                fire_service_executed()
             else:
-                def execute_service():
-                    """Execute a service and fires a SERVICE_EXECUTED event."""
-                    service_handler.func(service_call)
-                    fire_service_executed()
-
-                yield from self._hass.async_add_job(execute_service)
+                yield from self._hass.async_add_job(
+                    service_handler.func, service_call)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception('Error executing service %s', service_call)
+            return False
+
+        self._async_fire_service_executed(call_id)
+        return True
+
+    @callback
+    def _async_fire_service_executed(self, call_id):
+        """Fire service executed event."""
+        if call_id:
+            self._hass.bus.async_fire(
+                EVENT_SERVICE_EXECUTED, {ATTR_SERVICE_CALL_ID: call_id})
 
 
 class Config(object):
@@ -1035,6 +1407,10 @@ class Config(object):
         # If True, pip install is skipped for requirements on startup
         self.skip_pip = False  # type: bool
 
+        # Limits on setting up components on startup
+        self.setup_max_parallel = SETUP_MAX_PARALLEL  # type: int
+        self.setup_timeout = SETUP_TIMEOUT  # type: int
+
         # List of loaded components
         self.components = set()
 
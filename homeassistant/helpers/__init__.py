@@ -1,4 +1,6 @@
 """Helper methods for components within Home Assistant."""
+import hashlib
+import json
 import re
 
 from typing import Any, Iterable, Tuple, Sequence, Dict
@@ -46,3 +48,26 @@ def extract_domain_configs(config: ConfigType, domain: str) -> Sequence[str]:
     """
     pattern = re.compile(r'^{}(| .+)$'.format(domain))
     return [key for key in config.keys() if pattern.match(key)]
+
+
+def config_hash(config: Any) -> str:
+    """Return a hash of a validated configuration.
+
+    Templates are hashed by their source. Values that can not be represented
+    stably hash differently each time, so they are always considered changed.
+    Async friendly.
+    """
+    def _default(value):
+        """Represent values that are not JSON serializable."""
+        template = getattr(value, 'template', None)
+        if isinstance(template, str):
+            return template
+        return repr(value)
+
+    try:
+        dumped = json.dumps(config, sort_keys=True, default=_default)
+    except TypeError:
+        # Keys of mixed types can not be sorted
+        dumped = json.dumps(config, default=_default)
+
+    return hashlib.sha1(dumped.encode('utf-8')).hexdigest()
@@ -143,11 +143,28 @@ def numeric_state(hass: HomeAssistant, entity, below=None, above=None,
 def async_numeric_state(hass: HomeAssistant, entity, below=None, above=None,
                         value_template=None, variables=None):
     """Test a numeric state condition."""
+    value = async_numeric_value(hass, entity, value_template, variables)
+
+    if value is None:
+        return False
+
+    if below is not None and value >= below:
+        return False
+
+    if above is not None and value <= above:
+        return False
+
+    return True
+
+
+def async_numeric_value(hass: HomeAssistant, entity, value_template=None,
+                        variables=None):
+    """Return the numeric value of a state or None if it has none."""
     if isinstance(entity, str):
         entity = hass.states.get(entity)
 
     if entity is None:
-        return False
+        return None
 
     if value_template is None:
         value = entity.state
@@ -158,21 +175,13 @@ def async_numeric_state(hass: HomeAssistant, entity, below=None, above=None,
             value = value_template.async_render(variables)
         except TemplateError as ex:
             _LOGGER.error("Template error: %s", ex)
-            return False
+            return None
 
     try:
-        value = float(value)
+        return float(value)
     except ValueError:
         _LOGGER.warning("Value cannot be processed as a number: %s", value)
-        return False
-
-    if below is not None and value >= below:
-        return False
-
-    if above is not None and value <= above:
-        return False
-
-    return True
+        return None
 
 
 def async_numeric_state_from_config(config, config_validation=True):
@@ -55,7 +55,7 @@ def async_dispatcher_connect(hass, signal, target):
 @bind_hass
 def dispatcher_send(hass, signal, *args):
     """Send signal and data."""
-    hass.loop.call_soon_threadsafe(async_dispatcher_send, hass, signal, *args)
+    hass.call_queue.call_soon(async_dispatcher_send, hass, signal, *args)
 
 
 @callback
@@ -206,6 +206,16 @@ class Entity(object):
                 _LOGGER.exception("Update for %s fails", self.entity_id)
                 return
 
+        self.hass.states.async_set(*self._async_calculate_state())
+
+    @callback
+    def _async_calculate_state(self):
+        """Calculate the state to write to the state machine.
+
+        Returns a tuple of entity_id, state, attributes and force_update.
+
+        This method must be run in the event loop.
+        """
         start = timer()
 
         if not self.available:
@@ -283,8 +293,7 @@ class Entity(object):
             # Could not convert state to float
             pass
 
-        self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update)
+        return self.entity_id, state, attr, self.force_update
 
     def schedule_update_ha_state(self, force_refresh=False):
         """Schedule an update ha state change task.
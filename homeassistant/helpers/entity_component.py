@@ -203,11 +203,15 @@ class EntityComponent(object):
         for platform in self._platforms.values():
             if entity_id in platform.entities:
                 yield from platform.async_remove_entity(entity_id)
+                self._async_update_group()
 
     @asyncio.coroutine
-    def async_prepare_reload(self):
+    def async_prepare_reload(self, *, skip_reset=False):
         """Prepare reloading this entity component.
 
+        With skip_reset the entities are kept, so the caller can update only
+        the ones whose configuration changed.
+
         This method must be run in the event loop.
         """
         try:
@@ -223,5 +227,6 @@ class EntityComponent(object):
         if conf is None:
             return None
 
-        yield from self._async_reset()
+        if not skip_reset:
+            yield from self._async_reset()
         return conf
@@ -11,6 +11,7 @@ import homeassistant.util.dt as dt_util
 
 from .event import async_track_time_interval, async_track_point_in_time
 from .entity_registry import EntityRegistry
+from .timeline import PHASE_FIRST_UPDATE, PHASE_PLATFORM_SETUP, async_timed
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
@@ -67,30 +68,34 @@ class EntityPlatform(object):
             self.platform_name, SLOW_SETUP_WARNING)
 
         try:
-            if getattr(platform, 'async_setup_platform', None):
-                task = platform.async_setup_platform(
-                    hass, platform_config,
-                    self._async_schedule_add_entities, discovery_info
-                )
-            else:
-                # This should not be replaced with hass.async_add_job because
-                # we don't want to track this task in case it blocks startup.
-                task = hass.loop.run_in_executor(
-                    None, platform.setup_platform, hass, platform_config,
-                    self._schedule_add_entities, discovery_info
-                )
-            yield from asyncio.wait_for(
-                asyncio.shield(task, loop=hass.loop),
-                SLOW_SETUP_MAX_WAIT, loop=hass.loop)
-
-            # Block till all entities are done
-            if self._tasks:
-                pending = [task for task in self._tasks if not task.done()]
-                self._tasks.clear()
-
-                if pending:
-                    yield from asyncio.wait(
-                        pending, loop=self.hass.loop)
+            with async_timed(hass, full_name, PHASE_PLATFORM_SETUP):
+                if getattr(platform, 'async_setup_platform', None):
+                    task = platform.async_setup_platform(
+                        hass, platform_config,
+                        self._async_schedule_add_entities, discovery_info
+                    )
+                else:
+                    # This should not be replaced with hass.async_add_job
+                    # because we don't want to track this task in case it
+                    # blocks startup.
+                    task = hass.loop.run_in_executor(
+                        hass.executors.get(platform.setup_platform),
+                        platform.setup_platform, hass, platform_config,
+                        self._schedule_add_entities, discovery_info
+                    )
+                yield from asyncio.wait_for(
+                    asyncio.shield(task, loop=hass.loop),
+                    SLOW_SETUP_MAX_WAIT, loop=hass.loop)
+
+                # Block till all entities are done
+                if self._tasks:
+                    pending = [task for task in self._tasks
+                               if not task.done()]
+                    self._tasks.clear()
+
+                    if pending:
+                        yield from asyncio.wait(
+                            pending, loop=self.hass.loop)
 
             hass.config.components.add(full_name)
         except PlatformNotReady:
@@ -193,8 +198,11 @@ class EntityPlatform(object):
 
         # Update properties before we generate the entity_id
         if update_before_add:
+            node = '{}.{}'.format(self.domain, self.platform_name)
+
             try:
-                yield from entity.async_device_update(warning=False)
+                with async_timed(self.hass, node, PHASE_FIRST_UPDATE):
+                    yield from entity.async_device_update(warning=False)
             except Exception:  # pylint: disable=broad-except
                 self.logger.exception(
                     "%s: Error on device update!", self.platform_name)
@@ -307,6 +315,45 @@ class EntityPlatform(object):
 
         self.hass.states.async_remove(entity_id)
 
+    @asyncio.coroutine
+    def async_update_ha_states(self, entities=None, force_refresh=False):
+        """Write the states of multiple entities as a single batch.
+
+        Defaults to all entities of this platform. With force_refresh the
+        entities are updated first, entities failing to update are skipped.
+
+        This method must be run in the event loop.
+        """
+        if entities is None:
+            entities = list(self.entities.values())
+
+        if not entities:
+            return
+
+        if force_refresh:
+            @asyncio.coroutine
+            def async_refresh(entity):
+                """Update an entity and return if it succeeded."""
+                try:
+                    yield from entity.async_device_update()
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception(
+                        "Update for %s fails", entity.entity_id)
+                    return False
+                return True
+
+            results = yield from asyncio.gather(
+                *[async_refresh(entity) for entity in entities],
+                loop=self.hass.loop)
+            # Skip entities removed while updating
+            entities = [entity for entity, updated in zip(entities, results)
+                        if updated and
+                        self.entities.get(entity.entity_id) is entity]
+
+        # pylint: disable=protected-access
+        self.hass.states.async_set_many(
+            [entity._async_calculate_state() for entity in entities])
+
     @asyncio.coroutine
     def _update_entity_states(self, now):
         """Update the states of all the polling entities.
@@ -324,11 +371,7 @@ class EntityPlatform(object):
             return
 
         with (yield from self._process_updates):
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                yield from asyncio.wait(tasks, loop=self.hass.loop)
+            yield from self.async_update_ha_states(
+                [entity for entity in self.entities.values()
+                 if entity.should_poll],
+                force_refresh=True)
@@ -1,6 +1,9 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import heapq
+import itertools
+import logging
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
@@ -10,6 +13,15 @@ from ..const import (
 from ..util import dt as dt_util
 from ..util.async import run_callback_threadsafe
 
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_CHANGE_TRACKER = 'event_state_change_tracker'
+DATA_TIME_SCHEDULER = 'event_time_scheduler'
+
+# Rebuild the scheduler heap once cancelled entries outnumber live ones
+# by at least this many entries.
+SCHEDULER_COMPACT_THRESHOLD = 100
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -52,21 +64,18 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     match_from_state = _process_state_match(from_state)
     match_to_state = _process_state_match(to_state)
 
-    # Ensure it is a lowercase list with entity ids we want to match on
+    # Ensure it is a lowercase list with entity ids we want to match on,
+    # listed once so the action runs once per state change
     if entity_ids == MATCH_ALL:
         pass
     elif isinstance(entity_ids, str):
         entity_ids = (entity_ids.lower(),)
     else:
-        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
+        entity_ids = tuple({entity_id.lower() for entity_id in entity_ids})
 
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -80,7 +89,12 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    tracker = hass.data.get(DATA_STATE_CHANGE_TRACKER)
+    if tracker is None:
+        tracker = hass.data[DATA_STATE_CHANGE_TRACKER] = \
+            _StateChangeTracker(hass)
+
+    return tracker.async_listen(entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
@@ -192,28 +206,11 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
-
-        hass.async_run_job(action, now)
+    scheduler = hass.data.get(DATA_TIME_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_TIME_SCHEDULER] = _TimeScheduler(hass)
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
-
-    return async_unsub
+    return scheduler.async_schedule(action, point_in_time)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -370,6 +367,191 @@ def async_track_time_change(hass, action, year=None, month=None, day=None,
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+class _StateChangeTracker(object):
+    """Dispatch state changed events to the listeners of an entity.
+
+    A single state changed listener looks up the listeners that track the
+    changed entity, so a state write only runs the listeners that care
+    about it instead of every tracker.
+    """
+
+    def __init__(self, hass):
+        """Initialize the tracker."""
+        self._hass = hass
+        self._listeners = {}
+        self._sequence = itertools.count()
+        self._unsub_state_changed = None
+
+    @callback
+    def async_listeners(self):
+        """Return dictionary with entity ids and the number of listeners.
+
+        Listeners for all entities are reported as MATCH_ALL.
+        """
+        return {key: len(self._listeners[key]) for key in self._listeners}
+
+    @callback
+    def async_listen(self, entity_ids, listener):
+        """Run listener for state changes of entity_ids.
+
+        Returns a function that can be called to remove the listener.
+        """
+        if entity_ids == MATCH_ALL:
+            entity_ids = (MATCH_ALL,)
+
+        # The sequence number is used to run listeners of the entity and
+        # MATCH_ALL listeners in the order they were added.
+        entry = [next(self._sequence), listener]
+
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(entry)
+
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed)
+
+        @callback
+        def async_remove():
+            """Remove the listener."""
+            if entry[1] is None:
+                return
+
+            # Mark it so a dispatch in progress skips it
+            entry[1] = None
+
+            for entity_id in entity_ids:
+                entries = self._listeners.get(entity_id)
+                if entries is None or entry not in entries:
+                    continue
+
+                entries.remove(entry)
+                if not entries:
+                    self._listeners.pop(entity_id)
+
+            if not self._listeners:
+                self._unsub_state_changed()
+                self._unsub_state_changed = None
+
+        return async_remove
+
+    @callback
+    def _async_state_changed(self, event):
+        """Run the listeners of the changed entity."""
+        entries = self._listeners.get(event.data.get('entity_id'))
+        match_all_entries = self._listeners.get(MATCH_ALL)
+
+        if entries is None and match_all_entries is None:
+            return
+
+        if match_all_entries is None:
+            entries = list(entries)
+        elif entries is None:
+            entries = list(match_all_entries)
+        else:
+            entries = sorted(entries + match_all_entries)
+
+        for entry in entries:
+            listener = entry[1]
+
+            if listener is None:
+                continue
+
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running state listener %s", listener)
+
+
+class _TimeScheduler(object):
+    """Run point in time listeners from a single time changed listener.
+
+    Scheduled actions are kept in a heap ordered by their due time, so a
+    time tick only has to look at the actions that are actually due instead
+    of every scheduled listener.
+    """
+
+    def __init__(self, hass):
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._heap = []
+        self._sequence = itertools.count()
+        self._scheduled = 0
+        self._unsub_time_changed = None
+
+    @callback
+    def async_schedule(self, action, point_in_time):
+        """Schedule action to run once at point_in_time.
+
+        Returns a function that can be called to cancel the action.
+        """
+        # The sequence number keeps actions that are due at the same time in
+        # the order they were scheduled and avoids comparing the actions.
+        entry = [point_in_time, next(self._sequence), action]
+        heapq.heappush(self._heap, entry)
+        self._scheduled += 1
+
+        if self._unsub_time_changed is None:
+            self._unsub_time_changed = self._hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        @callback
+        def async_cancel():
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+
+            # Cancelled entries are skipped when they reach the top of the
+            # heap, removing them from the middle would be O(n).
+            entry[2] = None
+            self._async_entry_done()
+
+        return async_cancel
+
+    @callback
+    def _async_entry_done(self):
+        """Update bookkeeping after an entry has run or was cancelled."""
+        self._scheduled -= 1
+
+        if self._scheduled == 0:
+            self._heap.clear()
+            self._unsub_time_changed()
+            self._unsub_time_changed = None
+
+        elif (len(self._heap) - self._scheduled >
+              self._scheduled + SCHEDULER_COMPACT_THRESHOLD):
+            self._heap = [entry for entry in self._heap
+                          if entry[2] is not None]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run the actions that are due."""
+        now = event.data[ATTR_NOW]
+        heap = self._heap
+        due = []
+
+        # Collect everything first so actions that schedule themselves again
+        # for a point that is already due don't run twice in one tick.
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            action = entry[2]
+
+            if action is None:
+                continue
+
+            entry[2] = None
+            due.append(action)
+
+        for _ in due:
+            self._async_entry_done()
+
+        for action in due:
+            try:
+                self._hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running time listener %s", action)
+
+
 def _process_state_match(parameter):
     """Convert parameter to function that matches input against parameter."""
     if parameter is None or parameter == MATCH_ALL:
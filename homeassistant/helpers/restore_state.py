@@ -5,13 +5,15 @@ from datetime import timedelta
 
 import async_timeout
 
-from homeassistant.core import HomeAssistant, CoreState, callback
+from homeassistant.core import (
+    HomeAssistant, CoreState, callback, executor_pool)
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.loader import bind_hass
 from homeassistant.components.history import get_states, last_recorder_run
 from homeassistant.components.recorder import (
     wait_connection_ready, DOMAIN as _RECORDER)
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import POOL_DB
 
 RECORDER_TIMEOUT = 10
 DATA_RESTORE_CACHE = 'restore_state_cache'
@@ -19,6 +21,7 @@ _LOCK = 'restore_lock'
 _LOGGER = logging.getLogger(__name__)
 
 
+@executor_pool(POOL_DB)
 def _load_restore_cache(hass: HomeAssistant):
     """Load the restore cache to be used by other components."""
     @callback
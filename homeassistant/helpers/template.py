@@ -240,8 +240,8 @@ class DomainStates(object):
     def __iter__(self):
         """Return the iteration over all the states."""
         return iter(sorted(
-            (_wrap_state(state) for state in self._hass.states.async_all()
-             if state.domain == self._domain),
+            (_wrap_state(state) for state
+             in self._hass.states.async_all(self._domain)),
             key=lambda state: state.entity_id))
 
     def __len__(self):
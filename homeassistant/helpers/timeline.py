@@ -0,0 +1,154 @@
+"""Record how long each phase of setting up components and platforms takes."""
+from contextlib import contextmanager
+from time import monotonic
+
+DATA_TIMELINE = 'startup_timeline'
+
+PHASE_IMPORT = 'import'
+PHASE_REQUIREMENTS = 'requirements'
+PHASE_DEPENDENCIES = 'dependencies'
+PHASE_SETUP = 'setup'
+PHASE_PLATFORM_SETUP = 'platform_setup'
+PHASE_FIRST_UPDATE = 'first_update'
+
+TIMELINE_FILE = 'startup_timeline.json'
+
+
+@contextmanager
+def async_timed(hass, name, phase):
+    """Time a phase of a component or platform while starting up.
+
+    Nothing is recorded without a timeline or once startup finished.
+
+    Async friendly.
+    """
+    timeline = hass.data.get(DATA_TIMELINE)
+
+    if timeline is None or timeline.end is not None:
+        yield
+        return
+
+    start = monotonic()
+    try:
+        yield
+    finally:
+        timeline.record(name, phase, start, monotonic())
+
+
+def async_add_waits(hass, name, others):
+    """Record that the setup of name waited for others.
+
+    Async friendly.
+    """
+    timeline = hass.data.get(DATA_TIMELINE)
+
+    if timeline is not None and timeline.end is None:
+        timeline.add_waits(name, others)
+
+
+class Timeline(object):
+    """Timeline of the phases of setting up components and platforms.
+
+    Components and platforms are nodes that wait for each other: on their
+    dependencies and, for components, on the platforms they set up. The
+    critical path is the chain of waits that ended last.
+    """
+
+    def __init__(self):
+        """Initialize the timeline."""
+        self.start = monotonic()
+        self.end = None
+        self.spans = []
+        self.waits = {}
+
+    def record(self, name, phase, start, end):
+        """Record a phase that ran between two monotonic timestamps."""
+        self.spans.append((name, phase, start - self.start, end - start))
+
+    def add_waits(self, name, others):
+        """Record that name waited for others."""
+        self.waits.setdefault(name, set()).update(others)
+
+    def finish(self):
+        """Mark the end of startup."""
+        self.end = monotonic()
+
+    def finished_at(self):
+        """Return when each node finished its last phase."""
+        finished = {}
+
+        for name, _, start, duration in self.spans:
+            finished[name] = max(finished.get(name, 0), start + duration)
+
+        return finished
+
+    def critical_path(self):
+        """Return the chain of nodes that determined the startup time."""
+        finished = self.finished_at()
+
+        if not finished:
+            return []
+
+        node = max(finished, key=finished.get)
+        path = [node]
+        seen = {node}
+
+        while True:
+            waited = [other for other in self.waits.get(node, ())
+                      if other in finished and other not in seen and
+                      finished[other] <= finished[node]]
+
+            if not waited:
+                break
+
+            node = max(waited, key=finished.get)
+            path.append(node)
+            seen.add(node)
+
+        path.reverse()
+        return path
+
+    def as_dict(self):
+        """Return a dictionary representation of the timeline."""
+        nodes = {}
+
+        for name, phase, _, duration in self.spans:
+            phases = nodes.setdefault(name, {})
+            phases[phase] = phases.get(phase, 0) + duration
+
+        return {
+            'duration': None if self.end is None else self.end - self.start,
+            'nodes': nodes,
+            'waits': {name: sorted(others)
+                      for name, others in self.waits.items()},
+            'critical_path': self.critical_path(),
+        }
+
+    def as_trace(self):
+        """Return the timeline in the Chrome trace event format.
+
+        Phases of nodes on the critical path are colored to stand out.
+        """
+        critical = set(self.critical_path())
+        events = []
+
+        for name, phase, start, duration in self.spans:
+            event = {
+                'name': phase,
+                'cat': name,
+                'ph': 'X',
+                'pid': 1,
+                'tid': name,
+                'ts': int(start * 1000000),
+                'dur': int(duration * 1000000),
+                'args': {'critical': name in critical},
+            }
+            if name in critical:
+                event['cname'] = 'terrible'
+            events.append(event)
+
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'critical_path': self.critical_path()},
+        }
@@ -0,0 +1,262 @@
+"""Index state based automation triggers by the entity they watch.
+
+All triggers watching an entity share one state listener. State triggers
+are looked up by the state they wait for. Numeric triggers keep their
+thresholds sorted, so a state change only checks the triggers with a
+threshold between the old and the new value.
+"""
+from bisect import bisect_left, bisect_right
+import itertools
+
+from homeassistant.const import MATCH_ALL
+from homeassistant.core import callback
+from homeassistant.helpers.condition import async_numeric_value
+from homeassistant.helpers.event import async_track_state_change
+
+DATA_TRIGGER_INDEX = 'automation_trigger_index'
+
+
+@callback
+def async_get_trigger_index(hass):
+    """Return the trigger index, creating it when needed."""
+    index = hass.data.get(DATA_TRIGGER_INDEX)
+
+    if index is None:
+        index = hass.data[DATA_TRIGGER_INDEX] = TriggerIndex(hass)
+
+    return index
+
+
+class TriggerIndex(object):
+    """Route state changes to the triggers they match."""
+
+    def __init__(self, hass):
+        """Initialize the trigger index."""
+        self.hass = hass
+        self._entities = {}
+        self._seq = itertools.count()
+
+    @callback
+    def async_track_state(self, entity_ids, action, from_state=MATCH_ALL,
+                          to_state=MATCH_ALL):
+        """Call action when an entity changes from from_state to to_state.
+
+        Returns a function that removes the trigger.
+        """
+        trigger = _StateTrigger(next(self._seq), action, from_state)
+        watched = [self._async_entity(entity_id)
+                   for entity_id in _unique_entity_ids(entity_ids)]
+
+        for entity in watched:
+            entity.state_triggers.setdefault(to_state, []).append(trigger)
+
+        @callback
+        def async_remove():
+            """Remove the state trigger."""
+            for entity in watched:
+                triggers = entity.state_triggers[to_state]
+                triggers.remove(trigger)
+                if not triggers:
+                    del entity.state_triggers[to_state]
+                self._async_cleanup(entity)
+
+        return async_remove
+
+    @callback
+    def async_track_numeric(self, entity_ids, action, below=None,
+                            above=None, async_value=None):
+        """Call action when the value of an entity gets within the range.
+
+        The value is the state unless async_value(entity_id, state) is
+        given. Values from the state are parsed once for all triggers.
+        Like before, the first matching value after adding the trigger
+        calls the action too.
+
+        Returns a function that removes the trigger.
+        """
+        trigger = _NumericTrigger(next(self._seq), action, below, above)
+        buckets = []
+
+        for entity_id in _unique_entity_ids(entity_ids):
+            entity = self._async_entity(entity_id)
+
+            if async_value is None:
+                if entity.numeric is None:
+                    entity.numeric = _NumericBucket(self.hass, entity_id)
+                bucket = entity.numeric
+            else:
+                bucket = _NumericBucket(self.hass, entity_id, async_value)
+                entity.custom.append(bucket)
+
+            bucket.async_add(trigger)
+            buckets.append((entity, bucket))
+
+        @callback
+        def async_remove():
+            """Remove the numeric trigger."""
+            for entity, bucket in buckets:
+                bucket.async_remove(trigger)
+                if bucket is not entity.numeric:
+                    entity.custom.remove(bucket)
+                elif not bucket.triggers:
+                    entity.numeric = None
+                self._async_cleanup(entity)
+
+        return async_remove
+
+    @callback
+    def _async_entity(self, entity_id):
+        """Return the triggers of an entity, listening to it when needed."""
+        entity = self._entities.get(entity_id)
+
+        if entity is None:
+            entity = self._entities[entity_id] = _EntityTriggers(entity_id)
+            entity.unsub = async_track_state_change(
+                self.hass, entity_id, entity.async_state_changed)
+
+        return entity
+
+    @callback
+    def _async_cleanup(self, entity):
+        """Stop listening to an entity without triggers."""
+        if entity.state_triggers or entity.numeric or entity.custom:
+            return
+
+        if self._entities.pop(entity.entity_id, None) is entity:
+            entity.unsub()
+
+
+def _unique_entity_ids(entity_ids):
+    """Return the lowercase entity ids, each listed once."""
+    return sorted({entity_id.lower() for entity_id in entity_ids})
+
+
+class _StateTrigger(object):
+    """A trigger on the state of entities."""
+
+    def __init__(self, seq, action, from_state):
+        """Initialize the state trigger."""
+        self.seq = seq
+        self.action = action
+        self.from_state = from_state
+
+
+class _NumericTrigger(object):
+    """A trigger on the value of entities getting within a range."""
+
+    def __init__(self, seq, action, below, above):
+        """Initialize the numeric trigger."""
+        self.seq = seq
+        self.action = action
+        self.below = below
+        self.above = above
+
+    def contains(self, value):
+        """Return if a value is within the range."""
+        return (value is not None and
+                (self.below is None or value < self.below) and
+                (self.above is None or value > self.above))
+
+
+class _NumericBucket(object):
+    """Numeric triggers of an entity that read its value the same way."""
+
+    def __init__(self, hass, entity_id, async_value=None):
+        """Initialize the bucket."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.async_value = async_value
+        self.value = None
+        self.triggers = []
+        # Triggers that have not seen a value yet
+        self.fresh = set()
+        # Sorted thresholds and the trigger each belongs to
+        self.thresholds = []
+        self.owners = []
+
+    @callback
+    def async_add(self, trigger):
+        """Add a trigger."""
+        self.triggers.append(trigger)
+        self.fresh.add(trigger)
+
+        for threshold in (trigger.below, trigger.above):
+            if threshold is None:
+                continue
+            idx = bisect_right(self.thresholds, threshold)
+            self.thresholds.insert(idx, threshold)
+            self.owners.insert(idx, trigger)
+
+    @callback
+    def async_remove(self, trigger):
+        """Remove a trigger."""
+        self.triggers.remove(trigger)
+        self.fresh.discard(trigger)
+
+        keep = [idx for idx, owner in enumerate(self.owners)
+                if owner is not trigger]
+        self.thresholds = [self.thresholds[idx] for idx in keep]
+        self.owners = [self.owners[idx] for idx in keep]
+
+    @callback
+    def async_update(self, new_state):
+        """Return the triggers whose range the value entered."""
+        old = self.value
+
+        if new_state is None:
+            new = None
+        elif self.async_value is None:
+            new = async_numeric_value(self.hass, new_state)
+        else:
+            new = self.async_value(self.entity_id, new_state)
+
+        self.value = new
+        entered = {trigger for trigger in self.fresh if trigger.contains(new)}
+        self.fresh.clear()
+
+        if new is None:
+            return entered
+
+        if old is None:
+            candidates = self.triggers
+        else:
+            low, high = min(old, new), max(old, new)
+            candidates = self.owners[bisect_left(self.thresholds, low):
+                                     bisect_right(self.thresholds, high)]
+
+        entered.update(trigger for trigger in candidates
+                       if trigger.contains(new) and not trigger.contains(old))
+        return entered
+
+
+class _EntityTriggers(object):
+    """Triggers watching one entity."""
+
+    def __init__(self, entity_id):
+        """Initialize the triggers of an entity."""
+        self.entity_id = entity_id
+        self.unsub = None
+        self.state_triggers = {}
+        self.numeric = None
+        self.custom = []
+
+    @callback
+    def async_state_changed(self, entity_id, old_state, new_state):
+        """Call the actions of the triggers matching a state change."""
+        matched = []
+        from_state = None if old_state is None else old_state.state
+
+        to_triggers = list(self.state_triggers.get(MATCH_ALL, ()))
+        if new_state is not None:
+            to_triggers.extend(self.state_triggers.get(new_state.state, ()))
+
+        matched.extend(trigger for trigger in to_triggers
+                       if trigger.from_state == MATCH_ALL or
+                       trigger.from_state == from_state)
+
+        for bucket in [self.numeric] + self.custom:
+            if bucket is not None:
+                matched.extend(bucket.async_update(new_state))
+
+        for trigger in sorted(matched, key=lambda trigger: trigger.seq):
+            trigger.action(entity_id, old_state, new_state)
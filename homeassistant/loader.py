@@ -10,6 +10,7 @@ call get_component('switch.your_platform'). In both cases the config directory
 is checked to see if it contains a user provided version. If not available it
 will check the built-in components and platforms.
 """
+import ast
 import functools as ft
 import importlib
 import logging
@@ -19,10 +20,12 @@ import sys
 from types import ModuleType
 
 # pylint: disable=unused-import
-from typing import Dict, List, Optional, Sequence, Set  # NOQA
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple  # NOQA
 
-from homeassistant.const import PLATFORM_FORMAT
+from homeassistant.const import PLATFORM_FORMAT, __version__
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util import OrderedSet
+from homeassistant.util.json import load_json, save_json
 
 # Typing imports
 # pylint: disable=using-constant-test,unused-import
@@ -39,6 +42,20 @@ AVAILABLE_COMPONENTS = []  # type: List[str]
 # Dict of loaded components mapped name => module
 _COMPONENT_CACHE = {}  # type: Dict[str, ModuleType]
 
+# Cache of the dependencies of components, so they are found without importing
+MANIFEST_FILE = '.component_manifest.json'
+
+# Dicts of component name => manifest entry, filled as components are looked
+# up. The dependencies of an entry are None if it has to be imported.
+_MANIFEST = {}  # type: Dict[str, Dict]
+_CUSTOM_MANIFEST = {}  # type: Dict[str, Dict]
+
+# The directories to look for components in with their manifest
+_MANIFEST_PATHS = []  # type: List[Tuple[str, Dict]]
+
+# The manifest as it was loaded or last saved
+_MANIFEST_SAVED = {}  # type: Dict[str, Any]
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -83,9 +100,144 @@ def prepare(hass: 'HomeAssistant'):
                 AVAILABLE_COMPONENTS.append(
                     'custom_components.{}'.format(fil[0:-3]))
 
+    _load_manifest(hass, components.__path__[0], custom_path)
+
     PREPARED = True
 
 
+def _load_manifest(hass, components_path: str, custom_path: str) -> None:
+    """Load the manifest cache.
+
+    Built-in components are read again when the version changes.
+
+    This method needs to run in an executor.
+    """
+    try:
+        cached = load_json(hass.config.path(MANIFEST_FILE))
+    except HomeAssistantError:
+        cached = {}
+
+    _MANIFEST.clear()
+    if cached.get('version') == __version__:
+        _MANIFEST.update(cached.get('components', {}))
+    _CUSTOM_MANIFEST.clear()
+    _CUSTOM_MANIFEST.update(cached.get('custom_components', {}))
+
+    _MANIFEST_PATHS[:] = [(custom_path, _CUSTOM_MANIFEST),
+                          (components_path, _MANIFEST)]
+    _MANIFEST_SAVED.clear()
+    _MANIFEST_SAVED.update(_manifest_data())
+
+
+def _manifest_data() -> Dict[str, Any]:
+    """Return a copy of the manifest cache to save."""
+    return {
+        'version': __version__,
+        'components': dict(_MANIFEST),
+        'custom_components': dict(_CUSTOM_MANIFEST),
+    }
+
+
+def save_manifest(hass: 'HomeAssistant') -> None:
+    """Save the manifest cache if components were read since it was loaded.
+
+    This method needs to run in an executor.
+    """
+    data = _manifest_data()
+
+    if data == _MANIFEST_SAVED:
+        return
+
+    try:
+        save_json(hass.config.path(MANIFEST_FILE), data)
+    except HomeAssistantError:
+        return
+
+    _MANIFEST_SAVED.clear()
+    _MANIFEST_SAVED.update(data)
+
+
+def _get_manifest_entry(comp_name: str) -> Optional[Dict]:
+    """Return the manifest entry of a component, reading it if out of date.
+
+    Custom components are looked for first, returns None if the component
+    does not exist.
+    """
+    for path, manifest in _MANIFEST_PATHS:
+        base = os.path.join(path, *comp_name.split('.'))
+
+        for filename in (base + '.py', os.path.join(base, '__init__.py')):
+            try:
+                mtime = os.path.getmtime(filename)
+            except OSError:
+                continue
+
+            entry = manifest.get(comp_name)
+
+            if entry is None or entry['mtime'] != mtime:
+                entry = manifest[comp_name] = {
+                    'mtime': mtime,
+                    'dependencies': _read_dependencies(filename),
+                }
+
+            return entry
+
+    return None
+
+
+def _read_dependencies(filename: str) -> Optional[List[str]]:
+    """Read the DEPENDENCIES of a module without importing it.
+
+    Returns None if they are not a plain list of strings.
+    """
+    try:
+        with open(filename, encoding='utf-8') as fil:
+            tree = ast.parse(fil.read(), filename)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    dependencies = []
+
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id == 'DEPENDENCIES':
+                try:
+                    value = ast.literal_eval(node.value)
+                except ValueError:
+                    return None
+                if not isinstance(value, (list, tuple)) or \
+                        not all(isinstance(item, str) for item in value):
+                    return None
+                dependencies = list(value)
+
+    return dependencies
+
+
+def get_dependencies(comp_name: str) -> Optional[List[str]]:
+    """Return the dependencies of a component, importing it only if needed.
+
+    Uses the manifest cache unless the component is already loaded, returns
+    None if the component could not be loaded.
+    """
+    component = _COMPONENT_CACHE.get(comp_name)
+
+    if component is None:
+        entry = _get_manifest_entry(comp_name)
+
+        if entry is not None and entry['dependencies'] is not None:
+            return entry['dependencies']
+
+        component = get_component(comp_name)
+
+        if component is None:
+            return None
+
+    return getattr(component, 'DEPENDENCIES', [])
+
+
 def set_component(comp_name: str, component: ModuleType) -> None:
     """Set a component in the cache.
 
@@ -247,15 +399,15 @@ def _load_order_component(comp_name: str, load_order: OrderedSet,
 
     Async friendly.
     """
-    component = get_component(comp_name)
+    dependencies = get_dependencies(comp_name)
 
     # If None it does not exist, error already thrown by get_component.
-    if component is None:
+    if dependencies is None:
         return OrderedSet()
 
     loading.add(comp_name)
 
-    for dependency in getattr(component, 'DEPENDENCIES', []):
+    for dependency in dependencies:
         # Check not already loaded
         if dependency in load_order:
             continue
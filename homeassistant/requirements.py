@@ -3,11 +3,16 @@ import asyncio
 from functools import partial
 import logging
 import os
+import threading
 
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.package as pkg_util
+from homeassistant.util.json import load_json, save_json
 
 DATA_PIP_LOCK = 'pip_lock'
+DATA_REQUIREMENTS_CACHE = 'requirements_cache'
 CONSTRAINT_FILE = 'package_constraints.txt'
+CACHE_FILE = '.requirements_cache.json'
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -15,8 +20,22 @@ _LOGGER = logging.getLogger(__name__)
 def async_process_requirements(hass, name, requirements):
     """Install the requirements for a component or platform.
 
+    Requirements that are known to be satisfied are skipped, the others are
+    checked together. The pip lock is only taken to install missing ones.
+
     This method is a coroutine.
     """
+    cache = yield from async_get_requirements_cache(hass)
+    requirements = [req for req in requirements if not cache.satisfies(req)]
+
+    if not requirements:
+        return True
+
+    missing = yield from hass.async_add_job(cache.verify, requirements)
+
+    if not missing:
+        return True
+
     pip_lock = hass.data.get(DATA_PIP_LOCK)
     if pip_lock is None:
         pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock(loop=hass.loop)
@@ -25,16 +44,32 @@ def async_process_requirements(hass, name, requirements):
                           **pip_kwargs(hass.config.config_dir))
 
     with (yield from pip_lock):
-        for req in requirements:
+        for req in missing:
             ret = yield from hass.async_add_job(pip_install, req)
             if not ret:
                 _LOGGER.error("Not initializing %s because could not install "
                               "requirement %s", name, req)
                 return False
+            cache.installed.add(req)
 
     return True
 
 
+@asyncio.coroutine
+def async_get_requirements_cache(hass):
+    """Return the cache of satisfied requirements, loading it once.
+
+    This method is a coroutine.
+    """
+    task = hass.data.get(DATA_REQUIREMENTS_CACHE)
+
+    if task is None:
+        task = hass.data[DATA_REQUIREMENTS_CACHE] = hass.async_add_job(
+            RequirementsCache.load, hass.config.path(CACHE_FILE))
+
+    return (yield from task)
+
+
 def pip_kwargs(config_dir):
     """Return keyword arguments for PIP install."""
     kwargs = {
@@ -43,3 +78,79 @@ def pip_kwargs(config_dir):
     if not pkg_util.running_under_virtualenv():
         kwargs['target'] = os.path.join(config_dir, 'deps')
     return kwargs
+
+
+class RequirementsCache(object):
+    """Requirements known to be satisfied by the installed packages.
+
+    The cache is saved together with a fingerprint of the installed
+    packages. When the fingerprint changes, the cached requirements are
+    checked again.
+    """
+
+    def __init__(self, path, state, satisfied=None):
+        """Initialize the cache."""
+        self.path = path
+        self.state = state
+        self.satisfied = set(satisfied or ())
+        # Installed while running, verified on the next start
+        self.installed = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load the cache from a file.
+
+        This method needs to run in an executor.
+        """
+        state = pkg_util.site_packages_state()
+
+        try:
+            cached = load_json(path)
+        except HomeAssistantError:
+            cached = {}
+
+        cache = cls(path, state, cached.get('satisfied'))
+
+        if cache.satisfied and cached.get('state') != state:
+            _LOGGER.info("Installed packages changed, checking %d "
+                         "requirements", len(cache.satisfied))
+            cache.satisfied.difference_update(
+                pkg_util.missing_packages(sorted(cache.satisfied)))
+            cache.save()
+
+        return cache
+
+    def satisfies(self, requirement):
+        """Return if a requirement is known to be satisfied."""
+        return requirement in self.satisfied or requirement in self.installed
+
+    def verify(self, requirements):
+        """Check requirements and return the missing ones.
+
+        This method needs to run in an executor.
+        """
+        missing = pkg_util.missing_packages(requirements)
+
+        with self._lock:
+            added = set(requirements).difference(missing, self.satisfied)
+            self.satisfied.update(added)
+
+        if added:
+            self.save()
+
+        return missing
+
+    def save(self):
+        """Save the cache to its file.
+
+        This method needs to run in an executor.
+        """
+        with self._lock:
+            try:
+                save_json(self.path, {
+                    'state': self.state,
+                    'satisfied': sorted(self.satisfied),
+                })
+            except HomeAssistantError:
+                pass
@@ -1,18 +1,55 @@
 """Script to run benchmarks."""
 import argparse
 import asyncio
+from collections import OrderedDict
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 import logging
+import math
+import os
+import platform
+import socket
+import sys
+from tempfile import TemporaryDirectory
+import threading
 from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, __version__)
 from homeassistant.util import dt as dt_util
+from homeassistant.util.loop import (
+    LOOP_AUTO, LOOP_CHOICES, available_loops, set_loop_policy)
 
 BENCHMARKS = {}
 
+DEFAULT_ITERATIONS = 5
+# Percentage the median may get slower before a comparison fails
+DEFAULT_THRESHOLD = 10
+
+SUITE = 'suite'
+# Benchmarks tracked for regressions
+SUITE_BENCHMARKS = (
+    'async_million_events',
+    'async_100k_state_changes',
+    'async_recorder_10k_inserts',
+    'async_history_30_days',
+    'async_10k_template_renders',
+    'async_websocket_fan_out',
+    'async_100k_state_changes_1k_trackers',
+    'async_poll_1k_entities',
+    'async_load_large_config',
+)
+
+MATRIX = 'matrix'
+# Benchmarks run on every event loop by the matrix
+MATRIX_BENCHMARKS = (
+    'async_million_events',
+    'async_100k_state_changes',
+    'async_10k_http_requests',
+)
+
 
 def run(args):
     """Handle ensure configuration commandline script."""
@@ -21,35 +58,251 @@ def run(args):
 
     parser = argparse.ArgumentParser(
         description=("Run a Home Assistant benchmark."))
-    parser.add_argument('name', choices=BENCHMARKS)
+    parser.add_argument('name', choices=[SUITE, MATRIX] + list(BENCHMARKS))
     parser.add_argument('--script', choices=['benchmark'])
+    parser.add_argument(
+        '--loop', choices=LOOP_CHOICES, default=LOOP_AUTO,
+        help="Event loop implementation to run the benchmark on")
+    parser.add_argument(
+        '--inline-callbacks', action='store_true',
+        help="Run callback event listeners inside async_fire")
+    parser.add_argument(
+        '--service-events', action='store_true',
+        help="Execute service calls from the call_service event")
+    parser.add_argument(
+        '--iterations', type=int,
+        help="Run a fixed number of iterations and report the results as "
+             "JSON, the suite defaults to {}".format(DEFAULT_ITERATIONS))
+    parser.add_argument(
+        '--output', metavar='FILE',
+        help="Write the JSON results to a file")
+    parser.add_argument(
+        '--compare', metavar='BASELINE',
+        help="Fail when the results regress against a saved JSON file")
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the median in percent when comparing")
 
     args = parser.parse_args()
 
-    bench = BENCHMARKS[args.name]
+    try:
+        loop_name = set_loop_policy(args.loop)
+    except ImportError:
+        print('Event loop {} is not installed'.format(args.loop))
+        return 1
+
+    if args.name == MATRIX:
+        return run_matrix(args)
+
+    if args.name == SUITE:
+        names = SUITE_BENCHMARKS
+        iterations = args.iterations or DEFAULT_ITERATIONS
+    elif args.iterations or args.output or args.compare:
+        names = [args.name]
+        iterations = args.iterations or DEFAULT_ITERATIONS
+    else:
+        return run_forever(BENCHMARKS[args.name], args)
+
+    results = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'loop': loop_name,
+        'iterations': iterations,
+        'benchmarks': OrderedDict(
+            (name, run_iterations(BENCHMARKS[name], args, iterations))
+            for name in names),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fil:
+            json.dump(results, fil, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as fil:
+            baseline = json.load(fil)
+
+        if compare_results(baseline, results, args.threshold):
+            return 1
 
+    return 0
+
+
+def run_forever(bench, args):
+    """Run a benchmark until interrupted."""
     print('Using event loop:', asyncio.get_event_loop_policy().__module__)
 
     with suppress(KeyboardInterrupt):
         while True:
-            loop = asyncio.new_event_loop()
-            hass = core.HomeAssistant(loop)
-            hass.async_stop_track_tasks()
-            runtime = loop.run_until_complete(bench(hass))
+            runtime = run_benchmark(bench, args)
             print('Benchmark {} done in {}s'.format(bench.__name__, runtime))
-            loop.run_until_complete(hass.async_stop())
-            loop.close()
+            if hasattr(bench, 'operations'):
+                print('{:.0f} {}/s'.format(
+                    bench.operations[0] / runtime, bench.operations[1]))
 
     return 0
 
 
+def run_iterations(bench, args, iterations):
+    """Run a benchmark a number of times and summarize the runtimes."""
+    runtimes = sorted(run_benchmark(bench, args) for _ in range(iterations))
+    median = runtimes[len(runtimes) // 2] if len(runtimes) % 2 else \
+        sum(runtimes[len(runtimes) // 2 - 1:len(runtimes) // 2 + 1]) / 2
+    result = {
+        'median': median,
+        'p95': runtimes[max(0, math.ceil(len(runtimes) * 0.95) - 1)],
+        'min': runtimes[0],
+        'max': runtimes[-1],
+        'ops_per_sec': None,
+        'unit': None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    if hasattr(bench, 'operations'):
+        result['ops_per_sec'] = bench.operations[0] / median
+        result['unit'] = bench.operations[1]
+
+    return result
+
+
+def compare_results(baseline, results, threshold):
+    """Print a comparison with a baseline, return if anything regressed."""
+    regressed = False
+
+    for name, result in results['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+
+        if base is None:
+            print('{}: no baseline'.format(name))
+            continue
+
+        change = (result['median'] / base['median'] - 1) * 100
+
+        if change > threshold:
+            regressed = True
+            status = 'REGRESSED'
+        else:
+            status = 'ok'
+
+        print('{}: median {:.4f}s -> {:.4f}s ({:+.1f}%) {}'.format(
+            name, base['median'], result['median'], change, status))
+
+    return regressed
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of the process in MB."""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == 'darwin':
+        peak /= 1024
+
+    return peak / 1024
+
+
+def run_matrix(args):
+    """Run the matrix benchmarks once on every installed event loop."""
+    benches = [BENCHMARKS[name] for name in MATRIX_BENCHMARKS]
+    header = ['loop'] + ['{}/s'.format(bench.operations[1])
+                         for bench in benches]
+    print(' | '.join('{:>18}'.format(column) for column in header))
+
+    for loop_name in available_loops():
+        set_loop_policy(loop_name)
+        row = [loop_name]
+
+        for bench in benches:
+            runtime = run_benchmark(bench, args)
+            row.append('{:.0f}'.format(bench.operations[0] / runtime))
+
+        print(' | '.join('{:>18}'.format(column) for column in row))
+
+    return 0
+
+
+def run_benchmark(bench, args):
+    """Run a benchmark on a new event loop and return its runtime."""
+    loop = asyncio.new_event_loop()
+    hass = core.HomeAssistant(loop)
+    hass.bus.inline_callbacks = args.inline_callbacks
+    hass.services.direct_dispatch = not args.service_events
+    hass.async_stop_track_tasks()
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        hass.config.skip_pip = True
+        runtime = loop.run_until_complete(bench(hass))
+        loop.run_until_complete(hass.async_stop())
+
+    loop.close()
+    return runtime
+
+
 def benchmark(func):
     """Decorate to mark a benchmark."""
     BENCHMARKS[func.__name__] = func
     return func
 
 
+def operations(count, unit):
+    """Decorate to report the throughput of a benchmark."""
+    def decorator(func):
+        """Store the number of operations on the benchmark."""
+        func.operations = (count, unit)
+        return func
+    return decorator
+
+
+@asyncio.coroutine
+def _async_setup_recorder(hass):
+    """Set up the recorder with an in memory database."""
+    from homeassistant.components import recorder
+
+    # Let the recorder start writing right away
+    hass.state = core.CoreState.running
+
+    yield from recorder.async_setup(hass, {
+        recorder.DOMAIN: {recorder.CONF_DB_URL: 'sqlite://'}})
+
+    return hass.data[recorder.DATA_INSTANCE]
+
+
+@asyncio.coroutine
+def _async_start_http(hass, views=(), components=()):
+    """Start the HTTP server on a free port and return the port."""
+    from homeassistant.components import http
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    # pylint: disable=not-an-iterable
+    yield from http.async_setup(hass, http.CONFIG_SCHEMA({http.DOMAIN: {
+        http.CONF_SERVER_HOST: '127.0.0.1',
+        http.CONF_SERVER_PORT: port,
+    }}))
+
+    for view in views:
+        hass.http.register_view(view)
+
+    for component in components:
+        yield from component.async_setup(hass, {})
+
+    yield from hass.http.start()
+
+    return port
+
+
 @benchmark
+@operations(10**6, 'events')
 @asyncio.coroutine
 def async_million_events(hass):
     """Run a million events."""
@@ -68,16 +321,190 @@ def async_million_events(hass):
 
     hass.bus.async_listen(event_name, listener)
 
+    # Include firing, inline callbacks do all their work in async_fire
+    start = timer()
+
     for _ in range(10**6):
         hass.bus.async_fire(event_name)
 
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@operations(10**5, 'state changes')
+@asyncio.coroutine
+def async_100k_state_changes(hass):
+    """Run 100k state changes spread over 100 entities."""
+    entity_ids = ['sensor.benchmark_{}'.format(idx) for idx in range(100)]
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(_):
+        """Handle state changed event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**5:
+            event.set()
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+
+    start = timer()
+
+    for value in range(10**3):
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, value)
+
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@operations(10**4, 'requests')
+@asyncio.coroutine
+def async_10k_http_requests(hass):
+    """Run 10k HTTP requests from 10 concurrent clients."""
+    from homeassistant.components import http
+
+    class BenchmarkView(http.HomeAssistantView):
+        """View that returns a small JSON response."""
+
+        url = '/api/benchmark'
+        name = 'api:benchmark'
+        requires_auth = False
+
+        @core.callback
+        def get(self, request):
+            """Return a response."""
+            return self.json({'state': 'on'})
+
+    port = yield from _async_start_http(hass, views=[BenchmarkView])
+
+    session = hass.helpers.aiohttp_client.async_get_clientsession()
+    url = 'http://127.0.0.1:{}{}'.format(port, BenchmarkView.url)
+
+    @asyncio.coroutine
+    def client():
+        """Request the view one request after another."""
+        for _ in range(10**3):
+            resp = yield from session.get(url)
+            yield from resp.read()
+
+    start = timer()
+
+    yield from asyncio.gather(
+        *(client() for _ in range(10)), loop=hass.loop)
+
+    runtime = timer() - start
+
+    yield from hass.http.stop()
+
+    return runtime
+
+
+@benchmark
+@operations(10**6, 'events')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_million_events_from_thread(hass):
+    """Run a million events fired from a worker thread."""
+    count = 0
+    event_name = 'benchmark_event'
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**6:
+            event.set()
+
+    hass.bus.async_listen(event_name, listener)
+
+    def fire_events():
+        """Fire the events from outside the event loop."""
+        for _ in range(10**6):
+            hass.bus.fire(event_name)
+
+    start = timer()
+
+    threading.Thread(target=fire_events).start()
+
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@operations(10**5, 'events')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_100k_events_mixed_listeners(hass):
+    """Run 100k events through callback and coroutine listeners."""
+    count = 0
+    event_name = 'benchmark_event'
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def filter_listener(_):
+        """Handle event and ignore it."""
+
+    @asyncio.coroutine
+    def coro_listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**5:
+            event.set()
+
+    for _ in range(3):
+        hass.bus.async_listen(event_name, filter_listener)
+    hass.bus.async_listen(event_name, coro_listener)
+
     start = timer()
 
+    for _ in range(10**5):
+        hass.bus.async_fire(event_name)
+
     yield from event.wait()
 
     return timer() - start
 
 
+@benchmark
+@operations(10**5, 'calls')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_100k_service_calls_100_callers(hass):
+    """Run 100k blocking service calls from 100 concurrent callers."""
+    @asyncio.coroutine
+    def service_handler(call):
+        """Handle service call."""
+
+    hass.services.async_register('benchmark', 'service', service_handler)
+
+    @asyncio.coroutine
+    def caller():
+        """Call the service one after another."""
+        for _ in range(10**3):
+            yield from hass.services.async_call(
+                'benchmark', 'service', {'caller': 1}, blocking=True)
+
+    start = timer()
+
+    yield from asyncio.gather(
+        *(caller() for _ in range(100)), loop=hass.loop)
+
+    return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 # pylint: disable=invalid-name
@@ -110,6 +537,40 @@ def async_million_time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_10k_pending_timers(hass):
+    """Run 10k point in time listeners spread over 1000 time ticks."""
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+    start_time = datetime(2017, 10, 10, 15, 0, 0, tzinfo=dt_util.UTC)
+
+    @core.callback
+    def listener(_):
+        """Handle point in time."""
+        nonlocal count
+        count += 1
+
+        if count == 10**4:
+            event.set()
+
+    for idx in range(10**4):
+        hass.helpers.event.async_track_point_in_utc_time(
+            listener, start_time + timedelta(seconds=idx // 10))
+
+    for sec in range(10**3):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, {
+            ATTR_NOW: start_time + timedelta(seconds=sec)
+        })
+
+    start = timer()
+
+    yield from event.wait()
+
+    return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 # pylint: disable=invalid-name
@@ -144,3 +605,307 @@ def async_million_state_changed_helper(hass):
     yield from event.wait()
 
     return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_million_state_changed_helper_1k_entities(hass):
+    """Run a million events through 1k state changed helpers."""
+    count = 0
+    entity_ids = ['light.kitchen_{}'.format(idx) for idx in range(10**3)]
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**6:
+            event.set()
+
+    for entity_id in entity_ids:
+        hass.helpers.event.async_track_state_change(
+            entity_id, listener, 'off', 'on')
+
+    events_data = [{
+        'entity_id': entity_id,
+        'old_state': core.State(entity_id, 'off'),
+        'new_state': core.State(entity_id, 'on'),
+    } for entity_id in entity_ids]
+
+    for _ in range(10**3):
+        for event_data in events_data:
+            hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    start = timer()
+
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@operations(10**4, 'states')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_recorder_10k_inserts(hass):
+    """Record 10k state changes of 100 entities."""
+    instance = yield from _async_setup_recorder(hass)
+    entity_ids = ['sensor.benchmark_{}'.format(idx) for idx in range(100)]
+
+    start = timer()
+
+    for value in range(10**2):
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, value, {'unit': 'W'})
+
+    yield from hass.async_add_job(instance.block_till_done)
+
+    return timer() - start
+
+
+@benchmark
+@operations(10, 'queries')
+@asyncio.coroutine
+def async_history_30_days(hass):
+    """Query a day of history from a database with 30 days of states."""
+    from homeassistant.components import history
+    from homeassistant.components.recorder.models import States
+    from homeassistant.components.recorder.util import session_scope
+
+    yield from _async_setup_recorder(hass)
+    end = dt_util.utcnow()
+    begin = end - timedelta(days=30)
+
+    def fill_database():
+        """Write a state every 15 minutes for 20 entities."""
+        with session_scope(hass=hass) as session:
+            for idx in range(20):
+                entity_id = 'sensor.benchmark_{}'.format(idx)
+
+                for step in range(30 * 24 * 4):
+                    point = begin + timedelta(minutes=15 * step)
+                    state = core.State(
+                        entity_id, str(step % 50), {'unit': 'W'}, point,
+                        point)
+                    session.add(States.from_event(core.Event(
+                        EVENT_STATE_CHANGED,
+                        {'entity_id': entity_id, 'new_state': state},
+                        time_fired=point)))
+
+    yield from hass.async_add_job(fill_database)
+
+    start = timer()
+
+    for day in range(10):
+        day_start = begin + timedelta(days=day * 3)
+        yield from hass.async_add_job(
+            history.get_significant_states, hass, day_start,
+            day_start + timedelta(days=1))
+
+    return timer() - start
+
+
+@benchmark
+@operations(10**4, 'renders')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_10k_template_renders(hass):
+    """Render a template over 100 states 10k times."""
+    from homeassistant.helpers.template import Template
+
+    for idx in range(100):
+        hass.states.async_set('sensor.benchmark_{}'.format(idx), idx)
+
+    tpl = Template(
+        '{{ states.sensor | map(attribute="state") | map("int") | sum }} '
+        '{{ is_state("sensor.benchmark_1", "1") }} '
+        '{{ states("sensor.benchmark_50") | float * 2 }}', hass)
+
+    start = timer()
+
+    for _ in range(10**4):
+        tpl.async_render()
+
+    return timer() - start
+
+
+@benchmark
+@operations(20 * 10**3, 'messages')
+@asyncio.coroutine
+def async_websocket_fan_out(hass):
+    """Send 1k state changes to 20 websocket clients."""
+    from homeassistant.components import websocket_api
+
+    port = yield from _async_start_http(
+        hass, components=[websocket_api])
+    session = hass.helpers.aiohttp_client.async_get_clientsession()
+    url = 'http://127.0.0.1:{}{}'.format(port, websocket_api.URL)
+    connected = []
+
+    for _ in range(20):
+        websocket = yield from session.ws_connect(url)
+        auth = yield from websocket.receive_json()
+        assert auth['type'] == websocket_api.TYPE_AUTH_OK
+        yield from websocket.send_json({
+            'id': 1,
+            'type': websocket_api.TYPE_SUBSCRIBE_EVENTS,
+            'event_type': EVENT_STATE_CHANGED,
+        })
+        yield from websocket.receive_json()
+        connected.append(websocket)
+
+    @asyncio.coroutine
+    def receive(websocket):
+        """Receive all state changes."""
+        for _ in range(10**3):
+            yield from websocket.receive_json()
+
+    receivers = [hass.async_add_job(receive(websocket))
+                 for websocket in connected]
+
+    start = timer()
+
+    for value in range(10**3):
+        hass.states.async_set('sensor.benchmark', value)
+
+    yield from asyncio.wait(receivers, loop=hass.loop)
+
+    runtime = timer() - start
+
+    for websocket in connected:
+        yield from websocket.close()
+
+    yield from hass.http.stop()
+
+    return runtime
+
+
+@benchmark
+@operations(10**5, 'state changes')
+@asyncio.coroutine
+# pylint: disable=invalid-name
+def async_100k_state_changes_1k_trackers(hass):
+    """Run 100k state changes past 1k state change trackers."""
+    count = 0
+    entity_ids = ['light.benchmark_{}'.format(idx) for idx in range(10**3)]
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(*args):
+        """Handle state change."""
+        nonlocal count
+        count += 1
+
+        if count == 10**5:
+            event.set()
+
+    for entity_id in entity_ids:
+        hass.helpers.event.async_track_state_change(entity_id, listener)
+
+    start = timer()
+
+    for value in range(10**2):
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, value)
+
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@operations(10 * 10**3, 'updates')
+@asyncio.coroutine
+def async_poll_1k_entities(hass):
+    """Poll a platform of 1k entities 10 times."""
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_platform import EntityPlatform
+
+    class PolledEntity(Entity):
+        """Entity that counts its updates."""
+
+        def __init__(self, idx):
+            """Initialize the entity."""
+            self._name = 'benchmark {}'.format(idx)
+            self._state = 0
+
+        @property
+        def name(self):
+            """Return the name of the entity."""
+            return self._name
+
+        @property
+        def state(self):
+            """Return the state of the entity."""
+            return self._state
+
+        @asyncio.coroutine
+        def async_update(self):
+            """Update the state."""
+            self._state += 1
+
+    entity_platform = EntityPlatform(
+        hass=hass, logger=logging.getLogger(__name__), domain='sensor',
+        platform_name='benchmark', scan_interval=timedelta(hours=1),
+        parallel_updates=0, entity_namespace=None,
+        async_entities_added_callback=lambda: None)
+
+    yield from entity_platform.async_add_entities(
+        [PolledEntity(idx) for idx in range(10**3)])
+
+    start = timer()
+
+    for _ in range(10):
+        # pylint: disable=protected-access
+        yield from entity_platform._update_entity_states(dt_util.utcnow())
+
+    return timer() - start
+
+
+@benchmark
+@operations(1, 'loads')
+@asyncio.coroutine
+def async_load_large_config(hass):
+    """Load a configuration with 10 includes of 200 automations each."""
+    from homeassistant.config import load_yaml_config_file
+
+    config_dir = hass.config.config_dir
+
+    for idx in range(10):
+        path = os.path.join(config_dir, 'automations_{}.yaml'.format(idx))
+
+        with open(path, 'w') as fil:
+            for auto_idx in range(200):
+                fil.write(
+                    '- id: automation_{0}_{1}\n'
+                    '  alias: Automation {0} {1}\n'
+                    '  trigger:\n'
+                    '    platform: state\n'
+                    '    entity_id: sensor.benchmark_{1}\n'
+                    '    to: "on"\n'
+                    '  condition:\n'
+                    '    - condition: template\n'
+                    '      value_template: "{{{{ is_state(\'sun.sun\', '
+                    '\'above_horizon\') }}}}"\n'
+                    '  action:\n'
+                    '    - service: light.turn_on\n'
+                    '      data:\n'
+                    '        entity_id: light.benchmark_{1}\n'
+                    '        brightness: {1}\n'.format(idx, auto_idx))
+
+    config_path = os.path.join(config_dir, 'configuration.yaml')
+
+    with open(config_path, 'w') as fil:
+        fil.write('homeassistant:\n  name: Benchmark\n')
+        for idx in range(10):
+            fil.write('automation benchmark_{0}: '
+                      '!include automations_{0}.yaml\n'.format(idx))
+
+    start = timer()
+
+    yield from hass.async_add_job(load_yaml_config_file, config_path)
+
+    return timer() - start
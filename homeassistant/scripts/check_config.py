@@ -261,7 +261,9 @@ def check(config_path):
     for pat in PATCHES.values():
         pat.start()
     # Ensure !secrets point to the patched function
-    yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+    yaml.add_constructor('!secret', yaml._secret_yaml)
+    # Parse all files so the secrets they use are seen
+    yaml.clear_yaml_cache()
 
     try:
         with patch('homeassistant.util.logging.AsyncHandler._process'):
@@ -275,7 +277,8 @@ def check(config_path):
         for pat in PATCHES.values():
             pat.stop()
         # Ensure !secrets point to the original function
-        yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+        yaml.add_constructor('!secret', yaml._secret_yaml)
+        yaml.clear_yaml_cache()
         bootstrap.clear_secret_cache()
 
     return res
@@ -1,5 +1,6 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+from collections import OrderedDict
 import logging.handlers
 from timeit import default_timer as timer
 
@@ -10,6 +11,9 @@ from homeassistant import requirements, core, loader, config as conf_util
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.timeline import (
+    PHASE_DEPENDENCIES, PHASE_IMPORT, PHASE_REQUIREMENTS, PHASE_SETUP,
+    async_add_waits, async_timed)
 from homeassistant.util.async import run_coroutine_threadsafe
 
 
@@ -57,6 +61,110 @@ def async_setup_component(hass: core.HomeAssistant, domain: str,
     return (yield from task)
 
 
+@asyncio.coroutine
+def async_setup_components(hass: core.HomeAssistant, domains, config: Dict,
+                           first=()):
+    """Set up components as soon as their dependencies are set up.
+
+    The configured components in first and their dependencies are set up
+    before all others. At most hass.config.setup_max_parallel components are
+    set up at the same time and each gets hass.config.setup_timeout seconds.
+    Returns the domains that did not finish in time.
+
+    This method is a coroutine.
+    """
+    graph, first = _setup_graph(domains, first)
+    max_parallel = hass.config.setup_max_parallel
+    setup_timeout = hass.config.setup_timeout or None
+    semaphore = asyncio.Semaphore(max_parallel, loop=hass.loop) \
+        if max_parallel else None
+    timed_out = set()
+
+    @asyncio.coroutine
+    def setup(domain):
+        """Set up a component once its dependencies are done."""
+        dependencies = graph[domain]
+        # The first stage only orders the setup, it is not depended upon
+        waits = dependencies if domain in first else \
+            list(OrderedDict.fromkeys(dependencies + first))
+
+        if waits:
+            async_add_waits(hass, domain, waits)
+            with async_timed(hass, domain, PHASE_DEPENDENCIES):
+                yield from asyncio.wait(
+                    [tasks[dep] for dep in waits], loop=hass.loop)
+
+        waited = [dep for dep in dependencies if dep in timed_out]
+        if waited:
+            _LOGGER.error("Not setting up %s, setup of dependencies %s did "
+                          "not finish in time", domain, ', '.join(waited))
+            timed_out.add(domain)
+            return
+
+        if semaphore is not None:
+            yield from semaphore.acquire()
+
+        try:
+            # Shielded so the setup continues in the background
+            yield from asyncio.wait_for(
+                asyncio.shield(async_setup_component(hass, domain, config),
+                               loop=hass.loop),
+                setup_timeout, loop=hass.loop)
+        except asyncio.TimeoutError:
+            _LOGGER.error("Setup of %s did not finish in %s seconds, "
+                          "continuing without it", domain, setup_timeout)
+            timed_out.add(domain)
+            # Do not hold back the start of Home Assistant
+            hass.async_untrack_task(hass.data[DATA_SETUP][domain])
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    tasks = {domain: hass.loop.create_task(setup(domain))
+             for domain in graph}
+
+    if tasks:
+        yield from asyncio.wait(tasks.values(), loop=hass.loop)
+
+    return timed_out
+
+
+def _setup_graph(domains, first):
+    """Map the components to set up to the components they depend on.
+
+    Also returns the components of the first stage, which all others wait for.
+    """
+    graph = OrderedDict()
+
+    def add(domain):
+        """Add a component and its dependencies to the graph."""
+        load_order = loader.load_order_component(domain)
+
+        # Set up unresolved components right away to report the error
+        if not load_order:
+            graph.setdefault(domain, [])
+            return
+
+        for name in load_order:
+            if name not in graph:
+                graph[name] = list(loader.get_dependencies(name))
+
+    first = [domain for domain in domains if domain in first]
+
+    for domain in first:
+        add(domain)
+
+    before = list(graph)
+
+    for domain in domains:
+        add(domain)
+
+    for dependencies in graph.values():
+        dependencies[:] = [dep for dep in dependencies if dep in graph]
+
+    return graph, before
+
+
 @asyncio.coroutine
 def _async_process_dependencies(hass, config, name, dependencies):
     """Ensure all dependencies are set up."""
@@ -101,7 +209,8 @@ def _async_setup_component(hass: core.HomeAssistant,
         _LOGGER.error("Setup failed for %s: %s", domain, msg)
         async_notify_setup_error(hass, domain, link)
 
-    component = loader.get_component(domain)
+    with async_timed(hass, domain, PHASE_IMPORT):
+        component = loader.get_component(domain)
 
     if not component:
         log_error("Component not found.", False)
@@ -141,11 +250,13 @@ def _async_setup_component(hass: core.HomeAssistant,
             domain, SLOW_SETUP_WARNING)
 
     try:
-        if hasattr(component, 'async_setup'):
-            result = yield from component.async_setup(hass, processed_config)
-        else:
-            result = yield from hass.async_add_job(
-                component.setup, hass, processed_config)
+        with async_timed(hass, domain, PHASE_SETUP):
+            if hasattr(component, 'async_setup'):
+                result = yield from component.async_setup(
+                    hass, processed_config)
+            else:
+                result = yield from hass.async_add_job(
+                    component.setup, hass, processed_config)
     except Exception:  # pylint: disable=broad-except
         _LOGGER.exception("Error during setup of component %s", domain)
         async_notify_setup_error(hass, domain, True)
@@ -194,7 +305,8 @@ def async_prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
                       platform_path, msg)
         async_notify_setup_error(hass, platform_path)
 
-    platform = loader.get_platform(domain, platform_name)
+    with async_timed(hass, platform_path, PHASE_IMPORT):
+        platform = loader.get_platform(domain, platform_name)
 
     # Not found
     if platform is None:
@@ -205,6 +317,9 @@ def async_prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
     elif platform_path in hass.config.components:
         return platform
 
+    # The component waits for its platforms before it is done
+    async_add_waits(hass, domain, [platform_path])
+
     try:
         yield from _process_deps_reqs(hass, config, platform_path, platform)
     except HomeAssistantError as err:
@@ -228,15 +343,19 @@ def _process_deps_reqs(hass, config, name, module):
         return
 
     if hasattr(module, 'DEPENDENCIES'):
-        dep_success = yield from _async_process_dependencies(
-            hass, config, name, module.DEPENDENCIES)
+        async_add_waits(hass, name, module.DEPENDENCIES)
+
+        with async_timed(hass, name, PHASE_DEPENDENCIES):
+            dep_success = yield from _async_process_dependencies(
+                hass, config, name, module.DEPENDENCIES)
 
         if not dep_success:
             raise HomeAssistantError("Could not setup all dependencies.")
 
     if not hass.config.skip_pip and hasattr(module, 'REQUIREMENTS'):
-        req_success = yield from requirements.async_process_requirements(
-            hass, name, module.REQUIREMENTS)
+        with async_timed(hass, name, PHASE_REQUIREMENTS):
+            req_success = yield from requirements.async_process_requirements(
+                hass, name, module.REQUIREMENTS)
 
         if not req_success:
             raise HomeAssistantError("Could not install all requirements.")
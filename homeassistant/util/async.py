@@ -1,4 +1,5 @@
 """Asyncio backports for Python 3.4.3 compatibility."""
+from collections import deque
 import concurrent.futures
 import threading
 import logging
@@ -174,3 +175,80 @@ def run_callback_threadsafe(loop, callback, *args):
 
     loop.call_soon_threadsafe(run_callback)
     return future
+
+
+class ThreadsafeCallQueue(object):
+    """Submit callbacks to an event loop from other threads in batches.
+
+    Callbacks are appended to a deque, which is thread-safe without a lock.
+    Only the first callback of a batch wakes up the event loop, all
+    callbacks queued until the batch runs share that wakeup. Callbacks run
+    in the order they were submitted.
+    """
+
+    def __init__(self, loop):
+        """Initialize the queue."""
+        self._loop = loop
+        self._calls = deque()
+        self._scheduled = False
+
+    def __len__(self):
+        """Return the number of callbacks waiting to run."""
+        return len(self._calls)
+
+    def call_soon(self, callback, *args):
+        """Schedule a callback to run inside the event loop."""
+        self._calls.append((callback, args))
+
+        # The flag is cleared before a batch runs, a call appended after
+        # that always finds either a pending batch or schedules a new one.
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                self._loop.call_soon_threadsafe(self._run_batch)
+            except RuntimeError:
+                self._scheduled = False
+                raise
+
+    def run_callback(self, callback, *args):
+        """Run a callback inside the event loop.
+
+        Return a concurrent.futures.Future to access the result.
+        """
+        ident = self._loop.__dict__.get("_thread_ident")
+        if ident is not None and ident == threading.get_ident():
+            raise RuntimeError('Cannot be called from within the event loop')
+
+        future = concurrent.futures.Future()
+
+        def run_callback():
+            """Run callback and store result."""
+            try:
+                future.set_result(callback(*args))
+            # pylint: disable=broad-except
+            except Exception as exc:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(exc)
+                else:
+                    _LOGGER.warning("Exception on lost future: ",
+                                    exc_info=True)
+
+        self.call_soon(run_callback)
+        return future
+
+    def _run_batch(self):
+        """Run the callbacks queued so far."""
+        self._scheduled = False
+        calls = self._calls
+
+        # Calls queued while the batch runs have scheduled the next batch
+        for _ in range(len(calls)):
+            callback, args = calls.popleft()
+            try:
+                callback(*args)
+            # pylint: disable=broad-except
+            except Exception as exc:
+                self._loop.call_exception_handler({
+                    'message': 'Exception in callback {}'.format(callback),
+                    'exception': exc,
+                })
@@ -0,0 +1,180 @@
+"""Named executor pools with queue and timing metrics."""
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import threading
+from time import monotonic
+
+from homeassistant.util.histogram import Histogram
+
+# Shared pool for I/O bound jobs, used unless a job is assigned elsewhere
+POOL_DEFAULT = 'default'
+# Reads from the recorder database
+POOL_DB = 'db'
+# CPU bound jobs, like parsing the configuration
+POOL_CPU = 'cpu'
+
+COMPONENT_PREFIXES = ('homeassistant.components.', 'custom_components.')
+
+DEFAULT_DB_WORKERS = 4
+
+
+def job_pool(func):
+    """Return the pool a function was marked to run in."""
+    return getattr(func, '_hass_executor_pool', None)
+
+
+def module_integration(module):
+    """Return the integration a module belongs to."""
+    for prefix in COMPONENT_PREFIXES:
+        if module.startswith(prefix):
+            return module[len(prefix):]
+    return None
+
+
+class MeteredExecutor(ThreadPoolExecutor):
+    """Thread pool executor that measures its queue and its jobs."""
+
+    def __init__(self, name, max_workers=None):
+        """Initialize the executor."""
+        executor_opts = {'max_workers': max_workers or 10}
+        if sys.version_info[:2] >= (3, 5) and max_workers is None:
+            # It will default set to the number of processors on the machine,
+            # multiplied by 5. That is better for overlap I/O workers.
+            executor_opts['max_workers'] = None
+        if sys.version_info[:2] >= (3, 6):
+            executor_opts['thread_name_prefix'] = 'SyncWorker' \
+                if name == POOL_DEFAULT else 'SyncWorker_{}'.format(name)
+
+        super().__init__(**executor_opts)
+        self.name = name
+        self.queued = 0
+        self.running = 0
+        self.wait_time = Histogram()
+        self.run_time = Histogram()
+        self._metrics_lock = threading.Lock()
+
+    def submit(self, target, *args, **kwargs):
+        """Submit a job and record when it was queued."""
+        with self._metrics_lock:
+            self.queued += 1
+        return super().submit(
+            self._run_job, monotonic(), target, args, kwargs)
+
+    def _run_job(self, queued_at, target, args, kwargs):
+        """Run a job inside a worker thread."""
+        start = monotonic()
+        with self._metrics_lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_time.add(start - queued_at)
+
+        try:
+            return target(*args, **kwargs)
+        finally:
+            with self._metrics_lock:
+                self.running -= 1
+                self.run_time.add(monotonic() - start)
+
+    def as_dict(self):
+        """Return a dictionary representation of the metrics."""
+        with self._metrics_lock:
+            return {
+                'max_workers': self._max_workers,
+                'queued': self.queued,
+                'running': self.running,
+                'wait': self.wait_time.as_dict(),
+                'run': self.run_time.as_dict(),
+            }
+
+
+class ExecutorPools(object):
+    """Keep track of the executor pools and which jobs run where.
+
+    A job runs in the pool it was marked for with executor_pool. Otherwise
+    the integration of the module it is defined in decides, falling back to
+    the default pool.
+    """
+
+    def __init__(self, loop):
+        """Initialize the pools."""
+        self.loop = loop
+        self.pools = {}
+        self._assignments = {}
+        self._module_pools = {}
+        self.create(POOL_DEFAULT)
+        self.create(POOL_DB, DEFAULT_DB_WORKERS)
+        self.create(POOL_CPU)
+
+    @property
+    def default(self):
+        """Return the default pool."""
+        return self.pools[POOL_DEFAULT]
+
+    def create(self, name, max_workers=None):
+        """Create a pool, replacing an existing pool with the same name.
+
+        Jobs already submitted to a replaced pool still run.
+        """
+        old_pool = self.pools.get(name)
+        pool = self.pools[name] = MeteredExecutor(name, max_workers)
+
+        if name == POOL_DEFAULT:
+            self.loop.set_default_executor(pool)
+
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+        self._module_pools.clear()
+        return pool
+
+    def assign(self, integration, name):
+        """Run the jobs of an integration in a pool."""
+        if name not in self.pools:
+            raise ValueError("Unknown executor pool {}".format(name))
+
+        self._assignments[integration] = name
+        self._module_pools.clear()
+
+    def get(self, target):
+        """Return the pool to run a job in."""
+        name = job_pool(target)
+
+        if name is not None:
+            return self.pools.get(name, self.default)
+
+        module = getattr(target, '__module__', None)
+
+        if module is None:
+            return self.default
+
+        pool = self._module_pools.get(module)
+
+        if pool is None:
+            pool = self._module_pools[module] = self._module_pool(module)
+
+        return pool
+
+    def _module_pool(self, module):
+        """Look up the pool of the integration of a module."""
+        integration = module_integration(module)
+
+        while integration:
+            name = self._assignments.get(integration)
+            if name is not None:
+                return self.pools[name]
+            integration = integration.rpartition('.')[0]
+
+        return self.default
+
+    def shutdown(self):
+        """Shut down all pools."""
+        for pool in self.pools.values():
+            pool.shutdown()
+
+    def as_dict(self):
+        """Return a dictionary representation of the pools."""
+        return {
+            'pools': {name: pool.as_dict()
+                      for name, pool in self.pools.items()},
+            'assignments': dict(self._assignments),
+        }
@@ -0,0 +1,73 @@
+"""Bounded histograms for timing measurements."""
+from bisect import bisect_left
+
+# Upper bounds in seconds of the buckets, the last bucket is unbounded.
+DEFAULT_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5,
+                  1, 5, 10)
+
+
+class Histogram(object):
+    """Count measurements in a fixed set of buckets.
+
+    Memory use does not depend on the number of measurements, percentiles
+    are estimated as the upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ['bounds', 'buckets', 'count', 'total', 'max']
+
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        """Initialize an empty histogram."""
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        """Add a measurement."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        """Return the mean of the measurements."""
+        if not self.count:
+            return 0
+        return self.total / self.count
+
+    def percentile(self, percent):
+        """Return an estimate of the given percentile."""
+        if not self.count:
+            return 0
+
+        rank = self.count * percent / 100
+        seen = 0
+
+        for idx, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                if idx == len(self.bounds):
+                    return self.max
+                return min(self.bounds[idx], self.max)
+
+        return self.max
+
+    def as_dict(self):
+        """Return a dictionary representation of the histogram."""
+        buckets = {str(bound): count
+                   for bound, count in zip(self.bounds, self.buckets)}
+        buckets['+Inf'] = self.buckets[-1]
+
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': buckets,
+        }
@@ -0,0 +1,45 @@
+"""Select the event loop implementation Home Assistant runs on."""
+LOOP_AUTO = 'auto'
+LOOP_ASYNCIO = 'asyncio'
+LOOP_UVLOOP = 'uvloop'
+
+LOOP_CHOICES = (LOOP_AUTO, LOOP_ASYNCIO, LOOP_UVLOOP)
+
+
+def available_loops():
+    """Return the event loop implementations that are installed."""
+    loops = [LOOP_ASYNCIO]
+
+    try:
+        # pylint: disable=import-error,unused-variable
+        import uvloop  # noqa
+        loops.append(LOOP_UVLOOP)
+    except ImportError:
+        pass
+
+    return loops
+
+
+def set_loop_policy(name=LOOP_AUTO):
+    """Install the event loop policy of an event loop implementation.
+
+    Auto picks uvloop when it is installed. Returns the name of the chosen
+    implementation, raises ImportError if it is not installed.
+    """
+    # Imported here to avoid importing asyncio before monkey patch
+    import asyncio
+
+    if name == LOOP_AUTO:
+        name = available_loops()[-1]
+
+    if name == LOOP_UVLOOP:
+        # pylint: disable=import-error
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    elif name == LOOP_ASYNCIO:
+        # Restore the default policy
+        asyncio.set_event_loop_policy(None)
+    else:
+        raise ValueError("Unknown event loop {}".format(name))
+
+    return name
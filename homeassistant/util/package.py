@@ -1,5 +1,6 @@
 """Helpers to install PyPi packages."""
 import asyncio
+import hashlib
 import logging
 import os
 from subprocess import PIPE, Popen
@@ -8,7 +9,7 @@ import threading
 from urllib.parse import urlparse
 
 from pip.locations import running_under_virtualenv
-from typing import Optional
+from typing import Iterable, List, Optional
 
 import pkg_resources
 
@@ -55,7 +56,8 @@ def install_package(package: str, upgrade: bool = True,
         return True
 
 
-def check_package_exists(package: str) -> bool:
+def check_package_exists(
+        package: str, env: Optional[pkg_resources.Environment] = None) -> bool:
     """Check if a package is installed globally or in lib_dir.
 
     Returns True when the requirement is met.
@@ -67,10 +69,47 @@ def check_package_exists(package: str) -> bool:
         # This is a zip file
         req = pkg_resources.Requirement.parse(urlparse(package).fragment)
 
-    env = pkg_resources.Environment()
+    if env is None:
+        env = pkg_resources.Environment()
     return any(dist in req for dist in env[req.project_name])
 
 
+def missing_packages(packages: Iterable[str]) -> List[str]:
+    """Return the packages that are not installed or don't meet req.
+
+    The installed packages are scanned once for all of them.
+    """
+    env = pkg_resources.Environment()
+    return [package for package in packages
+            if not check_package_exists(package, env)]
+
+
+def site_packages_state() -> str:
+    """Return a fingerprint of the packages installed on the path.
+
+    It changes when a package is installed, upgraded or removed.
+    """
+    fingerprint = hashlib.sha1()
+
+    for path in sys.path:
+        try:
+            names = sorted(os.listdir(path))
+        except OSError:
+            continue
+
+        for name in names:
+            if not name.endswith(('.dist-info', '.egg-info', '.egg-link')):
+                continue
+            try:
+                mtime = os.path.getmtime(os.path.join(path, name))
+            except OSError:
+                continue
+            fingerprint.update('{}:{}:{}'.format(
+                path, name, mtime).encode('utf-8'))
+
+    return fingerprint.hexdigest()
+
+
 def _get_user_site(deps_dir: str) -> tuple:
     """Get arguments and environment for subprocess used in get_user_site."""
     env = os.environ.copy()
@@ -0,0 +1,159 @@
+"""Detect callbacks and coroutines that block the event loop."""
+from collections import Counter, deque
+import logging
+import sys
+import threading
+from time import monotonic
+import traceback
+
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+COMPONENTS_PREFIX = 'homeassistant.components.'
+CUSTOM_COMPONENTS_PREFIX = 'custom_components.'
+
+# Seconds a heartbeat may be late before the loop counts as stalled
+DEFAULT_THRESHOLD = 0.5
+# Seconds between heartbeats
+DEFAULT_INTERVAL = 1
+# Number of stalls kept with their stack
+MAX_RECENT_STALLS = 20
+# Number of frames kept of a sampled stack
+MAX_STACK_DEPTH = 15
+
+UNKNOWN_SOURCE = 'unknown'
+
+
+def frame_source(frame):
+    """Return the component a stack of frames belongs to.
+
+    The innermost frame of a component wins. Without a component the
+    innermost Home Assistant module is returned.
+    """
+    fallback = None
+
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+
+        if module.startswith(COMPONENTS_PREFIX):
+            return module[len(COMPONENTS_PREFIX):]
+
+        if module.startswith(CUSTOM_COMPONENTS_PREFIX):
+            return module
+
+        if fallback is None and module.startswith('homeassistant.'):
+            fallback = module
+
+        frame = frame.f_back
+
+    return fallback or UNKNOWN_SOURCE
+
+
+class LoopWatchdog(threading.Thread):
+    """Watch the event loop for stalls from a separate thread.
+
+    A heartbeat is scheduled on the loop every interval. When it is late by
+    more than the threshold, the stack of the loop thread is sampled until
+    the heartbeat runs to find out which component is blocking the loop.
+    """
+
+    def __init__(self, loop, threshold=DEFAULT_THRESHOLD,
+                 interval=DEFAULT_INTERVAL):
+        """Initialize the watchdog."""
+        super().__init__(name='LoopWatchdog', daemon=True)
+        self.loop = loop
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = {}
+        self.recent = deque(maxlen=MAX_RECENT_STALLS)
+        self._heartbeat = threading.Event()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread = None
+
+    def stop(self):
+        """Stop watching the event loop."""
+        self._stop_event.set()
+
+    def as_dict(self):
+        """Return a dictionary representation of the detected stalls."""
+        with self._lock:
+            return {
+                'threshold': self.threshold,
+                'sources': {source: dict(stall)
+                            for source, stall in self.stalls.items()},
+                'recent': list(self.recent),
+            }
+
+    def _beat(self):
+        """Handle a heartbeat inside the event loop."""
+        self._loop_thread = threading.get_ident()
+        self._heartbeat.set()
+
+    def run(self):
+        """Send heartbeats to the event loop."""
+        while not self._stop_event.wait(self.interval):
+            if not self.loop.is_running():
+                continue
+
+            self._heartbeat.clear()
+            sent = monotonic()
+
+            try:
+                self.loop.call_soon_threadsafe(self._beat)
+            except RuntimeError:
+                # Loop has been closed
+                break
+
+            if not self._heartbeat.wait(self.threshold):
+                self._track_stall(sent)
+
+    def _track_stall(self, sent):
+        """Sample the loop thread until the late heartbeat arrives."""
+        samples = Counter()
+        stack = None
+
+        while True:
+            loop_thread = self._loop_thread or \
+                getattr(self.loop, '_thread_id', None)
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(loop_thread)
+
+            if frame is not None:
+                samples[frame_source(frame)] += 1
+                if stack is None:
+                    stack = traceback.format_stack(frame)[-MAX_STACK_DEPTH:]
+
+            if self._heartbeat.wait(self.threshold):
+                break
+
+            if self._stop_event.is_set() or not self.loop.is_running():
+                return
+
+        blocked = monotonic() - sent
+
+        if samples:
+            source = samples.most_common(1)[0][0]
+        else:
+            source = UNKNOWN_SOURCE
+
+        with self._lock:
+            stall = self.stalls.get(source)
+            if stall is None:
+                stall = self.stalls[source] = {
+                    'count': 0, 'blocked': 0, 'max': 0}
+
+            stall['count'] += 1
+            stall['blocked'] += blocked
+            stall['max'] = max(stall['max'], blocked)
+
+            self.recent.appendleft({
+                'timestamp': dt_util.utcnow(),
+                'source': source,
+                'blocked': blocked,
+                'stack': ''.join(stack or []),
+            })
+
+        _LOGGER.warning("Event loop was blocked for %.2fs by %s:\n%s",
+                        blocked, source, ''.join(stack or []))
@@ -1,10 +1,14 @@
 """YAML utility functions."""
+import copy
+import hashlib
+import io
 import logging
 import os
 import sys
 import fnmatch
+import threading
 from collections import OrderedDict
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple  # NOQA
 
 import yaml
 try:
@@ -24,6 +28,17 @@ _SECRET_NAMESPACE = 'homeassistant'
 SECRET_YAML = 'secrets.yaml'
 __SECRET_CACHE = {}  # type: Dict
 
+# Parsed files by name: (content hash, dependencies, data)
+_YAML_CACHE = {}  # type: Dict[str, Tuple[str, Dict, Union[List, Dict]]]
+# Dependencies of the files being parsed in this thread, innermost last
+_LOADING = threading.local()
+
+DEP_FILE = 'file'
+DEP_DIR = 'dir'
+DEP_ENV = 'env'
+# Secrets from keyring or credstash, checked again on every load
+DEP_EXTERNAL = 'external'
+
 
 class NodeListClass(list):
     """Wrapper class to be able to add attributes on a list."""
@@ -61,20 +76,129 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if getattr(yaml, '__with_libyaml__', False):
+    # pylint: disable=no-member
+    class FastSafeLineLoader(yaml.CSafeLoader):
+        """Loader class using LibYAML.
+
+        Line numbers are taken from the marks of the nodes.
+        """
+
+        def __init__(self, stream):
+            """Initialize the loader."""
+            super().__init__(stream)
+            self.name = getattr(stream, 'name', '<file>')
+            self.stream = stream
+
+    LOADERS = (FastSafeLineLoader, yaml.SafeLoader)
+else:
+    # pylint: disable=invalid-name
+    FastSafeLineLoader = None
+    LOADERS = (yaml.SafeLoader,)
+
+
 def load_yaml(fname: str) -> Union[List, Dict]:
-    """Load a YAML file."""
+    """Load a YAML file.
+
+    Parsed files are cached until they or the files, directories, secrets
+    and environment variables they use change.
+    """
     try:
         with open(fname, encoding='utf-8') as conf_file:
-            # If configuration file is empty YAML returns None
-            # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
-    except yaml.YAMLError as exc:
-        _LOGGER.error(exc)
-        raise HomeAssistantError(exc)
+            content = conf_file.read()
     except UnicodeDecodeError as exc:
         _LOGGER.error("Unable to read file %s: %s", fname, exc)
         raise HomeAssistantError(exc)
 
+    digest = _digest(content)
+    cached = _YAML_CACHE.get(fname)
+
+    fresh = cached is not None and cached[0] == digest and all(
+        _dependency_stamp(dep) == stamp for dep, stamp in cached[1].items())
+
+    if fresh:
+        dependencies, data = cached[1], cached[2]
+    else:
+        stack = _loading_stack()
+        stack.append({})
+        try:
+            data = _parse_yaml(fname, content)
+        finally:
+            dependencies = stack.pop()
+        _YAML_CACHE[fname] = (digest, dependencies, data)
+
+    # Files including this one also depend on what it depends on
+    _add_dependency((DEP_FILE, fname), digest)
+    for dep, stamp in dependencies.items():
+        _add_dependency(dep, stamp)
+
+    # Callers are free to change what they get
+    return copy.deepcopy(data)
+
+
+def _parse_yaml(fname: str, content: str) -> Union[List, Dict]:
+    """Parse the content of a YAML file."""
+    stream = io.StringIO(content)
+    stream.name = fname
+    loader = LOADERS[0](stream)
+
+    try:
+        # If configuration file is empty YAML returns None
+        # We convert that to an empty dict
+        return loader.get_single_data() or OrderedDict()
+    except yaml.YAMLError as exc:
+        _LOGGER.error(exc)
+        raise HomeAssistantError(exc)
+    finally:
+        loader.dispose()
+
+
+def clear_yaml_cache() -> None:
+    """Clear the cache of parsed files.
+
+    Async friendly.
+    """
+    _YAML_CACHE.clear()
+
+
+def _digest(content: str) -> str:
+    """Return the hash of the content of a file."""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def _loading_stack() -> List[Dict]:
+    """Return the dependencies of the files being parsed in this thread."""
+    stack = getattr(_LOADING, 'stack', None)
+    if stack is None:
+        stack = _LOADING.stack = []
+    return stack
+
+
+def _add_dependency(dependency: Tuple, stamp=None) -> None:
+    """Record that the file being parsed depends on something."""
+    stack = _loading_stack()
+    if stack:
+        stack[-1][dependency] = stamp
+
+
+def _dependency_stamp(dependency: Tuple):
+    """Return the current state of something a file depends on."""
+    kind, name = dependency
+
+    if kind == DEP_FILE:
+        try:
+            with open(name, encoding='utf-8') as dep_file:
+                return _digest(dep_file.read())
+        except (OSError, UnicodeDecodeError):
+            return None
+    elif kind == DEP_DIR:
+        return list(_find_files(name, '*.yaml'))
+    elif kind == DEP_ENV:
+        return os.getenv(name)
+
+    # Never the same
+    return object()
+
 
 def dump(_dict: dict) -> str:
     """Dump YAML to a string and remove null."""
@@ -125,12 +249,19 @@ def _find_files(directory: str, pattern: str):
                 yield filename
 
 
+def _include_dir(loader: SafeLineLoader, node: yaml.nodes.Node) -> List[str]:
+    """Return the YAML files in an included directory."""
+    loc = os.path.join(os.path.dirname(loader.name), node.value)
+    fnames = list(_find_files(loc, '*.yaml'))
+    _add_dependency((DEP_DIR, loc), fnames)
+    return fnames
+
+
 def _include_dir_named_yaml(loader: SafeLineLoader,
                             node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
     mapping = OrderedDict()  # type: OrderedDict
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _include_dir(loader, node):
         filename = os.path.splitext(os.path.basename(fname))[0]
         mapping[filename] = load_yaml(fname)
     return _add_reference(mapping, loader, node)
@@ -140,8 +271,7 @@ def _include_dir_merge_named_yaml(loader: SafeLineLoader,
                                   node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a merged dictionary."""
     mapping = OrderedDict()  # type: OrderedDict
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _include_dir(loader, node):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname)
@@ -153,18 +283,15 @@ def _include_dir_merge_named_yaml(loader: SafeLineLoader,
 def _include_dir_list_yaml(loader: SafeLineLoader,
                            node: yaml.nodes.Node):
     """Load multiple files from directory as a list."""
-    loc = os.path.join(os.path.dirname(loader.name), node.value)
-    return [load_yaml(f) for f in _find_files(loc, '*.yaml')
+    return [load_yaml(f) for f in _include_dir(loader, node)
             if os.path.basename(f) != SECRET_YAML]
 
 
 def _include_dir_merge_list_yaml(loader: SafeLineLoader,
                                  node: yaml.nodes.Node):
     """Load multiple files from directory as a merged list."""
-    loc = os.path.join(os.path.dirname(loader.name),
-                       node.value)  # type: str
     merged_list = []  # type: List
-    for fname in _find_files(loc, '*.yaml'):
+    for fname in _include_dir(loader, node):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname)
@@ -212,6 +339,7 @@ def _env_var_yaml(loader: SafeLineLoader,
                   node: yaml.nodes.Node):
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    _add_dependency((DEP_ENV, args[0]), os.getenv(args[0]))
 
     # Check for a default value
     if len(args) > 1:
@@ -227,6 +355,8 @@ def _load_secret_yaml(secret_path: str) -> Dict:
     """Load the secrets yaml from path."""
     secret_path = os.path.join(secret_path, SECRET_YAML)
     if secret_path in __SECRET_CACHE:
+        _add_dependency((DEP_FILE, secret_path),
+                        _dependency_stamp((DEP_FILE, secret_path)))
         return __SECRET_CACHE[secret_path]
 
     _LOGGER.debug('Loading %s', secret_path)
@@ -241,6 +371,7 @@ def _load_secret_yaml(secret_path: str) -> Dict:
                               " but 'logger: %s' found", logger)
             del secrets['logger']
     except FileNotFoundError:
+        _add_dependency((DEP_FILE, secret_path))
         secrets = {}
     __SECRET_CACHE[secret_path] = secrets
     return secrets
@@ -266,6 +397,8 @@ def _secret_yaml(loader: SafeLineLoader,
         if not os.path.exists(secret_path) or len(secret_path) < 5:
             break  # Somehow we got past the .homeassistant config folder
 
+    _add_dependency((DEP_EXTERNAL, node.value))
+
     if keyring:
         # do some keyring stuff
         pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
@@ -292,19 +425,22 @@ def _secret_yaml(loader: SafeLineLoader,
     raise HomeAssistantError(node.value)
 
 
-yaml.SafeLoader.add_constructor('!include', _include_yaml)
-yaml.SafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                _ordered_dict)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
-yaml.SafeLoader.add_constructor('!env_var', _env_var_yaml)
-yaml.SafeLoader.add_constructor('!secret', _secret_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_list', _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_list',
-                                _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_named', _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_named',
-                                _include_dir_merge_named_yaml)
+def add_constructor(tag, constructor) -> None:
+    """Add a constructor for a tag to all loaders."""
+    for loader in LOADERS:
+        loader.add_constructor(tag, constructor)
+
+
+add_constructor('!include', _include_yaml)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG,
+                _construct_seq)
+add_constructor('!env_var', _env_var_yaml)
+add_constructor('!secret', _secret_yaml)
+add_constructor('!include_dir_list', _include_dir_list_yaml)
+add_constructor('!include_dir_merge_list', _include_dir_merge_list_yaml)
+add_constructor('!include_dir_named', _include_dir_named_yaml)
+add_constructor('!include_dir_merge_named', _include_dir_merge_named_yaml)
 
 
 # From: https://gist.github.com/miracle2k/3184458
@@ -109,6 +109,8 @@ def get_test_home_assistant():
 def async_test_home_assistant(loop):
     """Return a Home Assistant object pointing at test config dir."""
     hass = ha.HomeAssistant(loop)
+    # Tests block the loop on purpose, don't report that as stalls
+    hass.watchdog.stop()
     INSTANCES.append(hass)
 
     orig_async_add_job = hass.async_add_job
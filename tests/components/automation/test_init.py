@@ -454,6 +454,60 @@ class TestAutomation(unittest.TestCase):
         assert len(self.calls) == 2
         assert self.calls[1].data.get('event') == 'test_event2'
 
+    def test_reload_config_only_changed(self):
+        """Test reloading only replaces the automations that changed."""
+        def _automation(alias, event_type):
+            """Return the config of an automation."""
+            return {
+                'alias': alias,
+                'trigger': {
+                    'platform': 'event',
+                    'event_type': event_type,
+                },
+                'action': {
+                    'service': 'test.automation',
+                    'data_template': {
+                        'event': '{{ trigger.event.event_type }}'
+                    }
+                }
+            }
+
+        assert setup_component(self.hass, automation.DOMAIN, {
+            automation.DOMAIN: [
+                _automation('hello', 'test_event'),
+                _automation('bye', 'test_event'),
+            ]
+        })
+        self.hass.bus.fire('test_event')
+        self.hass.block_till_done()
+        assert len(self.calls) == 2
+
+        automation.turn_off(self.hass, 'automation.bye')
+        self.hass.block_till_done()
+        hello = self.hass.states.get('automation.hello')
+        bye = self.hass.states.get('automation.bye')
+
+        with patch('homeassistant.config.load_yaml_config_file', autospec=True,
+                   return_value={automation.DOMAIN: [
+                       _automation('hello', 'test_event'),
+                       _automation('bye', 'test_event2'),
+                   ]}):
+            automation.reload(self.hass)
+            self.hass.block_till_done()
+
+        # Unchanged automation kept its state object
+        assert self.hass.states.get('automation.hello') is hello
+
+        # Changed automation continues where the old version stopped
+        state = self.hass.states.get('automation.bye')
+        assert state.state == STATE_OFF
+        assert state.attributes['last_triggered'] == \
+            bye.attributes['last_triggered']
+
+        listeners = self.hass.bus.listeners
+        assert listeners.get('test_event') == 1
+        assert listeners.get('test_event2') is None
+
     def test_reload_config_when_invalid_config(self):
         """Test the reload config service handling invalid config."""
         with assert_setup_component(1, automation.DOMAIN):
@@ -10,6 +10,7 @@ from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME, ATTR_FRIENDLY_NAME)
 import homeassistant.components.group as group
+from homeassistant.helpers.event import DATA_STATE_CHANGE_TRACKER
 
 from tests.common import get_test_home_assistant, assert_setup_component
 
@@ -350,7 +351,8 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.empty_group', 'group.second_group', 'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 2
+        assert self.hass.data[DATA_STATE_CHANGE_TRACKER].async_listeners() \
+            == {'light.bowl': 1, 'hello.world': 1, 'sensor.happy': 1}
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -363,7 +365,35 @@ class TestComponentsGroup(unittest.TestCase):
             self.hass.block_till_done()
 
         assert self.hass.states.entity_ids() == ['group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 1
+        assert self.hass.data[DATA_STATE_CHANGE_TRACKER].async_listeners() \
+            == {'light.bowl': 1}
+
+    def test_reloading_only_changed_groups(self):
+        """Test reloading leaves unchanged and dynamic groups alone."""
+        assert setup_component(self.hass, 'group', {'group': {
+            'first_group': 'light.Bowl',
+            'second_group': 'light.Bowl',
+        }})
+        group.set_group(self.hass, 'dynamic', entity_ids=['light.Ceiling'])
+        self.hass.block_till_done()
+        first = self.hass.states.get('group.first_group')
+
+        with patch('homeassistant.config.load_yaml_config_file', return_value={
+            'group': {
+                'first_group': 'light.Bowl',
+                'second_group': {
+                    'name': 'Second',
+                    'entities': 'light.Ceiling',
+                }}}):
+            group.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert self.hass.states.get('group.first_group') is first
+        second = self.hass.states.get('group.second_group')
+        assert second.name == 'Second'
+        assert second.attributes['entity_id'] == ('light.ceiling',)
+        assert second.attributes['order'] == 1
+        assert self.hass.states.get('group.dynamic') is not None
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -5,12 +5,13 @@ from unittest.mock import patch
 
 import pytest
 
-from homeassistant.core import callback
-from homeassistant.const import MATCH_ALL
+from homeassistant.core import Event, callback
+from homeassistant.const import EVENT_TIME_CHANGED, MATCH_ALL
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    States, StateAttributes, Events)
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -201,3 +202,139 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+def test_saving_state_batch(hass_recorder):
+    """Test saving states written in a batch once."""
+    hass = hass_recorder({'exclude': {'domains': 'test2'}})
+    attributes = {'test_attr': 5}
+    hass.states.set_many([
+        ('test.recorder', 'on', attributes),
+        ('test.other', 'off'),
+        ('test2.recorder', 'on'),
+    ])
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        states = [st.to_native() for st in session.query(States)]
+        assert session.query(Events).filter_by(
+            event_type='state_changed_batch').count() == 0
+
+    assert len(states) == 2
+    assert hass.states.get('test.recorder') in states
+    assert hass.states.get('test.other') in states
+
+
+def test_saving_states_in_one_batch(hass_recorder):
+    """Test queued states are committed together and linked to events."""
+    hass = hass_recorder({'commit_interval': 30})
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(instance, '_save_events',
+                      wraps=instance._save_events) as save_events:
+        for idx in range(5):
+            hass.states.set('test.batch_{}'.format(idx), 'on')
+        hass.block_till_done()
+        instance.block_till_done()
+
+    assert save_events.call_count == 1
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+        for state in states:
+            assert session.query(Events).get(state.event_id) is not None
+
+
+def test_saving_batch_retried(hass_recorder):
+    """Test the whole batch is saved again after a connection error."""
+    from sqlalchemy.exc import OperationalError
+
+    hass = hass_recorder()
+    failures = [OperationalError('insert', {}, 'database is locked')]
+    from_event = Events.from_event
+
+    def flaky_from_event(event):
+        """Fail to create the first event once."""
+        if failures:
+            raise failures.pop()
+        return from_event(event)
+
+    with patch.object(Events, 'from_event', side_effect=flaky_from_event), \
+            patch('homeassistant.components.recorder.time.sleep'):
+        hass.states.set('test.first', 'on')
+        hass.states.set('test.second', 'on')
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+def test_saving_shared_attributes(hass_recorder):
+    """Test states with the same attributes share them."""
+    hass = hass_recorder()
+    attributes = {'unit_of_measurement': 'W', 'friendly_name': 'Power'}
+
+    for power in range(3):
+        hass.states.set('sensor.power', power, attributes)
+        hass.block_till_done()
+    hass.states.set('sensor.power', 3)
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        states = [state.to_native() for state in session.query(States)]
+        assert session.query(StateAttributes).count() == 2
+        assert session.query(States).filter(
+            States.attributes.isnot(None)).count() == 0
+
+    assert [state.attributes for state in states] == \
+        [attributes, attributes, attributes, {}]
+
+
+def test_queue_high_water(hass_recorder):
+    """Test events are filtered and dropped before they are queued."""
+    hass = hass_recorder()
+    instance = Recorder(hass, keep_days=1, purge_interval=0, uri='sqlite://',
+                        include={}, exclude={'event_types': ['skipped']},
+                        queue_high_water=4)
+
+    instance.event_listener(Event(EVENT_TIME_CHANGED))
+    instance.event_listener(Event('skipped'))
+    assert instance.queue.qsize() == 0
+
+    for _ in range(6):
+        instance.event_listener(Event('test'))
+    assert instance.queue.qsize() == 4
+    assert instance.dropped_events == 2
+
+    # Events are queued again once the queue drained to half
+    instance.queue.get()
+    instance.event_listener(Event('test'))
+    assert instance.queue.qsize() == 3
+    instance.queue.get()
+    instance.event_listener(Event('test'))
+    assert instance.queue.qsize() == 3
+
+    assert instance.dropped_events == 3
+    assert instance.metrics()['dropped_events'] == 3
+
+
+def test_recorder_metrics(hass_recorder):
+    """Test the commit rate and latency are measured."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    for idx in range(3):
+        hass.states.set('test.metrics', idx)
+    hass.block_till_done()
+    instance.block_till_done()
+
+    metrics = instance.metrics()
+    assert metrics['queue_depth'] == 0
+    assert metrics['dropped_events'] == 0
+    assert metrics['commit_latency'] >= 0
+    assert metrics['commits_per_minute'] >= 1
+    assert metrics['events_per_second'] > 0
@@ -63,6 +63,20 @@ class TestStates(unittest.TestCase):
         })
         assert state == States.from_event(event).to_native()
 
+    def test_from_event_state_changed_data(self):
+        """Test the states of state changes are not stored in the event."""
+        event = ha.Event(EVENT_STATE_CHANGED, {
+            'entity_id': 'sensor.temperature',
+            'old_state': None,
+            'new_state': ha.State('sensor.temperature', '18'),
+        })
+
+        assert Events.from_event(event).to_native().data == {
+            'entity_id': 'sensor.temperature',
+            'old_state': None,
+            'new_state': {},
+        }
+
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
         event = ha.Event(EVENT_STATE_CHANGED, {
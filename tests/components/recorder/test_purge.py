@@ -2,11 +2,13 @@
 import json
 from datetime import datetime, timedelta
 import unittest
+from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    States, StateAttributes, Events)
 from homeassistant.components.recorder.util import session_scope
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -146,6 +148,61 @@ class TestRecorderPurge(unittest.TestCase):
             # no state to protect, now we should only have 2 events left
             self.assertEqual(events.count(), 2)
 
+    def test_purge_in_batches(self):
+        """Test purging a few rows at a time until done."""
+        self._add_test_events()
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with patch('homeassistant.components.recorder.purge.'
+                   'PURGE_BATCH_SIZE', 1), \
+                patch('homeassistant.components.recorder.purge.'
+                      'PURGE_TIME_BUDGET', 0):
+            runs = 1
+            while not purge_old_data(instance, 4, repack=False):
+                runs += 1
+
+        assert runs > 1
+
+        with session_scope(hass=self.hass) as session:
+            self.assertEqual(session.query(States).count(), 3)
+            self.assertEqual(session.query(Events).filter(
+                Events.event_type.like("EVENT_TEST%")).count(), 3)
+
+    def test_purge_orphaned_attributes(self):
+        """Test deleting attributes no state refers to anymore."""
+        eleven_days_ago = datetime.now() - timedelta(days=11)
+        instance = self.hass.data[DATA_INSTANCE]
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        with session_scope(hass=self.hass) as session:
+            session.query(States).delete()
+            used = StateAttributes(hash=1, shared_attrs='{"used": 1}')
+            orphan = StateAttributes(hash=2, shared_attrs='{"orphan": 1}')
+            session.add_all([used, orphan])
+            session.flush()
+            orphan_id = orphan.attributes_id
+
+            for idx, attributes in enumerate((orphan, used)):
+                session.add(States(
+                    entity_id='test.recorder',
+                    domain='test',
+                    state='on',
+                    attributes_id=attributes.attributes_id,
+                    last_changed=eleven_days_ago,
+                    last_updated=eleven_days_ago,
+                    created=eleven_days_ago,
+                ))
+
+        instance.attributes_ids[2] = orphan_id
+        purge_old_data(instance, 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            assert [attributes.shared_attrs for attributes
+                    in session.query(StateAttributes)] == ['{"used": 1}']
+        assert not instance.attributes_ids
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {'keep_days': 4}
@@ -242,6 +242,17 @@ def test_api_get_components(hass, mock_api_client):
     assert set(result) == hass.config.components
 
 
+@asyncio.coroutine
+def test_api_get_executors(hass, mock_api_client):
+    """Test the return of the executor pool metrics."""
+    yield from hass.async_add_job(lambda: None)
+
+    resp = yield from mock_api_client.get(const.URL_API_EXECUTORS)
+    result = yield from resp.json()
+    assert set(result['pools']) == {'default', 'db', 'cpu'}
+    assert result['pools']['default']['run']['count'] >= 1
+
+
 @asyncio.coroutine
 def test_api_get_event_listeners(hass, mock_api_client):
     """Test if we can get the list of events being listened for."""
@@ -0,0 +1,57 @@
+"""The tests for the event bus statistics component."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.components import event_stats
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+@asyncio.coroutine
+def test_snapshot_state(hass):
+    """Test the statistics are summarized in a state."""
+    yield from async_setup_component(hass, 'http', {})
+    assert (yield from async_setup_component(hass, event_stats.DOMAIN, {
+        event_stats.DOMAIN: {'scan_interval': 10}
+    }))
+
+    state = hass.states.get(event_stats.ENTITY_ID)
+    assert state.state == '0'
+
+    for _ in range(50):
+        hass.bus.async_fire('test_event')
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    yield from hass.async_block_till_done()
+
+    state = hass.states.get(event_stats.ENTITY_ID)
+    assert state.attributes[event_stats.ATTR_EVENTS]['test_event'] == 5
+
+
+@asyncio.coroutine
+def test_api_get_stats(hass, test_client):
+    """Test retrieving the statistics through the API."""
+    yield from async_setup_component(hass, 'http', {})
+    yield from async_setup_component(hass, event_stats.DOMAIN, {})
+    client = yield from test_client(hass.http.app)
+
+    hass.bus.async_fire('test_event')
+
+    resp = yield from client.get('/api/event_stats')
+    assert resp.status == 200
+    data = yield from resp.json()
+    assert data['events']['test_event']['count'] == 1
+
+
+@asyncio.coroutine
+def test_api_stats_not_enabled(hass, test_client):
+    """Test the API when statistics are disabled."""
+    yield from async_setup_component(hass, 'http', {})
+    yield from async_setup_component(hass, event_stats.DOMAIN, {})
+    client = yield from test_client(hass.http.app)
+    hass.bus.async_disable_stats()
+
+    resp = yield from client.get('/api/event_stats')
+    assert resp.status == 404
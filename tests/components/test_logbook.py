@@ -1,5 +1,6 @@
 """The tests for the logbook component."""
 # pylint: disable=protected-access,invalid-name
+import json
 import logging
 from datetime import timedelta
 import unittest
@@ -10,7 +11,8 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
     ATTR_HIDDEN, STATE_NOT_HOME, STATE_ON, STATE_OFF)
 import homeassistant.util.dt as dt_util
-from homeassistant.components import logbook
+from homeassistant.components import logbook, recorder
+from homeassistant.components.recorder.models import Events
 from homeassistant.setup import setup_component
 
 from tests.common import (
@@ -87,6 +89,30 @@ class TestComponentLogbook(unittest.TestCase):
 
         self.assertEqual(0, len(calls))
 
+    def test_get_events_from_states_table(self):
+        """Test state changes are rebuilt from the recorded states."""
+        self.hass.states.set('switch.bla', 'off')
+        self.hass.block_till_done()
+        self.hass.states.set('switch.bla', 'on', {'friendly_name': 'Bla'})
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            event_data = [json.loads(event.event_data) for event in
+                          session.query(Events).filter_by(
+                              event_type=EVENT_STATE_CHANGED)]
+        assert event_data[-1] == {
+            'entity_id': 'switch.bla', 'old_state': {}, 'new_state': {}}
+
+        start = dt_util.utcnow() - timedelta(hours=1)
+        entries = list(logbook._get_events(
+            self.hass, {}, start, start + timedelta(hours=2)))
+        entries = [entry for entry in entries if entry.domain == 'switch']
+
+        self.assertEqual(1, len(entries))
+        self.assert_entry(entries[0], name='Bla', message='turned on',
+                          domain='switch', entity_id='switch.bla')
+
     def test_humanify_filter_sensor(self):
         """Test humanify filter too frequent sensor values."""
         entity_id = 'sensor.bla'
@@ -207,3 +207,29 @@ class TestScriptComponent(unittest.TestCase):
 
         assert self.hass.states.get("script.test2") is not None
         assert self.hass.services.has_service(script.DOMAIN, 'test2')
+
+    def test_reload_keeps_unchanged_scripts(self):
+        """Verify that reloading keeps running scripts that did not change."""
+        sequence = [{'delay': {'seconds': 5}}]
+        assert setup_component(self.hass, 'script', {
+            'script': {
+                'test': {'sequence': sequence},
+                'other': {'sequence': sequence},
+            }
+        })
+
+        script.turn_on(self.hass, ENTITY_ID)
+        self.hass.block_till_done()
+        assert script.is_on(self.hass, ENTITY_ID)
+
+        with patch('homeassistant.config.load_yaml_config_file', return_value={
+                'script': {
+                    'test': {'sequence': sequence},
+                    'other': {'alias': 'Other', 'sequence': sequence},
+                }}):
+            script.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert script.is_on(self.hass, ENTITY_ID)
+        assert self.hass.states.get('script.other').name == 'Other'
+        assert self.hass.services.has_service(script.DOMAIN, 'other')
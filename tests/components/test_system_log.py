@@ -234,3 +234,19 @@ def test_netdisco_path(hass, test_client):
         log_error_from_test_path('venv_path/netdisco/disco_component.py')
         log = (yield from get_error_log(hass, test_client, 1))[0]
     assert log['source'] == 'disco_component.py'
+
+
+@asyncio.coroutine
+def test_loop_stalls(hass, test_client):
+    """Test the detected event loop stalls are available via the API."""
+    assert hass.watchdog.threshold == system_log.DEFAULT_STALL_THRESHOLD
+    hass.watchdog.stalls['light.hue'] = {
+        'count': 2, 'blocked': 1.5, 'max': 1}
+
+    client = yield from test_client(hass.http.app)
+    resp = yield from client.get('/api/error/stalls')
+    assert resp.status == 200
+
+    data = yield from resp.json()
+    assert data['sources'] == {
+        'light.hue': {'count': 2, 'blocked': 1.5, 'max': 1}}
@@ -1,6 +1,6 @@
 """Tests for the Home Assistant Websocket API."""
 import asyncio
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from aiohttp import WSMsgType
 from async_timeout import timeout
@@ -8,7 +8,9 @@ import pytest
 
 from homeassistant.core import callback
 from homeassistant.components import websocket_api as wapi, frontend
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.setup import async_setup_component
+from homeassistant.helpers.timeline import DATA_TIMELINE, PHASE_SETUP, Timeline
 
 from tests.common import mock_coro
 
@@ -227,6 +229,42 @@ def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+@asyncio.coroutine
+def test_subscribe_state_changed_batch(hass, websocket_client):
+    """Test a state changed subscription gets the changes of a batch."""
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_SUBSCRIBE_EVENTS,
+        'event_type': 'state_changed'
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['success']
+
+    hass.states.async_set_many([
+        ('light.kitchen', 'on'),
+        ('light.bowl', 'off'),
+    ])
+
+    # The changes of the batch arrive in one message
+    with timeout(3, loop=hass.loop):
+        messages = yield from websocket_client.receive_json()
+
+    for msg in messages:
+        assert msg['id'] == 5
+        assert msg['event']['event_type'] == 'state_changed'
+        assert 'batch' not in msg['event']['data']
+
+    assert [msg['event']['data']['entity_id'] for msg in messages] == \
+        ['light.kitchen', 'light.bowl']
+
+    # Nothing else was forwarded
+    hass.bus.async_fire('state_changed', {'entity_id': 'light.other'})
+    with timeout(3, loop=hass.loop):
+        msg = yield from websocket_client.receive_json()
+    assert msg['event']['data']['entity_id'] == 'light.other'
+
+
 @asyncio.coroutine
 def test_get_states(hass, websocket_client):
     """Test get_states command."""
@@ -290,6 +328,94 @@ def test_get_config(hass, websocket_client):
     assert msg['result'] == hass.config.as_dict()
 
 
+@asyncio.coroutine
+def test_get_event_stats(hass, websocket_client):
+    """Test get_event_stats command."""
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_GET_EVENT_STATS,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert not msg['success']
+    assert msg['error']['code'] == wapi.ERR_NOT_FOUND
+
+    hass.bus.async_enable_stats()
+    hass.bus.async_fire('test_event')
+
+    websocket_client.send_json({
+        'id': 6,
+        'type': wapi.TYPE_GET_EVENT_STATS,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert msg['success']
+    assert msg['result']['events']['test_event']['count'] == 1
+
+
+@asyncio.coroutine
+def test_get_startup_timeline(hass, websocket_client):
+    """Test get_startup_timeline command."""
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_GET_STARTUP_TIMELINE,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert not msg['success']
+    assert msg['error']['code'] == wapi.ERR_NOT_FOUND
+
+    timeline = hass.data[DATA_TIMELINE] = Timeline()
+    timeline.record('light', PHASE_SETUP, timeline.start, timeline.start + 1)
+
+    websocket_client.send_json({
+        'id': 6,
+        'type': wapi.TYPE_GET_STARTUP_TIMELINE,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert msg['success']
+    assert msg['result']['nodes'] == {'light': {PHASE_SETUP: 1}}
+    assert msg['result']['critical_path'] == ['light']
+
+
+@asyncio.coroutine
+def test_get_recorder_metrics(hass, websocket_client):
+    """Test get_recorder_metrics command."""
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_GET_RECORDER_METRICS,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert not msg['success']
+    assert msg['error']['code'] == wapi.ERR_NOT_FOUND
+
+    hass.data[DATA_INSTANCE] = MagicMock()
+    hass.data[DATA_INSTANCE].metrics.return_value = {'queue_depth': 3}
+
+    websocket_client.send_json({
+        'id': 6,
+        'type': wapi.TYPE_GET_RECORDER_METRICS,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['type'] == wapi.TYPE_RESULT
+    assert msg['success']
+    assert msg['result'] == {'queue_depth': 3}
+
+
 @asyncio.coroutine
 def test_get_panels(hass, websocket_client):
     """Test get_panels command."""
@@ -58,6 +58,15 @@ def verify_cleanup():
                     "({}), aborting test run".format(count))
 
 
+@pytest.fixture(scope='session', autouse=True)
+def component_manifest(tmpdir_factory):
+    """Keep the component manifest cache out of the testing config."""
+    path = tmpdir_factory.mktemp('manifest').join('.component_manifest.json')
+
+    with patch('homeassistant.loader.MANIFEST_FILE', str(path)):
+        yield
+
+
 @pytest.fixture
 def hass(loop):
     """Fixture to provide a test instance of HASS."""
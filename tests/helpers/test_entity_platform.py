@@ -6,6 +6,9 @@ from unittest.mock import patch, Mock, MagicMock
 from datetime import timedelta
 
 import homeassistant.loader as loader
+from homeassistant.core import callback
+from homeassistant.const import (
+    ATTR_CHANGES, EVENT_STATE_CHANGED_BATCH, STATE_UNAVAILABLE)
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_component import (
     EntityComponent, DEFAULT_SCAN_INTERVAL)
@@ -15,7 +18,7 @@ import homeassistant.util.dt as dt_util
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, fire_time_changed, mock_registry,
-    MockEntity)
+    MockEntity, mock_coro)
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = "test_domain"
@@ -510,3 +513,72 @@ def test_registry_respect_entity_disabled(hass):
     yield from platform.async_add_entities([entity])
     assert entity.entity_id is None
     assert hass.states.async_entity_ids() == []
+
+
+@asyncio.coroutine
+def test_update_ha_states_batch(hass):
+    """Test writing the states of multiple entities as one batch."""
+    platform = MockEntityPlatform(hass)
+    ent1 = MockEntity(name='one', should_poll=False)
+    ent2 = MockEntity(name='two', should_poll=False)
+    yield from platform.async_add_entities([ent1, ent2])
+
+    batch_events = []
+
+    @callback
+    def batch_listener(event):
+        """Record batch events."""
+        batch_events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED_BATCH, batch_listener)
+
+    ent1._values['available'] = False
+    ent2._values['available'] = False
+    yield from platform.async_update_ha_states()
+    yield from hass.async_block_till_done()
+
+    assert hass.states.get('test_domain.one').state == STATE_UNAVAILABLE
+    assert hass.states.get('test_domain.two').state == STATE_UNAVAILABLE
+    assert len(batch_events) == 1
+    assert len(batch_events[0].data[ATTR_CHANGES]) == 2
+
+    # Entities that fail to update are not written
+    ent1._values['available'] = True
+    ent2._values['available'] = True
+    ent1.async_update = Mock(side_effect=Exception)
+    ent2.async_update = Mock(return_value=mock_coro())
+    yield from platform.async_update_ha_states(force_refresh=True)
+    yield from hass.async_block_till_done()
+
+    assert hass.states.get('test_domain.one').state == STATE_UNAVAILABLE
+    assert hass.states.get('test_domain.two').state != STATE_UNAVAILABLE
+    assert len(batch_events) == 2
+    assert len(batch_events[1].data[ATTR_CHANGES]) == 1
+
+
+@asyncio.coroutine
+def test_polling_writes_states_in_batch(hass):
+    """Test the states of polled entities are written as one batch."""
+    platform = MockEntityPlatform(hass)
+    ent1 = MockEntity(name='one', should_poll=True)
+    ent2 = MockEntity(name='two', should_poll=True)
+    yield from platform.async_add_entities([ent1, ent2])
+
+    batch_events = []
+
+    @callback
+    def batch_listener(event):
+        """Record batch events."""
+        batch_events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED_BATCH, batch_listener)
+
+    ent1._values['available'] = False
+    ent2._values['available'] = False
+    # pylint: disable=protected-access
+    yield from platform._update_entity_states(dt_util.utcnow())
+    yield from hass.async_block_till_done()
+
+    assert hass.states.get('test_domain.one').state == STATE_UNAVAILABLE
+    assert len(batch_events) == 1
+    assert len(batch_events[0].data[ATTR_CHANGES]) == 2
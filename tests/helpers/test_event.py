@@ -10,9 +10,13 @@ import pytest
 from homeassistant.core import callback
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import (
+    EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.helpers.event import (
+    DATA_STATE_CHANGE_TRACKER,
     async_call_later,
+    async_track_point_in_utc_time,
+    async_track_state_change,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
@@ -28,7 +32,8 @@ from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant, fire_time_changed
+from tests.common import (
+    get_test_home_assistant, fire_time_changed, async_fire_time_changed)
 from unittest.mock import patch
 
 
@@ -195,6 +200,26 @@ class TestEventHelpers(unittest.TestCase):
         self.assertEqual(5, len(wildcard_runs))
         self.assertEqual(6, len(wildercard_runs))
 
+    def test_track_state_change_duplicate_entity_ids(self):
+        """Test an entity listed twice runs the action once."""
+        runs = []
+
+        @ha.callback
+        def run_callback(entity_id, old_state, new_state):
+            runs.append(entity_id)
+
+        remove = track_state_change(
+            self.hass, ['light.bowl', 'light.Bowl'], run_callback)
+
+        self.hass.states.set('light.bowl', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.bowl'], runs)
+
+        remove()
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(['light.bowl'], runs)
+
     def test_track_template(self):
         """Test tracking template."""
         specific_runs = []
@@ -663,3 +688,98 @@ def test_async_call_later(hass):
     assert p_action is action
     assert p_point == now + timedelta(seconds=3)
     assert remove is mock()
+
+
+@asyncio.coroutine
+def test_async_track_point_in_utc_time_order(hass):
+    """Test point in time listeners run in order of their due time."""
+    base = datetime(2017, 12, 19, 15, 40, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append('third')),
+        base + timedelta(seconds=20))
+    async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append('first')),
+        base + timedelta(seconds=5))
+    async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append('second')),
+        base + timedelta(seconds=5))
+
+    async_fire_time_changed(hass, base + timedelta(seconds=10))
+    yield from hass.async_block_till_done()
+    assert runs == ['first', 'second']
+
+    async_fire_time_changed(hass, base + timedelta(seconds=30))
+    yield from hass.async_block_till_done()
+    assert runs == ['first', 'second', 'third']
+
+
+@asyncio.coroutine
+def test_async_track_point_in_utc_time_single_listener(hass):
+    """Test all point in time listeners share one time changed listener."""
+    base = datetime(2017, 12, 19, 15, 40, 0, tzinfo=dt_util.UTC)
+    init_count = hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0)
+    runs = []
+
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda now: runs.append(1)),
+            base + timedelta(seconds=sec))
+        for sec in range(1000)
+    ]
+
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == init_count + 1
+
+    for unsub in unsubs[:500]:
+        unsub()
+        # Cancelling twice is a no-op
+        unsub()
+
+    async_fire_time_changed(hass, base + timedelta(seconds=1000))
+    yield from hass.async_block_till_done()
+    assert len(runs) == 500
+    assert hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0) == \
+        init_count
+
+    # Cancelling after it ran is a no-op
+    unsubs[-1]()
+
+
+@asyncio.coroutine
+def test_async_track_state_change_index(hass):
+    """Test state listeners only run for the entities they track."""
+    runs = []
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    unsub_light = async_track_state_change(
+        hass, 'light.Bowl', callback(
+            lambda entity_id, old, new: runs.append(('light', entity_id))))
+    async_track_state_change(
+        hass, MATCH_ALL, callback(
+            lambda entity_id, old, new: runs.append(('all', entity_id))))
+    async_track_state_change(
+        hass, ['light.bowl', 'switch.fan'], callback(
+            lambda entity_id, old, new: runs.append(('both', entity_id))))
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_count + 1
+    assert hass.data[DATA_STATE_CHANGE_TRACKER].async_listeners() == {
+        'light.bowl': 2, 'switch.fan': 1, MATCH_ALL: 1}
+
+    hass.states.async_set('light.bowl', 'on')
+    yield from hass.async_block_till_done()
+    assert runs == [('light', 'light.bowl'), ('all', 'light.bowl'),
+                    ('both', 'light.bowl')]
+
+    runs.clear()
+    hass.states.async_set('switch.fan', 'on')
+    hass.states.async_set('sensor.temp', '20')
+    yield from hass.async_block_till_done()
+    assert runs == [('all', 'switch.fan'), ('both', 'switch.fan'),
+                    ('all', 'sensor.temp')]
+
+    unsub_light()
+    # Removing twice is a no-op
+    unsub_light()
+    assert hass.data[DATA_STATE_CHANGE_TRACKER].async_listeners() == {
+        'light.bowl': 1, 'switch.fan': 1, MATCH_ALL: 1}
@@ -4,6 +4,7 @@ from collections import OrderedDict
 import unittest
 
 from homeassistant import helpers
+from homeassistant.helpers import template
 
 from tests.common import get_test_home_assistant
 
@@ -48,3 +49,13 @@ class TestHelpers(unittest.TestCase):
             (None, 1),
             ('hello 2', config['zone Hallo'][1]),
         ] == list(helpers.config_per_platform(config, 'zone'))
+
+    def test_config_hash(self):
+        """Test hashing validated configurations."""
+        config = {'alias': 'hello', 'value': template.Template('{{ 1 }}')}
+
+        assert helpers.config_hash(config) == helpers.config_hash({
+            'value': template.Template('{{ 1 }}'), 'alias': 'hello'})
+        assert helpers.config_hash(config) != helpers.config_hash({
+            'alias': 'hello', 'value': template.Template('{{ 2 }}')})
+        assert helpers.config_hash({1: 'one', 'two': 2})
@@ -0,0 +1,77 @@
+"""Test the startup timeline helper."""
+from unittest.mock import MagicMock
+
+from homeassistant.helpers import timeline as tl
+
+
+def _timeline():
+    """Create a timeline of a light waiting for hue and the http server."""
+    timeline = tl.Timeline()
+    start = timeline.start
+    timeline.record('http', tl.PHASE_SETUP, start, start + 2)
+    timeline.record('light.hue', tl.PHASE_IMPORT, start, start + 1)
+    timeline.record('light.hue', tl.PHASE_FIRST_UPDATE, start + 1, start + 5)
+    timeline.record('light', tl.PHASE_SETUP, start + 2, start + 6)
+    timeline.record('sensor', tl.PHASE_SETUP, start, start + 3)
+    timeline.add_waits('light', ['http', 'light.hue'])
+    return timeline
+
+
+def test_critical_path():
+    """Test following the waits that ended last."""
+    assert _timeline().critical_path() == ['light.hue', 'light']
+
+
+def test_critical_path_cycle():
+    """Test waits in a cycle do not loop forever."""
+    timeline = _timeline()
+    timeline.add_waits('light.hue', ['light'])
+    assert timeline.critical_path() == ['light.hue', 'light']
+
+
+def test_as_dict():
+    """Test summarizing the phases per node."""
+    result = _timeline().as_dict()
+
+    assert result['nodes']['light.hue'] == {
+        tl.PHASE_IMPORT: 1,
+        tl.PHASE_FIRST_UPDATE: 4,
+    }
+    assert result['waits'] == {'light': ['http', 'light.hue']}
+    assert result['duration'] is None
+
+
+def test_as_trace():
+    """Test the critical path is highlighted in the trace."""
+    events = _timeline().as_trace()['traceEvents']
+    critical = {event['tid'] for event in events if 'cname' in event}
+
+    assert critical == {'light', 'light.hue'}
+    assert events[0] == {
+        'name': tl.PHASE_SETUP,
+        'cat': 'http',
+        'ph': 'X',
+        'pid': 1,
+        'tid': 'http',
+        'ts': 0,
+        'dur': 2000000,
+        'args': {'critical': False},
+    }
+
+
+def test_timed_without_timeline():
+    """Test timing is skipped when no timeline is recorded."""
+    hass = MagicMock(data={})
+
+    with tl.async_timed(hass, 'light', tl.PHASE_SETUP):
+        pass
+    tl.async_add_waits(hass, 'light', ['http'])
+
+    timeline = hass.data[tl.DATA_TIMELINE] = tl.Timeline()
+
+    with tl.async_timed(hass, 'light', tl.PHASE_SETUP):
+        pass
+    tl.async_add_waits(hass, 'light', ['http'])
+
+    assert [span[:2] for span in timeline.spans] == [('light', 'setup')]
+    assert timeline.waits == {'light': {'http'}}
@@ -0,0 +1,129 @@
+"""Test the index of state based triggers."""
+import asyncio
+
+from homeassistant.helpers.event import DATA_STATE_CHANGE_TRACKER
+from homeassistant.helpers.trigger_index import async_get_trigger_index
+
+
+def _recorder(calls, name):
+    """Return an action recording its name."""
+    def action(entity_id, from_s, to_s):
+        """Record the call."""
+        calls.append((name, entity_id, to_s.state))
+    return action
+
+
+@asyncio.coroutine
+def test_numeric_thresholds(hass):
+    """Test only the triggers whose range was entered are called."""
+    index = async_get_trigger_index(hass)
+    calls = []
+    index.async_track_numeric(
+        ['sensor.temp'], _recorder(calls, 'cold'), below=10)
+    index.async_track_numeric(
+        ['sensor.temp'], _recorder(calls, 'mild'), below=20, above=10)
+    index.async_track_numeric(
+        ['sensor.temp'], _recorder(calls, 'hot'), above=20)
+
+    # The first value calls the triggers it matches
+    hass.states.async_set('sensor.temp', '15')
+    yield from hass.async_block_till_done()
+    assert calls == [('mild', 'sensor.temp', '15')]
+
+    hass.states.async_set('sensor.temp', '18')
+    yield from hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.states.async_set('sensor.temp', '25')
+    hass.states.async_set('sensor.temp', '5')
+    yield from hass.async_block_till_done()
+    assert calls[1:] == [
+        ('hot', 'sensor.temp', '25'),
+        ('cold', 'sensor.temp', '5'),
+    ]
+
+    # A value that is not a number resets the ranges
+    hass.states.async_set('sensor.temp', 'unknown')
+    hass.states.async_set('sensor.temp', '4')
+    yield from hass.async_block_till_done()
+    assert calls[3:] == [('cold', 'sensor.temp', '4')]
+
+
+@asyncio.coroutine
+def test_numeric_custom_value(hass):
+    """Test triggers reading their own value."""
+    index = async_get_trigger_index(hass)
+    calls = []
+    index.async_track_numeric(
+        ['sensor.temp'], _recorder(calls, 'attr'), below=10,
+        async_value=lambda entity_id, state: state.attributes.get('value'))
+
+    hass.states.async_set('sensor.temp', '50', {'value': 12})
+    hass.states.async_set('sensor.temp', '50', {'value': 8})
+    yield from hass.async_block_till_done()
+    assert calls == [('attr', 'sensor.temp', '50')]
+
+
+@asyncio.coroutine
+def test_state_triggers(hass):
+    """Test state triggers are matched on from and to state."""
+    index = async_get_trigger_index(hass)
+    calls = []
+    index.async_track_state(
+        ['light.kitchen'], _recorder(calls, 'on'), to_state='on')
+    index.async_track_state(
+        ['light.kitchen'], _recorder(calls, 'off_to_on'), 'off', 'on')
+    index.async_track_state(['light.kitchen'], _recorder(calls, 'any'))
+
+    hass.states.async_set('light.kitchen', 'on')
+    yield from hass.async_block_till_done()
+    assert [call[0] for call in calls] == ['on', 'any']
+
+    hass.states.async_set('light.kitchen', 'off')
+    hass.states.async_set('light.kitchen', 'on')
+    yield from hass.async_block_till_done()
+    assert [call[0] for call in calls[2:]] == ['any', 'on', 'off_to_on', 'any']
+
+
+@asyncio.coroutine
+def test_remove_triggers(hass):
+    """Test the entity listener is removed with the last trigger."""
+    index = async_get_trigger_index(hass)
+    calls = []
+    remove_state = index.async_track_state(
+        ['light.kitchen'], _recorder(calls, 'state'))
+    remove_numeric = index.async_track_numeric(
+        ['light.kitchen'], _recorder(calls, 'numeric'), above=1)
+    tracker = hass.data[DATA_STATE_CHANGE_TRACKER]
+    assert tracker.async_listeners() == {'light.kitchen': 1}
+
+    remove_state()
+    hass.states.async_set('light.kitchen', '5')
+    yield from hass.async_block_till_done()
+    assert calls == [('numeric', 'light.kitchen', '5')]
+
+    remove_numeric()
+    assert tracker.async_listeners() == {}
+
+
+@asyncio.coroutine
+def test_duplicate_entity_ids(hass):
+    """Test an entity listed twice runs the trigger once."""
+    index = async_get_trigger_index(hass)
+    calls = []
+    remove_state = index.async_track_state(
+        ['light.kitchen', 'light.Kitchen'], _recorder(calls, 'state'))
+    remove_numeric = index.async_track_numeric(
+        ['light.kitchen', 'light.kitchen'], _recorder(calls, 'numeric'),
+        above=1)
+
+    hass.states.async_set('light.kitchen', '5')
+    yield from hass.async_block_till_done()
+    assert calls == [
+        ('state', 'light.kitchen', '5'),
+        ('numeric', 'light.kitchen', '5'),
+    ]
+
+    remove_state()
+    remove_numeric()
+    assert hass.data[DATA_STATE_CHANGE_TRACKER].async_listeners() == {}
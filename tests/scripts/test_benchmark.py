@@ -0,0 +1,38 @@
+"""Test the benchmark script."""
+from unittest.mock import patch
+
+from homeassistant.scripts import benchmark
+
+
+def test_run_iterations():
+    """Test summarizing the runtimes of a benchmark."""
+    @benchmark.operations(100, 'events')
+    def bench(hass):
+        """Do nothing."""
+
+    with patch('homeassistant.scripts.benchmark.run_benchmark',
+               side_effect=[4, 1, 3, 2, 5]):
+        result = benchmark.run_iterations(bench, None, 5)
+
+    assert result['median'] == 3
+    assert result['p95'] == 5
+    assert result['min'] == 1
+    assert result['max'] == 5
+    assert result['ops_per_sec'] == 100 / 3
+    assert result['unit'] == 'events'
+
+
+def test_compare_results():
+    """Test comparing results against a baseline."""
+    baseline = {'benchmarks': {
+        'fast': {'median': 1.0},
+        'slow': {'median': 1.0},
+    }}
+    results = {'benchmarks': {
+        'fast': {'median': 1.05},
+        'slow': {'median': 1.5},
+        'new': {'median': 2.0},
+    }}
+
+    assert benchmark.compare_results(baseline, results, 10)
+    assert not benchmark.compare_results(baseline, results, 60)
@@ -7,6 +7,8 @@ import logging
 
 import homeassistant.config as config_util
 from homeassistant import bootstrap
+from homeassistant.helpers.timeline import (
+    DATA_TIMELINE, PHASE_SETUP, TIMELINE_FILE, async_timed)
 import homeassistant.util.dt as dt_util
 
 from tests.common import patch_yaml_files, get_test_config_dir
@@ -27,6 +29,7 @@ _LOGGER = logging.getLogger(__name__)
 @patch('os.access', Mock(return_value=True))
 @patch('homeassistant.bootstrap.async_enable_logging',
        Mock(return_value=True))
+@patch('homeassistant.bootstrap.save_json', Mock())
 def test_from_config_file(hass):
     """Test with configuration file."""
     components = set(['browser', 'conversation', 'script'])
@@ -52,3 +55,33 @@ def test_home_assistant_core_config_validation(hass):
         }
     }, hass)
     assert result is None
+
+
+@asyncio.coroutine
+@patch('homeassistant.bootstrap.async_enable_logging', Mock())
+@patch('homeassistant.bootstrap.async_register_signal_handling', Mock())
+@patch('homeassistant.bootstrap.conf_util.process_ha_config_upgrade', Mock())
+def test_startup_timeline(hass):
+    """Test the phases of startup are recorded and saved."""
+    with patch('homeassistant.bootstrap.save_json') as mock_save, \
+            patch.object(bootstrap._LOGGER, 'isEnabledFor',
+                         return_value=True):
+        yield from bootstrap.async_from_config_dict({
+            'homeassistant': {},
+            'script': {},
+        }, hass)
+
+    timeline = hass.data[DATA_TIMELINE]
+    assert PHASE_SETUP in timeline.as_dict()['nodes']['script']
+    assert 'script' in timeline.critical_path()
+
+    # Nothing is recorded after startup
+    spans = len(timeline.spans)
+    with async_timed(hass, 'light', PHASE_SETUP):
+        pass
+    assert len(timeline.spans) == spans
+
+    assert len(mock_save.mock_calls) == 1
+    filename, trace = mock_save.mock_calls[0][1]
+    assert filename == hass.config.path(TIMELINE_FILE)
+    assert trace['traceEvents']
@@ -18,6 +18,7 @@ from homeassistant.const import (
 from homeassistant.util import location as location_util, dt as dt_util
 from homeassistant.util.yaml import SECRET_YAML
 from homeassistant.util.async import run_coroutine_threadsafe
+from homeassistant.util.executor import POOL_CPU, job_pool
 from homeassistant.helpers.entity import Entity
 from homeassistant.components.config.group import (
     CONFIG_PATH as GROUP_CONFIG_PATH)
@@ -398,6 +399,8 @@ class TestConfig(unittest.TestCase):
                 CONF_UNIT_SYSTEM: CONF_UNIT_SYSTEM_IMPERIAL,
                 'time_zone': 'America/New_York',
                 'whitelist_external_dirs': '/tmp',
+                'setup_max_parallel': 5,
+                'setup_timeout': 60,
             }), self.hass.loop).result()
 
         assert self.hass.config.latitude == 60
@@ -408,6 +411,31 @@ class TestConfig(unittest.TestCase):
         assert self.hass.config.time_zone.zone == 'America/New_York'
         assert len(self.hass.config.whitelist_external_dirs) == 2
         assert '/tmp' in self.hass.config.whitelist_external_dirs
+        assert self.hass.config.setup_max_parallel == 5
+        assert self.hass.config.setup_timeout == 60
+
+    def test_loading_configuration_executors(self):
+        """Test loading executor pools from the core config."""
+        run_coroutine_threadsafe(
+            config_util.async_process_ha_core_config(self.hass, {
+                'executors': {
+                    'cloud': {
+                        'max_workers': 2,
+                        'integrations': ['sensor.yr', 'darksky'],
+                    },
+                    'db': {
+                        'integrations': 'history_stats',
+                    },
+                },
+            }), self.hass.loop).result()
+
+        pools = self.hass.executors.as_dict()
+        assert pools['pools']['cloud']['max_workers'] == 2
+        assert pools['assignments'] == {
+            'sensor.yr': 'cloud',
+            'darksky': 'cloud',
+            'history_stats': 'db',
+        }
 
     def test_loading_configuration_temperature_unit(self):
         """Test backward compatibility when loading core config."""
@@ -689,3 +717,8 @@ def test_merge_customize(hass):
 
     assert hass.data[config_util.DATA_CUSTOMIZE].get('b.b') == \
         {'friendly_name': 'BB'}
+
+
+def test_load_yaml_config_file_pool():
+    """Test parsing the configuration runs in the CPU bound pool."""
+    assert job_pool(config_util.load_yaml_config_file) == POOL_CPU
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import os
+import threading
 import unittest
 from unittest.mock import patch, MagicMock, sentinel
 from datetime import datetime, timedelta
@@ -16,11 +17,14 @@ from homeassistant.exceptions import (InvalidEntityFormatError,
                                       InvalidStateError)
 from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import job_pool
 from homeassistant.util.unit_system import (METRIC_SYSTEM)
 from homeassistant.const import (
     __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
     ATTR_NOW, EVENT_TIME_CHANGED, EVENT_HOMEASSISTANT_STOP,
-    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED)
+    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED,
+    EVENT_STATE_CHANGED_BATCH, ATTR_BATCH, ATTR_CHANGES, EVENT_CALL_SERVICE,
+    EVENT_SERVICE_EXECUTED)
 
 from tests.common import get_test_home_assistant
 
@@ -51,7 +55,7 @@ def test_async_add_job_schedule_coroutinefunction(mock_iscoro):
 
     ha.HomeAssistant.async_add_job(hass, job)
     assert len(hass.loop.call_soon.mock_calls) == 0
-    assert len(hass.loop.create_task.mock_calls) == 1
+    assert hass.loop.create_task.call_count == 1
     assert len(hass.add_job.mock_calls) == 0
 
 
@@ -64,7 +68,7 @@ def test_async_add_job_add_threaded_job_to_pool(mock_iscoro):
     ha.HomeAssistant.async_add_job(hass, job)
     assert len(hass.loop.call_soon.mock_calls) == 0
     assert len(hass.loop.create_task.mock_calls) == 0
-    assert len(hass.loop.run_in_executor.mock_calls) == 1
+    assert hass.loop.run_in_executor.call_count == 1
 
 
 def test_async_run_job_calls_callback():
@@ -129,30 +133,42 @@ class TestHomeAssistant(unittest.TestCase):
     def test_pending_sheduler(self):
         """Add a coro to pending tasks."""
         call_count = []
+        release = asyncio.Event(loop=self.hass.loop)
 
         @asyncio.coroutine
         def test_coro():
             """Test Coro."""
+            yield from release.wait()
             call_count.append('call')
 
         for _ in range(3):
             self.hass.add_job(test_coro())
 
+        @asyncio.coroutine
+        def wait_pending_tasks():
+            """Wait for the scheduled tasks to finish."""
+            yield from asyncio.sleep(0, loop=self.hass.loop)
+            pending = list(self.hass._pending_tasks)
+            assert len(pending) == 3
+            release.set()
+            yield from asyncio.wait(pending, loop=self.hass.loop)
+
         run_coroutine_threadsafe(
-            asyncio.wait(self.hass._pending_tasks, loop=self.hass.loop),
-            loop=self.hass.loop
-        ).result()
+            wait_pending_tasks(), loop=self.hass.loop).result()
 
-        assert len(self.hass._pending_tasks) == 3
+        # Finished tasks are no longer tracked
+        assert len(self.hass._pending_tasks) == 0
         assert len(call_count) == 3
 
     def test_async_add_job_pending_tasks_coro(self):
         """Add a coro to pending tasks."""
         call_count = []
+        release = asyncio.Event(loop=self.hass.loop)
 
         @asyncio.coroutine
         def test_coro():
             """Test Coro."""
+            yield from release.wait()
             call_count.append('call')
 
         for _ in range(2):
@@ -168,15 +184,19 @@ class TestHomeAssistant(unittest.TestCase):
             wait_finish_callback(), self.hass.loop).result()
 
         assert len(self.hass._pending_tasks) == 2
+        self.hass.loop.call_soon_threadsafe(release.set)
         self.hass.block_till_done()
         assert len(call_count) == 2
+        assert len(self.hass._pending_tasks) == 0
 
     def test_async_add_job_pending_tasks_executor(self):
         """Run an executor in pending tasks."""
         call_count = []
+        release = threading.Event()
 
         def test_executor():
             """Test executor."""
+            release.wait()
             call_count.append('call')
 
         @asyncio.coroutine
@@ -192,8 +212,10 @@ class TestHomeAssistant(unittest.TestCase):
             wait_finish_callback(), self.hass.loop).result()
 
         assert len(self.hass._pending_tasks) == 2
+        release.set()
         self.hass.block_till_done()
         assert len(call_count) == 2
+        assert len(self.hass._pending_tasks) == 0
 
     def test_async_add_job_pending_tasks_callback(self):
         """Run a callback in pending tasks."""
@@ -283,6 +305,26 @@ class TestEventBus(unittest.TestCase):
         """Stop down stuff we started."""
         self.hass.stop()
 
+    def test_fire_from_thread_keeps_order(self):
+        """Test events and jobs from a thread run in submission order."""
+        calls = []
+
+        @ha.callback
+        def listener(event):
+            """Record event."""
+            calls.append(event.data['idx'])
+
+        self.bus.listen('test_event', listener)
+
+        for idx in range(100):
+            self.bus.fire('test_event', {'idx': idx})
+            self.hass.add_job(ha.callback(lambda: calls.append('job')))
+
+        self.hass.block_till_done()
+
+        assert calls == [
+            item for idx in range(100) for item in (idx, 'job')]
+
     def test_add_remove_listener(self):
         """Test remove_listener method."""
         self.hass.allow_pool = False
@@ -506,6 +548,29 @@ class TestStateMachine(unittest.TestCase):
         self.assertEqual(1, len(ent_ids))
         self.assertTrue('light.bowl' in ent_ids)
 
+    def test_domain_index(self):
+        """Test domain queries after adding and removing entities."""
+        self.states.set('light.Kitchen', 'off')
+        self.states.set('light.bowl', 'off')
+
+        self.assertEqual(['light.bowl', 'light.kitchen'],
+                         self.states.entity_ids('Light'))
+        self.assertEqual(['light.bowl', 'light.kitchen'],
+                         [state.entity_id for state
+                          in self.states.all('light')])
+        self.assertEqual('off', self.states.all('light')[0].state)
+
+        self.states.remove('light.bowl')
+        self.assertEqual(['light.kitchen'], self.states.entity_ids('light'))
+
+        self.states.remove('light.kitchen')
+        self.assertEqual([], self.states.entity_ids('light'))
+        self.assertEqual([], self.states.all('light'))
+        self.assertEqual(['switch.ac'], self.states.entity_ids('switch'))
+
+        self.states.set('light.bowl', 'on')
+        self.assertEqual(['light.bowl'], self.states.entity_ids('light'))
+
     def test_all(self):
         """Test everything."""
         states = sorted(state.entity_id for state in self.states.all())
@@ -754,6 +819,67 @@ class TestServiceRegistry(unittest.TestCase):
         self.hass.block_till_done()
         assert len(calls_remove) == 0
 
+    def test_call_direct_dispatch(self):
+        """Test direct calls execute once and still fire the events."""
+        calls = []
+        events = []
+
+        @ha.callback
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        @ha.callback
+        def event_listener(event):
+            """Record service events."""
+            events.append(event.event_type)
+
+        self.services.register('test_domain', 'direct', service_handler)
+        self.hass.bus.listen(EVENT_CALL_SERVICE, event_listener)
+        self.hass.bus.listen(EVENT_SERVICE_EXECUTED, event_listener)
+
+        assert self.services.call('test_domain', 'direct', {'hello': 'world'},
+                                  blocking=True)
+        self.hass.block_till_done()
+
+        assert len(calls) == 1
+        assert calls[0].data == {'hello': 'world'}
+        assert events == [EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED]
+        assert not self.services._direct_calls
+
+    def test_call_event_dispatch(self):
+        """Test blocking calls over the event bus."""
+        calls = []
+
+        @asyncio.coroutine
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        self.services.direct_dispatch = False
+        self.services.register('test_domain', 'event', service_handler)
+
+        assert self.services.call('test_domain', 'event', blocking=True)
+        assert len(calls) == 1
+        assert not self.services._pending_calls
+        assert EVENT_SERVICE_EXECUTED not in self.hass.bus.listeners
+
+    def test_call_direct_dispatch_error(self):
+        """Test a failing service does not wait for the call limit."""
+        def service_handler(call):
+            """Service handler."""
+            raise ValueError
+
+        self.services.register('test_domain', 'error', service_handler)
+
+        prior = ha.SERVICE_CALL_LIMIT
+        try:
+            ha.SERVICE_CALL_LIMIT = 60
+            assert not self.services.call('test_domain', 'error',
+                                          blocking=True)
+        finally:
+            ha.SERVICE_CALL_LIMIT = prior
+
 
 class TestConfig(unittest.TestCase):
     """Test configuration methods."""
@@ -952,3 +1078,139 @@ def test_track_task_functions(loop):
         assert hass._track_task
     finally:
         yield from hass.async_stop()
+
+
+@asyncio.coroutine
+def test_event_bus_inline_callbacks(hass):
+    """Test callbacks run inside async_fire when inline dispatch is on."""
+    calls = []
+    hass.bus.inline_callbacks = True
+
+    @ha.callback
+    def failing_listener(event):
+        """Raise an exception."""
+        raise ValueError('boom')
+
+    @ha.callback
+    def callback_listener(event):
+        """Record the call."""
+        calls.append('callback')
+
+    @asyncio.coroutine
+    def coro_listener(event):
+        """Record the call."""
+        calls.append('coroutine')
+
+    hass.bus.async_listen('test_event', failing_listener)
+    hass.bus.async_listen('test_event', callback_listener)
+    hass.bus.async_listen('test_event', coro_listener)
+    hass.bus.async_listen_once('test_event', callback_listener)
+
+    hass.bus.async_fire('test_event')
+    assert calls == ['callback', 'callback']
+
+    yield from hass.async_block_till_done()
+    assert calls == ['callback', 'callback', 'coroutine']
+
+    calls.clear()
+    hass.bus.async_fire('test_event')
+    yield from hass.async_block_till_done()
+    assert calls == ['callback', 'coroutine']
+
+
+@asyncio.coroutine
+def test_event_bus_stats(hass):
+    """Test the event bus statistics."""
+    assert hass.bus.stats is None
+
+    @ha.callback
+    def callback_listener(event):
+        """Handle event."""
+
+    def sync_listener(event):
+        """Handle event."""
+
+    stats = hass.bus.async_enable_stats()
+    assert hass.bus.stats is stats
+
+    hass.bus.async_listen('test_event', callback_listener)
+    hass.bus.async_listen('test_event', sync_listener)
+    hass.bus.async_fire('test_event')
+    hass.bus.async_fire('test_event')
+    hass.bus.async_fire('no_listeners')
+    yield from hass.async_block_till_done()
+
+    data = stats.as_dict()
+    assert data['events']['test_event']['count'] == 2
+    assert data['events']['no_listeners']['count'] == 1
+
+    listeners = {name.rsplit('.', 1)[-1]: value
+                 for name, value in data['listeners'].items()}
+    assert listeners['callback_listener']['run']['count'] == 2
+    assert listeners['sync_listener']['run']['count'] == 2
+    assert listeners['sync_listener']['wait']['count'] == 2
+
+    hass.bus.async_disable_stats()
+    assert hass.bus.stats is None
+
+
+def test_event_bus_stats_keep_pool():
+    """Test timed listeners are created once and keep their pool."""
+    stats = ha.EventBusStats()
+    pooled = ha.executor_pool('db')(lambda event: None)
+
+    wrapper = stats.async_wrap_listener(pooled)
+    assert stats.async_wrap_listener(pooled) is wrapper
+    assert wrapper.__module__ == __name__
+    assert job_pool(wrapper) == 'db'
+
+    stats.async_remove_listener(pooled)
+    assert stats.async_wrap_listener(pooled) is not wrapper
+
+
+@asyncio.coroutine
+def test_state_machine_set_many(hass):
+    """Test setting multiple states fires a batch event."""
+    hass.states.async_set('light.bowl', 'on')
+    state_events = []
+    batch_events = []
+
+    @ha.callback
+    def state_listener(event):
+        """Record state changed events."""
+        state_events.append(event)
+
+    @ha.callback
+    def batch_listener(event):
+        """Record batch events."""
+        batch_events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_listener)
+    hass.bus.async_listen(EVENT_STATE_CHANGED_BATCH, batch_listener)
+
+    hass.states.async_set_many([
+        ('light.bowl', 'on'),
+        ('light.kitchen', 'on', {'brightness': 100}),
+        ('switch.ac', 'off', None, True),
+    ])
+    yield from hass.async_block_till_done()
+
+    assert hass.states.get('light.kitchen').attributes['brightness'] == 100
+    assert hass.states.get('switch.ac').state == 'off'
+
+    assert [event.data['entity_id'] for event in state_events] == \
+        ['light.kitchen', 'switch.ac']
+    assert all(event.data[ATTR_BATCH] for event in state_events)
+
+    assert len(batch_events) == 1
+    changes = batch_events[0].data[ATTR_CHANGES]
+    assert [change['entity_id'] for change in changes] == \
+        ['light.kitchen', 'switch.ac']
+    assert changes[0]['old_state'] is None
+    assert changes[0]['new_state'] == hass.states.get('light.kitchen')
+    assert ATTR_BATCH not in changes[0]
+
+    # Nothing changed, nothing fired
+    hass.states.async_set_many([('light.bowl', 'on')])
+    yield from hass.async_block_till_done()
+    assert len(batch_events) == 1
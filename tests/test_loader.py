@@ -1,7 +1,9 @@
 """Test to verify that we can load components."""
 # pylint: disable=protected-access
 import asyncio
+import os
 import unittest
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -103,3 +105,92 @@ def test_helpers_wrapper(hass):
     yield from hass.async_block_till_done()
 
     assert result == ['hello']
+
+
+def _manifest_entry(dependencies):
+    """Create a manifest cache entry."""
+    return {'mtime': 0, 'dependencies': dependencies}
+
+
+def test_load_order_from_manifest(tmpdir):
+    """Test dependencies are resolved without importing components."""
+    components = tmpdir.mkdir('components')
+    for name in ('manifest_comp1', 'manifest_comp2'):
+        os.utime(str(components.join(name + '.py').ensure()), (0, 0))
+
+    with patch.dict(loader._MANIFEST, {
+        'manifest_comp1': _manifest_entry([]),
+        'manifest_comp2': _manifest_entry(['manifest_comp1']),
+    }), patch.object(loader, '_MANIFEST_PATHS',
+                     [(str(components), loader._MANIFEST)]), \
+            patch('importlib.import_module') as mock_import:
+        assert loader.load_order_component('manifest_comp2') == \
+            ['manifest_comp1', 'manifest_comp2']
+
+    assert not mock_import.called
+
+
+def test_read_dependencies(tmpdir):
+    """Test reading the dependencies of a module."""
+    module = tmpdir.join('plain.py')
+    module.write("DEPENDENCIES = ['http']\nREQUIREMENTS = ['lib==1.0']\n")
+    assert loader._read_dependencies(str(module)) == ['http']
+
+    module = tmpdir.join('computed.py')
+    module.write("DOMAIN = 'http'\nDEPENDENCIES = [DOMAIN]\n")
+    assert loader._read_dependencies(str(module)) is None
+
+
+def test_manifest_read_on_demand(tmpdir):
+    """Test components are only read when looked up or changed."""
+    custom = tmpdir.mkdir('custom_components')
+    custom.join('mine.py').write("DEPENDENCIES = ['http']\n")
+    platform = custom.mkdir('light').join('mine.py')
+    platform.write("DEPENDENCIES = ['mine']\n")
+    components = tmpdir.mkdir('components')
+    components.join('light.py').write("DEPENDENCIES = ['group']\n")
+    hass = MagicMock()
+    hass.config.path.return_value = str(tmpdir.join('manifest.json'))
+
+    with patch.dict(loader._MANIFEST), patch.dict(loader._CUSTOM_MANIFEST), \
+            patch.object(loader, '_MANIFEST_PATHS', []), \
+            patch.dict(loader._MANIFEST_SAVED), \
+            patch('homeassistant.loader._read_dependencies',
+                  side_effect=loader._read_dependencies) as mock_read:
+        loader._load_manifest(hass, str(components), str(custom))
+        assert not mock_read.called
+
+        assert loader.get_dependencies('light.mine') == ['mine']
+        assert loader.get_dependencies('light') == ['group']
+        assert len(mock_read.mock_calls) == 2
+        assert 'mine' not in loader._CUSTOM_MANIFEST
+
+        loader.save_manifest(hass)
+        loader._load_manifest(hass, str(components), str(custom))
+        assert loader.get_dependencies('light.mine') == ['mine']
+        assert len(mock_read.mock_calls) == 2
+
+        platform.write("DEPENDENCIES = []\n")
+        os.utime(str(platform), (0, 0))
+        assert loader.get_dependencies('light.mine') == []
+        assert len(mock_read.mock_calls) == 3
+
+
+def test_load_manifest_version_changed(tmpdir):
+    """Test built-in components are read again after an upgrade."""
+    components = tmpdir.mkdir('components')
+    components.join('builtin.py').write("DEPENDENCIES = ['http']\n")
+    hass = MagicMock()
+    hass.config.path.return_value = str(tmpdir.join('manifest.json'))
+    none = str(tmpdir.join('none'))
+
+    with patch.dict(loader._MANIFEST), patch.dict(loader._CUSTOM_MANIFEST), \
+            patch.object(loader, '_MANIFEST_PATHS', []), \
+            patch.dict(loader._MANIFEST_SAVED):
+        loader._load_manifest(hass, str(components), none)
+        assert loader.get_dependencies('builtin') == ['http']
+        loader.save_manifest(hass)
+
+        with patch('homeassistant.loader.__version__', 'changed'):
+            loader._load_manifest(hass, str(components), none)
+        assert 'builtin' not in loader._MANIFEST
@@ -1,9 +1,13 @@
 """Test requirements module."""
+import asyncio
 import os
 from unittest import mock
 
 from homeassistant import loader, setup
-from homeassistant.requirements import CONSTRAINT_FILE
+from homeassistant.requirements import (
+    CACHE_FILE, CONSTRAINT_FILE, DATA_PIP_LOCK, RequirementsCache,
+    async_process_requirements)
+from homeassistant.util.json import save_json
 
 from tests.common import get_test_home_assistant, MockModule
 
@@ -59,3 +63,64 @@ class TestRequirements:
         assert mock_install.call_args == mock.call(
             'package==0.0.1', target=self.hass.config.path('deps'),
             constraints=os.path.join('ha_package_path', CONSTRAINT_FILE))
+
+
+@asyncio.coroutine
+def test_satisfied_requirements_cached(hass, tmpdir):
+    """Test satisfied requirements are only checked once."""
+    hass.config.config_dir = str(tmpdir)
+
+    with mock.patch('homeassistant.util.package.site_packages_state',
+                    return_value='state'), \
+            mock.patch('homeassistant.util.package.missing_packages',
+                       return_value=[]) as mock_missing:
+        assert (yield from async_process_requirements(
+            hass, 'comp', ['package==0.0.1', 'other==1.0']))
+        assert (yield from async_process_requirements(
+            hass, 'comp', ['package==0.0.1']))
+
+        cache = RequirementsCache.load(hass.config.path(CACHE_FILE))
+
+    assert len(mock_missing.mock_calls) == 1
+    assert DATA_PIP_LOCK not in hass.data
+    assert cache.satisfied == {'package==0.0.1', 'other==1.0'}
+
+
+def test_requirements_cache_packages_changed(tmpdir):
+    """Test the cache is checked again when the packages changed."""
+    path = str(tmpdir.join(CACHE_FILE))
+    save_json(path, {'state': 'old', 'satisfied': ['kept', 'removed']})
+
+    with mock.patch('homeassistant.util.package.site_packages_state',
+                    return_value='new'), \
+            mock.patch('homeassistant.util.package.missing_packages',
+                       return_value=['removed']) as mock_missing:
+        cache = RequirementsCache.load(path)
+
+    assert mock_missing.call_args == mock.call(['kept', 'removed'])
+    assert cache.satisfied == {'kept'}
+
+    with mock.patch('homeassistant.util.package.site_packages_state',
+                    return_value='new'), \
+            mock.patch('homeassistant.util.package.missing_packages') \
+            as mock_missing:
+        cache = RequirementsCache.load(path)
+
+    assert not mock_missing.called
+    assert cache.satisfied == {'kept'}
+
+
+def test_requirements_cache_saved_on_change(tmpdir):
+    """Test the cache file is only written when an entry was added."""
+    cache = RequirementsCache(str(tmpdir.join(CACHE_FILE)), 'state', ['kept'])
+
+    with mock.patch('homeassistant.util.package.missing_packages',
+                    return_value=[]), \
+            mock.patch.object(cache, 'save') as mock_save:
+        assert cache.verify(['kept']) == []
+        assert not mock_save.called
+
+        assert cache.verify(['kept', 'added']) == []
+        assert len(mock_save.mock_calls) == 1
+
+    assert cache.satisfied == {'kept', 'added'}
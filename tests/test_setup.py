@@ -438,3 +438,126 @@ def test_platform_no_warn_slow(hass):
             hass, 'test_component1', {})
         assert result
         assert not mock_call.called
+
+
+def _mock_setup(order, name, event=None):
+    """Create an async setup recording the order components finish in."""
+    @asyncio.coroutine
+    def async_setup(hass, config):
+        """Set up the component."""
+        if event is not None:
+            yield from event.wait()
+        order.append(name)
+        return True
+    return async_setup
+
+
+@asyncio.coroutine
+def test_setup_components_order(hass):
+    """Test components are set up after their dependencies."""
+    order = []
+    blocked = asyncio.Event(loop=hass.loop)
+    loader.set_component('comp_first', MockModule(
+        'comp_first', async_setup=_mock_setup(order, 'comp_first')))
+    loader.set_component('comp_dep', MockModule(
+        'comp_dep', async_setup=_mock_setup(order, 'comp_dep', blocked)))
+    loader.set_component('comp_a', MockModule(
+        'comp_a', dependencies=['comp_dep'],
+        async_setup=_mock_setup(order, 'comp_a')))
+    loader.set_component('comp_b', MockModule(
+        'comp_b', async_setup=_mock_setup(order, 'comp_b')))
+
+    task = hass.async_add_job(setup.async_setup_components(
+        hass, ['comp_a', 'comp_b', 'comp_first'], {}, ['comp_first']))
+    yield from asyncio.sleep(0.01, loop=hass.loop)
+
+    assert order == ['comp_first', 'comp_b']
+
+    blocked.set()
+    timed_out = yield from task
+
+    assert not timed_out
+    assert order == ['comp_first', 'comp_b', 'comp_dep', 'comp_a']
+
+
+@asyncio.coroutine
+def test_setup_components_timeout(hass):
+    """Test a component that does not finish does not hold back others."""
+    order = []
+    blocked = asyncio.Event(loop=hass.loop)
+    hass.config.setup_timeout = 0.01
+    loader.set_component('comp_hung', MockModule(
+        'comp_hung', async_setup=_mock_setup(order, 'comp_hung', blocked)))
+    loader.set_component('comp_a', MockModule(
+        'comp_a', dependencies=['comp_hung'],
+        async_setup=_mock_setup(order, 'comp_a')))
+    loader.set_component('comp_b', MockModule(
+        'comp_b', async_setup=_mock_setup(order, 'comp_b')))
+
+    timed_out = yield from setup.async_setup_components(
+        hass, ['comp_a', 'comp_b'], {})
+
+    assert timed_out == {'comp_hung', 'comp_a'}
+    assert order == ['comp_b']
+
+    # Waiting for all tasks does not wait for the hung setup
+    task = hass.data[setup.DATA_SETUP]['comp_hung']
+    yield from hass.async_block_till_done()
+    assert not task.done()
+
+    # The setup continues in the background
+    blocked.set()
+    yield from task
+    assert order == ['comp_b', 'comp_hung']
+    assert 'comp_hung' in hass.config.components
+
+
+@asyncio.coroutine
+def test_setup_components_first_timeout(hass):
+    """Test a hung first stage component does not time out the others."""
+    order = []
+    blocked = asyncio.Event(loop=hass.loop)
+    hass.config.setup_timeout = 0.01
+    loader.set_component('comp_first', MockModule(
+        'comp_first', async_setup=_mock_setup(order, 'comp_first', blocked)))
+    loader.set_component('comp_a', MockModule(
+        'comp_a', async_setup=_mock_setup(order, 'comp_a')))
+
+    timed_out = yield from setup.async_setup_components(
+        hass, ['comp_a', 'comp_first'], {}, ['comp_first'])
+
+    assert timed_out == {'comp_first'}
+    assert order == ['comp_a']
+    assert 'comp_a' in hass.config.components
+
+    blocked.set()
+    yield from hass.data[setup.DATA_SETUP]['comp_first']
+    assert order == ['comp_a', 'comp_first']
+
+
+@asyncio.coroutine
+def test_setup_components_max_parallel(hass):
+    """Test the number of components set up at the same time is capped."""
+    running = []
+    most = []
+    hass.config.setup_max_parallel = 2
+
+    @asyncio.coroutine
+    def async_setup(hass, config):
+        """Set up the component."""
+        running.append(1)
+        most.append(len(running))
+        yield from asyncio.sleep(0, loop=hass.loop)
+        running.pop()
+        return True
+
+    domains = ['comp_{}'.format(idx) for idx in range(5)]
+    for domain in domains:
+        loader.set_component(
+            domain, MockModule(domain, async_setup=async_setup))
+
+    timed_out = yield from setup.async_setup_components(hass, domains, {})
+
+    assert not timed_out
+    assert max(most) == 2
+    assert set(domains) <= hass.config.components
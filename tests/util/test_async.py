@@ -104,6 +104,47 @@ def test_run_callback_threadsafe_from_inside_event_loop(mock_ident, _):
     assert len(loop.call_soon_threadsafe.mock_calls) == 2
 
 
+def test_threadsafe_call_queue_batches():
+    """Test callbacks submitted from threads share one loop wakeup."""
+    loop = MagicMock()
+    queue = hasync.ThreadsafeCallQueue(loop)
+    calls = []
+
+    def failing():
+        """Raise an exception."""
+        raise ValueError
+
+    queue.call_soon(calls.append, 1)
+    queue.call_soon(failing)
+    queue.call_soon(calls.append, 2)
+    assert len(loop.call_soon_threadsafe.mock_calls) == 1
+
+    run_batch = loop.call_soon_threadsafe.mock_calls[0][1][0]
+    run_batch()
+    assert calls == [1, 2]
+    assert len(loop.call_exception_handler.mock_calls) == 1
+
+    queue.call_soon(calls.append, 3)
+    assert len(loop.call_soon_threadsafe.mock_calls) == 2
+
+
+@patch('threading.get_ident')
+def test_threadsafe_call_queue_run_callback(mock_ident):
+    """Test running a callback and getting its result."""
+    loop = MagicMock()
+    loop._thread_ident = 1
+    mock_ident.return_value = 5
+    queue = hasync.ThreadsafeCallQueue(loop)
+
+    future = queue.run_callback(lambda value: value * 2, 21)
+    loop.call_soon_threadsafe.mock_calls[0][1][0]()
+    assert future.result() == 42
+
+    loop._thread_ident = 5
+    with pytest.raises(RuntimeError):
+        queue.run_callback(lambda: None)
+
+
 class RunThreadsafeTests(TestCase):
     """Test case for hasync.run_coroutine_threadsafe."""
 
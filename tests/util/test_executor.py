@@ -0,0 +1,72 @@
+"""Test Home Assistant executor pool utility functions."""
+from unittest.mock import MagicMock
+
+from homeassistant.core import executor_pool
+from homeassistant.util import executor
+
+
+def _job_in(module):
+    """Create a job defined in a module."""
+    def job():
+        """Do nothing."""
+    job.__module__ = module
+    return job
+
+
+def test_metered_executor():
+    """Test jobs are measured."""
+    pool = executor.MeteredExecutor('test', 2)
+
+    try:
+        assert pool.submit(lambda value: value * 2, 21).result() == 42
+    finally:
+        pool.shutdown()
+
+    metrics = pool.as_dict()
+    assert metrics['max_workers'] == 2
+    assert metrics['queued'] == 0
+    assert metrics['running'] == 0
+    assert metrics['wait']['count'] == 1
+    assert metrics['run']['count'] == 1
+
+
+def test_pool_for_job():
+    """Test looking up the pool of a job."""
+    pools = executor.ExecutorPools(MagicMock())
+
+    try:
+        pools.create('cloud', 2)
+        pools.assign('sensor', 'cloud')
+        pools.assign('light.hue', executor.POOL_CPU)
+
+        assert pools.get(_job_in('homeassistant.components.sensor.yr')) is \
+            pools.pools['cloud']
+        assert pools.get(_job_in('custom_components.sensor.mine')) is \
+            pools.pools['cloud']
+        assert pools.get(_job_in('homeassistant.components.light.hue')) is \
+            pools.pools[executor.POOL_CPU]
+        assert pools.get(_job_in('homeassistant.components.light.lifx')) is \
+            pools.default
+        assert pools.get(_job_in('homeassistant.helpers.entity')) is \
+            pools.default
+
+        marked = executor_pool(executor.POOL_DB)(
+            _job_in('homeassistant.components.sensor.yr'))
+        assert pools.get(marked) is pools.pools[executor.POOL_DB]
+    finally:
+        pools.shutdown()
+
+
+def test_replace_default_pool():
+    """Test replacing the default pool updates the loop."""
+    loop = MagicMock()
+    pools = executor.ExecutorPools(loop)
+
+    try:
+        pool = pools.create(executor.POOL_DEFAULT, 3)
+        assert pools.default is pool
+        loop.set_default_executor.assert_called_with(pool)
+        assert pools.as_dict()['pools'][executor.POOL_DEFAULT][
+            'max_workers'] == 3
+    finally:
+        pools.shutdown()
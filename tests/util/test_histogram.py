@@ -0,0 +1,38 @@
+"""Test Home Assistant histogram utility functions."""
+from homeassistant.util.histogram import Histogram
+
+
+def test_empty_histogram():
+    """Test an empty histogram."""
+    hist = Histogram()
+
+    assert hist.mean == 0
+    assert hist.percentile(95) == 0
+    assert hist.as_dict()['count'] == 0
+
+
+def test_histogram_buckets():
+    """Test measurements are counted in their buckets."""
+    hist = Histogram(bounds=(1, 2, 3))
+
+    for value in (0.5, 0.5, 1.5, 2.5, 10):
+        hist.add(value)
+
+    assert hist.buckets == [2, 1, 1, 1]
+    assert hist.count == 5
+    assert hist.total == 15
+    assert hist.max == 10
+    assert hist.mean == 3
+    assert hist.percentile(40) == 1
+    assert hist.percentile(60) == 2
+    assert hist.percentile(99) == 10
+    assert hist.as_dict()['buckets'] == {
+        '1': 2, '2': 1, '3': 1, '+Inf': 1}
+
+
+def test_histogram_percentile_capped_by_max():
+    """Test percentiles never exceed the largest measurement."""
+    hist = Histogram(bounds=(1, 2, 3))
+    hist.add(0.2)
+
+    assert hist.percentile(50) == 0.2
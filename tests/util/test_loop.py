@@ -0,0 +1,49 @@
+"""Test Home Assistant event loop selection."""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.util import loop as loop_util
+
+
+@pytest.fixture(autouse=True)
+def restore_policy():
+    """Restore the event loop policy after a test."""
+    policy = asyncio.get_event_loop_policy()
+    yield
+    asyncio.set_event_loop_policy(policy)
+
+
+def test_set_asyncio_policy():
+    """Test selecting the asyncio event loop."""
+    assert loop_util.set_loop_policy(loop_util.LOOP_ASYNCIO) == \
+        loop_util.LOOP_ASYNCIO
+    assert isinstance(asyncio.get_event_loop_policy(),
+                      asyncio.DefaultEventLoopPolicy)
+
+
+def test_set_auto_policy_without_uvloop():
+    """Test auto selection falls back to asyncio."""
+    with patch.dict('sys.modules', {'uvloop': None}):
+        assert loop_util.available_loops() == [loop_util.LOOP_ASYNCIO]
+        assert loop_util.set_loop_policy(loop_util.LOOP_AUTO) == \
+            loop_util.LOOP_ASYNCIO
+
+        with pytest.raises(ImportError):
+            loop_util.set_loop_policy(loop_util.LOOP_UVLOOP)
+
+
+def test_set_uvloop_policy():
+    """Test selecting uvloop."""
+    uvloop = MagicMock()
+    uvloop.EventLoopPolicy.return_value = asyncio.DefaultEventLoopPolicy()
+
+    with patch.dict('sys.modules', {'uvloop': uvloop}):
+        assert loop_util.available_loops() == [
+            loop_util.LOOP_ASYNCIO, loop_util.LOOP_UVLOOP]
+        assert loop_util.set_loop_policy(loop_util.LOOP_AUTO) == \
+            loop_util.LOOP_UVLOOP
+
+    assert asyncio.get_event_loop_policy() is \
+        uvloop.EventLoopPolicy.return_value
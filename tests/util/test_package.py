@@ -201,6 +201,29 @@ def test_check_package_zip():
     assert not package.check_package_exists(TEST_ZIP_REQ)
 
 
+def test_missing_packages():
+    """Test checking packages in one batch."""
+    installed_package = list(pkg_resources.working_set)[0].project_name
+
+    with patch('pkg_resources.Environment',
+               wraps=pkg_resources.Environment) as mock_env:
+        assert package.missing_packages(
+            [installed_package, TEST_NEW_REQ]) == [TEST_NEW_REQ]
+
+    assert len(mock_env.mock_calls) == 1
+
+
+def test_site_packages_state(tmpdir):
+    """Test the fingerprint changes when a package is installed."""
+    with patch('homeassistant.util.package.sys') as mock_sys:
+        mock_sys.path = [str(tmpdir)]
+        state = package.site_packages_state()
+        assert package.site_packages_state() == state
+
+        tmpdir.mkdir('package-1.0.dist-info')
+        assert package.site_packages_state() != state
+
+
 def test_get_user_site(deps_dir, lib_dir, mock_popen, mock_env_copy):
     """Test get user site directory."""
     env = mock_env_copy()
@@ -0,0 +1,61 @@
+"""Test Home Assistant event loop watchdog."""
+import asyncio
+import time
+from unittest.mock import Mock
+
+from homeassistant.util import watchdog
+
+
+def _frames(*modules):
+    """Create a chain of fake frames, innermost module last."""
+    frame = None
+    for module in modules:
+        frame = Mock(f_globals={'__name__': module}, f_back=frame)
+    return frame
+
+
+def test_frame_source_component():
+    """Test the innermost component frame is used."""
+    frame = _frames('asyncio.events', 'homeassistant.components.http',
+                    'homeassistant.components.sensor.yr',
+                    'homeassistant.util.dt', 'requests.api')
+    assert watchdog.frame_source(frame) == 'sensor.yr'
+
+
+def test_frame_source_custom_component():
+    """Test custom components are recognized."""
+    frame = _frames('asyncio.events', 'custom_components.light.bulb')
+    assert watchdog.frame_source(frame) == 'custom_components.light.bulb'
+
+
+def test_frame_source_fallback():
+    """Test fallback without a component frame."""
+    frame = _frames('asyncio.events', 'homeassistant.core',
+                    'homeassistant.helpers.event', 'time')
+    assert watchdog.frame_source(frame) == 'homeassistant.helpers.event'
+    assert watchdog.frame_source(_frames('asyncio.events')) == \
+        watchdog.UNKNOWN_SOURCE
+
+
+def test_detect_stall(loop):
+    """Test a blocking callback is detected."""
+    dog = watchdog.LoopWatchdog(loop, threshold=0.05, interval=0.01)
+    dog.start()
+
+    @asyncio.coroutine
+    def block_loop():
+        """Block the event loop."""
+        yield from asyncio.sleep(0.1, loop=loop)
+        time.sleep(0.5)
+        yield from asyncio.sleep(0.1, loop=loop)
+
+    try:
+        loop.run_until_complete(block_loop())
+    finally:
+        dog.stop()
+        dog.join()
+
+    data = dog.as_dict()
+    assert data['sources'][watchdog.UNKNOWN_SOURCE]['count'] == 1
+    assert data['sources'][watchdog.UNKNOWN_SOURCE]['blocked'] >= 0.4
+    assert 'block_loop' in data['recent'][0]['stack']
@@ -305,6 +305,7 @@ class TestSecrets(unittest.TestCase):
         """Create & load secrets file."""
         config_dir = get_test_config_dir()
         yaml.clear_secret_cache()
+        yaml.clear_yaml_cache()
         self._yaml_path = os.path.join(config_dir, YAML_CONFIG_FILE)
         self._secret_path = os.path.join(config_dir, yaml.SECRET_YAML)
         self._sub_folder_path = os.path.join(config_dir, 'subFolder')
@@ -426,3 +427,33 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert 'contains duplicate key' in caplog.text
+
+
+def test_load_yaml_cached():
+    """Test files are only parsed again when they or their includes change."""
+    yaml.clear_yaml_cache()
+    files = {
+        YAML_CONFIG_FILE: 'key: !include included.yaml\nenv: !env_var '
+                          'YAML_CACHE_TEST default',
+        'included.yaml': 'value: 1',
+    }
+
+    with patch_yaml_files(files), \
+            patch('homeassistant.util.yaml._parse_yaml',
+                  side_effect=yaml._parse_yaml) as mock_parse:
+        data = yaml.load_yaml(YAML_CONFIG_FILE)
+        assert len(mock_parse.mock_calls) == 2
+
+        # Changing the result does not change the cache
+        data['key']['value'] = 2
+        assert yaml.load_yaml(YAML_CONFIG_FILE) == {
+            'key': {'value': 1}, 'env': 'default'}
+        assert len(mock_parse.mock_calls) == 2
+
+        files['included.yaml'] = 'value: 3'
+        assert yaml.load_yaml(YAML_CONFIG_FILE)['key'] == {'value': 3}
+        assert len(mock_parse.mock_calls) == 4
+
+        with patch.dict(os.environ, {'YAML_CACHE_TEST': 'set'}):
+            assert yaml.load_yaml(YAML_CONFIG_FILE)['env'] == 'set'
+        assert len(mock_parse.mock_calls) == 5